@@ -114,6 +114,9 @@ class supers(SampleSuperDatasetBenchmarks):
     def time_diff_recursive(self):
         self.ds.diff(fr="HEAD^", recursive=True)
 
+    def time_diff_recursive_parallel(self):
+        self.ds.diff(fr="HEAD^", recursive=True, jobs=4)
+
     # Status must be called with the dataset, unlike diff
     def time_status(self):
         self.ds.status()
@@ -121,5 +124,8 @@ class supers(SampleSuperDatasetBenchmarks):
     def time_status_recursive(self):
         self.ds.status(recursive=True)
 
+    def time_status_recursive_parallel(self):
+        self.ds.status(recursive=True, jobs=4)
+
 
 supers.time_remove.warmup_time = 0
@@ -46,20 +46,39 @@ class startup(StartupBenchmarks):
     def time_import_api(self):
         call([sys.executable, "-c", "import datalad.api"])
 
+    def time_import_config_snapshot_cache(self):
+        call([sys.executable, "-c", "import datalad"],
+             env=dict(os.environ,
+                      DATALAD_RUNTIME_CONFIG__SNAPSHOT__CACHE='yes'))
+
+    def time_import_config_reader(self):
+        call([sys.executable, "-c", "import datalad"],
+             env=dict(os.environ,
+                      DATALAD_RUNTIME_CONFIG__READER='yes'))
+
 
 class witlessrunner(SuprocBenchmarks):
     """Some rudimentary tests to see if there is no major slowdowns of Runner
     """
+    params = ['threads', 'selector']
+    param_names = ['backend']
 
-    def setup(self):
-        self.runner = Runner()
-        self.git_runner = GitRunner()
+    def setup(self, backend):
+        self.runner = Runner(backend=backend)
+        self.git_runner = GitRunner(backend=backend)
 
-    def time_echo(self):
+    def teardown(self, backend):
+        super().teardown()
+
+    def time_echo(self, backend):
         self.runner.run(["echo"])
 
-    def time_echo_gitrunner(self):
+    def time_echo_gitrunner(self, backend):
         self.git_runner.run(["echo"])
 
-    def time_echo_gitrunner_fullcapture(self):
+    def time_echo_gitrunner_fullcapture(self, backend):
         self.git_runner.run(["echo"], protocol=StdOutErrCapture)
+
+    def time_echo_stdin_fullcapture(self, backend):
+        self.runner.run(["cat"], stdin=b"0123456789" * 10000,
+                        protocol=StdOutErrCapture)
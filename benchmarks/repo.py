@@ -7,6 +7,11 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Benchmarks of the basic repos (Git/Annex) functionality"""
 
+import os.path as op
+import subprocess
+
+from datalad.support.gitrepo import GitRepo
+
 from .common import (
     SampleSuperDatasetBenchmarks,
     SuprocBenchmarks,
@@ -21,3 +26,94 @@ class gitrepo(SampleSuperDatasetBenchmarks):
     def time_get_content_info(self):
         info = self.repo.get_content_info()
         assert isinstance(info, dict)   # just so we do not end up with a generator
+
+
+class gitrepo_content_info_cache(SampleSuperDatasetBenchmarks):
+    """Cold vs warm persistent cache for get_content_info()"""
+
+    params = ['cold', 'warm']
+    param_names = ['cache']
+
+    def setup(self, cache):
+        super().setup()
+        self.repo.config.set(
+            'datalad.repo.content-info-cache', 'true', scope='local')
+        self.cache = self.repo._get_content_info_cache()
+        if cache == 'warm':
+            self.repo.get_content_info()
+            self.repo.get_content_info(ref='HEAD')
+
+    def time_get_content_info(self, cache):
+        if cache == 'cold':
+            self.cache.clear()
+        self.repo.get_content_info()
+
+    def time_get_content_info_head(self, cache):
+        if cache == 'cold':
+            self.cache.clear()
+        self.repo.get_content_info(ref='HEAD')
+
+
+class gitrepo_status_untracked_cache(SampleSuperDatasetBenchmarks):
+    """Worktree status via `ls-files` vs `git status` with untracked cache"""
+
+    params = [False, True]
+    param_names = ['untracked_cache']
+
+    def setup(self, untracked_cache):
+        super().setup()
+        self.repo.config.set(
+            'datalad.status.untracked-cache',
+            'true' if untracked_cache else 'false',
+            scope='local')
+        # populate the cache
+        self.repo.status(eval_submodule_state='commit')
+
+    def time_status(self, untracked_cache):
+        self.repo.status(eval_submodule_state='commit')
+
+
+class gitrepo_many_files(SuprocBenchmarks):
+    """Memory demands of content info reports for a repo with many files
+
+    The repository is synthetic: all index entries point to the same blob,
+    and no files exist in the worktree.
+    """
+
+    timeout = 3600
+    nfiles = 500000
+    repo_path = 'manyfiles'
+
+    def setup_cache(self):
+        repo_path = op.realpath(self.repo_path)
+        repo = GitRepo(repo_path, create=True)
+        sha = subprocess.run(
+            ['git', 'hash-object', '-w', '--stdin'],
+            input=b'content', capture_output=True, cwd=repo_path,
+            check=True).stdout.decode().strip()
+        subprocess.run(
+            ['git', 'update-index', '--index-info'],
+            input=''.join(
+                '100644 {}\tdir{:03d}/file{:06d}\n'.format(sha, i % 1000, i)
+                for i in range(self.nfiles)).encode(),
+            cwd=repo_path, check=True)
+        tree = repo.call_git_oneline(['write-tree'])
+        commit = repo.call_git_oneline(
+            ['commit-tree', '-m', 'many files', tree])
+        repo.call_git(['update-ref', 'HEAD', commit])
+        return repo_path
+
+    def setup(self, repo_path):
+        self.repo = GitRepo(repo_path)
+
+    def peakmem_get_content_info(self, repo_path):
+        self.repo.get_content_info(ref='HEAD')
+
+    def peakmem_get_content_info_table(self, repo_path):
+        self.repo.get_content_info_table(ref='HEAD')
+
+    def peakmem_get_content_info_index(self, repo_path):
+        self.repo.get_content_info(untracked='no')
+
+    def peakmem_get_content_info_table_index(self, repo_path):
+        self.repo.get_content_info_table(untracked='no')
@@ -0,0 +1,64 @@
+# Benchmarks of the parsing of git-annex JSON output, fed with records as
+# git-annex reports them for `get --json --json-progress`, e.g.
+#    asv run --python=same -b annexjsonprotocol
+
+import json
+from unittest.mock import patch
+
+from datalad.support import annexrepo
+from datalad.support.annexrepo import AnnexJsonProtocol
+
+from ..common import SuprocBenchmarks
+
+
+class annexjsonprotocol(SuprocBenchmarks):
+
+    params = ['orjson', 'json']
+    param_names = ['decoder']
+
+    def setup(self, decoder):
+        if decoder == 'orjson' and annexrepo.orjson is None:
+            raise NotImplementedError('orjson is not installed')
+        self._decoder = patch.object(
+            annexrepo, 'orjson',
+            annexrepo.orjson if decoder == 'orjson' else None)
+        self._decoder.start()
+        records = []
+        for i in range(10000):
+            key = 'MD5E-s1000--{:032x}.dat'.format(i)
+            action = {
+                'command': 'get', 'note': 'from origin...',
+                'key': key, 'file': 'dir/file{}.dat'.format(i),
+                'input': ['dir/file{}.dat'.format(i)],
+            }
+            records.append({
+                'action': action, 'byte-progress': 1000,
+                'total-size': 1000, 'percent-progress': '100%',
+            })
+            records.append(dict(
+                action, success=True, **{'error-messages': []}))
+        self.data = b''.join(
+            json.dumps(r).encode() + b'\n' for r in records)
+        # chunks as they would be read from a pipe
+        self.chunks = [self.data[i:i + 65536]
+                       for i in range(0, len(self.data), 65536)]
+
+    def teardown(self, decoder):
+        self._decoder.stop()
+
+    def _feed(self, total_nbytes, report_progress=True):
+        proto = AnnexJsonProtocol(total_nbytes=total_nbytes)
+        proto._init_total_pbar_state()
+        proto._report_progress = report_progress
+        for chunk in self.chunks:
+            proto.pipe_data_received(1, chunk)
+        assert len(proto.json_out) == 10000
+
+    def time_parse(self, decoder):
+        self._feed(None)
+
+    def time_parse_total_progress(self, decoder):
+        self._feed(10000 * 1000)
+
+    def time_parse_progress_not_shown(self, decoder):
+        self._feed(10000 * 1000, report_progress=False)
@@ -14,11 +14,19 @@ returned. The response structure is determined by "output_proc"
 """
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import queue
 import sys
+import threading
+import time
 import warnings
+from collections import (
+    Counter,
+    OrderedDict,
+    deque,
+)
 from datetime import datetime
 from operator import attrgetter
 from queue import Queue
@@ -26,6 +34,8 @@ from subprocess import TimeoutExpired
 from typing import (
     Any,
     Callable,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -230,6 +240,12 @@ class BatchedCommand(SafeDelCloseMixin):
     # instances
     _active_instances: WeakValueDictionary[int, BatchedCommand] = WeakValueDictionary()
 
+    # Default number of requests that `map()` sends ahead of the responses
+    pipeline_window = 100
+
+    # Protocol that turns the output of the subprocess into responses
+    protocol_class: type[BatchedCommandProtocol] = BatchedCommandProtocol
+
     def __init__(self,
                  cmd: Union[str, Tuple, List],
                  path: Optional[str] = None,
@@ -319,7 +335,7 @@ class BatchedCommand(SafeDelCloseMixin):
         )
         self.generator = self.runner.run(
             cmd=self.command,
-            protocol=BatchedCommandProtocol,
+            protocol=self.protocol_class,
             stdin=self.stdin_queue,
             cwd=self.path,
             # This mimics the behavior of the old implementation w.r.t
@@ -382,33 +398,87 @@ class BatchedCommand(SafeDelCloseMixin):
             If `self.output_proc` is not `None`, the result type of
             `self.output_proc` determines the type of the elements.
         """
-        self._active += 1
         requests = cmds
 
         input_multiple = isinstance(requests, list)
         if not input_multiple:
             requests = [requests]
 
-        responses = []
+        responses = list(self.map(requests))
+        return responses if input_multiple else responses[0] if responses else None
+
+    def map(self,
+            requests: Iterable[Union[Tuple, str]],
+            window: Optional[int] = None) -> Iterator[Any]:
+        """
+        Send requests to the subprocess and yield the responses in order.
+
+        In contrast to calling the instance with a list, requests are taken
+        from `requests` only when they can be sent, and responses are yielded
+        as soon as they are received. Up to `window` requests are sent ahead,
+        before the response to the first of them is read. This saves a
+        round-trip to the subprocess per request, while the number of
+        unanswered requests, and therefore the amount of buffered data, stays
+        bounded.
+
+        If the subprocess exits while requests are in flight, it is
+        restarted and all requests without a response are sent again.
+
+        If the consumer stops iterating while requests are in flight, the
+        subprocess is closed, because their responses cannot be matched to
+        future requests.
+
+        Parameters
+        ----------
+        requests : iterable of (str or tuple)
+            requests for the subprocess
+        window : int, optional
+            maximum number of requests that were sent, but whose response was
+            not read yet. Defaults to `pipeline_window`.
+
+        Yields
+        ------
+        (return_type[self.output_proc] | str)
+            One response per request, see `__call__()`.
+        """
+        window = window or self.pipeline_window
+        pending: deque[Union[Tuple, str]] = deque()
+        requests = iter(requests)
+        self._active += 1
         try:
             # This code assumes that each processing request is
             # a single line and leads to a response that triggers a
             # `send_result` in the protocol.
-            for request in requests:
-                while True:
-                    try:
-                        responses.append(self.process_request(request))
-                        self.last_request = request
-                        break
-                    except StopIteration:
-                        # The process finished executing, store the last return
-                        # code and restart the process.
-                        lgr.debug("%s: command exited", self)
-                        self.return_code = self.generator.return_code
-                        self.runner = None
+            while True:
+                for request in itertools.islice(
+                        requests, window - len(pending)):
+                    # A process with unanswered requests is only restarted
+                    # when it is known that no further responses will come,
+                    # i.e. at the end of its output.
+                    if not pending and not self.process_running():
+                        self._initialize()
+                    self._send_request(request)
+                    pending.append(request)
+                if not pending:
+                    return
+                try:
+                    response = self._receive_response()
+                except StopIteration:
+                    # The process finished executing, store the last return
+                    # code and restart the process.
+                    lgr.debug("%s: command exited", self)
+                    self.return_code = self.generator.return_code
+                    self.runner = None
+                    self._initialize()
+                    for request in pending:
+                        self._send_request(request)
+                    continue
+                self.last_request = pending.popleft()
+                yield response
 
         except CommandError as command_error:
             # Convert CommandError into BatchedCommandError
+            pending.clear()
             self.runner = None
             self.return_code = command_error.code
             raise BatchedCommandError(
@@ -424,7 +494,10 @@ class BatchedCommand(SafeDelCloseMixin):
 
         finally:
             self._active -= 1
-        return responses if input_multiple else responses[0] if responses else None
+            if pending and self.runner:
+                lgr.debug("%s: closing with %d unanswered requests",
+                          self, len(pending))
+                self.close()
 
     def process_request(self,
                         request: Union[Tuple, str]) -> Any | None:
@@ -435,28 +508,32 @@ class BatchedCommand(SafeDelCloseMixin):
             if not self.process_running():
                 self._initialize()
 
-            # Remember request and send it to subprocess
-            if not isinstance(request, str):
-                request = ' '.join(request)
-            self.stdin_queue.put((request + "\n").encode())
-
-            # Get the response from the generator. We only consider
-            # data received on stdout as a response.
-            if self.output_proc:
-                # If we have an output procedure, let the output procedure
-                # read stdout and decide about the nature of the response
-                response = self.output_proc(ReadlineEmulator(self))
-            else:
-                # If there is no output procedure we assume that a response
-                # is one line.
-                response = self.get_one_line()
-                if response is not None:
-                    response = response.rstrip()
-            return response
+            self._send_request(request)
+            return self._receive_response()
 
         finally:
             self._active -= 1
 
+    def _send_request(self,
+                      request: Union[Tuple, str]):
+        if not isinstance(request, str):
+            request = ' '.join(request)
+        self.stdin_queue.put((request + "\n").encode())
+
+    def _receive_response(self) -> Any | None:
+        # Get the response from the generator. We only consider
+        # data received on stdout as a response.
+        if self.output_proc:
+            # If we have an output procedure, let the output procedure
+            # read stdout and decide about the nature of the response
+            return self.output_proc(ReadlineEmulator(self))
+        # If there is no output procedure we assume that a response
+        # is one line.
+        response = self.get_one_line()
+        if response is not None:
+            response = response.rstrip()
+        return response
+
     def proc1(self,
               single_command: str):
         """
@@ -626,5 +703,155 @@ class BatchedCommand(SafeDelCloseMixin):
         return self._abandon_cache
 
 
+class BatchedCommandPool:
+    """Process-wide pool of batched commands, shared by all their users
+
+    Commands are registered under an owner, e.g. the path of a repository,
+    and a codename that identifies the command and its options. A command
+    that is requested again for the same owner, also via a different object
+    representing it, is reused with its subprocess still running, instead of
+    starting a new one.
+
+    Commands are evicted, i.e. closed and removed from the pool, in least
+    recently used order, when
+
+    - they were not requested for more than `max_idle` seconds,
+    - their owner has more than `max_per_owner` commands in the pool, which
+      keeps a single owner from displacing the commands of all others,
+    - the pool has more than `max_size` commands.
+
+    Limits are enforced whenever a command is requested, and on `evict()`.
+    Commands that are processing requests are never evicted. The numbers of
+    pool hits, misses, and evictions are counted in `stats`.
+
+    Parameters
+    ----------
+    max_size: int, optional
+      Defaults to the configuration "datalad.runtime.max-batched".
+    max_per_owner: int, optional
+      Defaults to the configuration "datalad.runtime.max-batched-per-repo".
+    max_idle: float, optional
+      Defaults to the configuration "datalad.runtime.max-inactive-age".
+    """
+
+    def __init__(self,
+                 max_size: Optional[int] = None,
+                 max_per_owner: Optional[int] = None,
+                 max_idle: Optional[float] = None,
+                 ):
+        self.max_size = max_size
+        self.max_per_owner = max_per_owner
+        self.max_idle = max_idle
+        # in least recently used order
+        self._commands: OrderedDict[Tuple[str, str], BatchedCommand] = \
+            OrderedDict()
+        self._last_used: dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._commands
+
+    def get(self,
+            owner: str,
+            codename: str,
+            factory: Callable[[], BatchedCommand]) -> BatchedCommand:
+        """Get the pooled command, or create it with `factory()`"""
+        key = (owner, codename)
+        with self._lock:
+            command = self._commands.get(key)
+            if command is None:
+                self.stats['misses'] += 1
+                command = self._commands[key] = factory()
+            else:
+                self.stats['hits'] += 1
+                self._commands.move_to_end(key)
+            self._last_used[key] = time.monotonic()
+            evicted = self._evict(key)
+        for c in evicted:
+            c.close()
+        return command
+
+    def evict(self):
+        """Close and remove all commands that exceed the limits of the pool"""
+        with self._lock:
+            evicted = self._evict(None)
+        for c in evicted:
+            c.close()
+
+    def remove(self,
+               owner: str,
+               codename: str) -> Optional[BatchedCommand]:
+        """Remove a command from the pool, without closing it"""
+        with self._lock:
+            self._last_used.pop((owner, codename), None)
+            return self._commands.pop((owner, codename), None)
+
+    def close(self, owner: Optional[str] = None):
+        """Close and remove all commands of `owner`, or all commands"""
+        with self._lock:
+            keys = [k for k in self._commands
+                    if owner is None or k[0] == owner]
+            commands = [self._commands.pop(k) for k in keys]
+            for k in keys:
+                del self._last_used[k]
+        for c in commands:
+            c.close()
+        if owner is None and self.stats:
+            lgr.debug("%s statistics: %s", self, dict(self.stats))
+
+    def _evict(self,
+               requested: Optional[Tuple[str, str]]) -> list[BatchedCommand]:
+        max_size = self.max_size
+        if max_size is None:
+            max_size = cfg.obtain("datalad.runtime.max-batched")
+        max_per_owner = self.max_per_owner
+        if max_per_owner is None:
+            max_per_owner = cfg.obtain("datalad.runtime.max-batched-per-repo")
+        max_idle = self.max_idle
+        if max_idle is None:
+            max_idle = cfg.obtain("datalad.runtime.max-inactive-age")
+
+        candidates = [k for k, c in self._commands.items()
+                      if k != requested and not c._active]
+        evict = {}
+        now = time.monotonic()
+        for k in candidates:
+            if now - self._last_used[k] <= max_idle:
+                break
+            evict[k] = 'evicted_idle'
+        if requested is not None:
+            owned = [k for k in self._commands
+                     if k[0] == requested[0] and k not in evict]
+            excess = len(owned) - max_per_owner
+            for k in candidates:
+                if excess <= 0:
+                    break
+                if k[0] == requested[0] and k not in evict:
+                    evict[k] = 'evicted_owner'
+                    excess -= 1
+        excess = len(self._commands) - len(evict) - max_size
+        for k in candidates:
+            if excess <= 0:
+                break
+            if k not in evict:
+                evict[k] = 'evicted_lru'
+                excess -= 1
+
+        evicted = []
+        for k, reason in evict.items():
+            lgr.debug("%s: evicting %s (%s)", self, k, reason)
+            self.stats[reason] += 1
+            del self._last_used[k]
+            evicted.append(self._commands.pop(k))
+        return evicted
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self._commands)} commands)"
+
+
 def _now():
     return datetime.now().astimezone()
@@ -9,13 +9,17 @@
 """
 """
 
+import hashlib
 import json
 import logging
 import os
+import pickle
 import re
+import tempfile
 import threading
 import warnings
 from collections import namedtuple
+from contextlib import contextmanager
 from functools import (
     lru_cache,
     wraps,
@@ -38,6 +42,11 @@ from datalad.runner import (
     KillOutput,
     StdOutErrCapture,
 )
+from datalad.support.gitconfig import (
+    GitConfigReader,
+    UnsupportedGitConfig,
+    edit_gitconfig_file,
+)
 from datalad.utils import (
     getpwd,
     on_windows,
@@ -79,6 +88,9 @@ _scope_reload_doc = """
 # on either file has changed to warrant reload of configuration.
 _stat_result = namedtuple('_stat_result', 'st_ino st_size st_ctime st_mtime')
 
+# bumped whenever the format of a snapshot file changes
+_snapshot_format_version = 1
+
 
 # we cannot import external_versions here, as the cfg comes before anything
 # and we would have circular imports
@@ -353,6 +365,67 @@ def _clean_env_from_gitconfig_items():
     environ.pop('GIT_CONFIG_COUNT', None)
 
 
+def _get_config_snapshot_dir():
+    """Return the directory of persistent configuration snapshots"""
+    # imported here, config is imported too early to afford it at module
+    # level for a feature that is off by default
+    from platformdirs import user_cache_dir
+    return Path(user_cache_dir('datalad', 'datalad.org')) / 'config'
+
+
+def _get_config_snapshot_path(key):
+    return _get_config_snapshot_dir() / hashlib.sha1(
+        repr(key).encode('utf-8')).hexdigest()
+
+
+def _load_config_snapshot(key):
+    """Load a configuration snapshot stored under `key`
+
+    Returns
+    -------
+    tuple or None
+      The configuration store and the stats of the watched files, or None
+      if there is no (readable) snapshot for this key.
+    """
+    fpath = _get_config_snapshot_path(key)
+    try:
+        with fpath.open('rb') as f:
+            version, snapshot_key, store, watched = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        lgr.debug('Ignoring unreadable configuration snapshot %s: %s',
+                  fpath, e)
+        return None
+    if version != _snapshot_format_version or snapshot_key != key:
+        return None
+    return store, watched
+
+
+def _dump_config_snapshot(key, store, watched):
+    """Store a configuration snapshot under `key`
+
+    Any error is logged and otherwise ignored.
+    """
+    fpath = _get_config_snapshot_path(key)
+    try:
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file and move it in place, in order to
+        # never expose a partially written snapshot to a concurrent reader
+        fd, tmp = tempfile.mkstemp(dir=str(fpath.parent), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(
+                    (_snapshot_format_version, key, store, watched),
+                    f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, fpath)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        lgr.debug('Could not write configuration snapshot %s: %s', fpath, e)
+
+
 def anything2bool(val):
     if hasattr(val, 'lower'):
         val = val.lower()
@@ -372,9 +445,12 @@ class ConfigManager(object):
     """Thin wrapper around `git-config` with support for a dataset configuration.
 
     The general idea is to have an object that is primarily used to read/query
-    configuration option.  Upon creation, current configuration is read via one
-    (or max two, in the case of the presence of dataset-specific configuration)
-    calls to `git config`.  If this class is initialized with a Dataset
+    configuration option.  Upon creation, current configuration is read from
+    all configuration files (and a dataset-specific configuration, if present).
+    `git config` is called for this, unless the environment variable
+    DATALAD_RUNTIME_CONFIG__READER enables an in-process reader, which is
+    then used for all configuration that does not contain constructs it does
+    not support.  If this class is initialized with a Dataset
     instance, it supports reading and writing configuration from
     ``.datalad/config`` inside a dataset too. This file is committed to Git and
     hence useful to ship certain configuration items with a dataset.
@@ -383,11 +459,16 @@ class ConfigManager(object):
     dictionary, the Python ConfigParser, and GitPython's config parser
     implementations.
 
-    This class is presently not capable of efficiently writing multiple
-    configurations items at once.  Instead, each modification results in a
-    dedicated call to `git config`. This author thinks this is OK, as he
-    cannot think of a situation where a large number of items need to be
-    written during normal operation.
+    With the environment variable DATALAD_RUNTIME_CONFIG__SNAPSHOT__CACHE
+    set to true, any configuration read from files is cached
+    persistently in the user's cache directory, and reused by any later
+    ConfigManager (in any process) as long as the files configuration was
+    read from are not modified, and the environment is the same.
+
+    Each modification results in a dedicated call to `git config`, unless
+    it is made within a `transaction()`. Modifications in a transaction are
+    queued, and written at its end with a single write per configuration
+    file, followed by a single reload.
 
     Each instance carries a public `overrides` attribute. This dictionary
     contains variables that override any setting read from a file. The overrides
@@ -471,6 +552,8 @@ class ConfigManager(object):
                 self._repo_pathobj = dataset.repo.pathobj
 
         self._config_cmd = ['git', 'config']
+        # modifications queued in an ongoing transaction(), per thread
+        self._transaction = threading.local()
         # public dict to store variables that always override any setting
         # read from a file
         # `hasattr()` is needed because `datalad.cfg` is generated upon first module
@@ -599,6 +682,66 @@ class ConfigManager(object):
         return any(curstats[f] != storestats[f] for f in store['files'])
 
     def _reload(self, run_args):
+        snapshot_key = self._get_snapshot_key(run_args) \
+            if self._get_startup_flag(
+                'datalad.runtime.config-snapshot-cache', False) else None
+        if snapshot_key is not None:
+            snapshot = _load_config_snapshot(snapshot_key)
+            if snapshot is not None:
+                store, watched = snapshot
+                if self._get_stats(store) == store['stats'] \
+                        and self._get_watched_stats() == watched:
+                    lgr.debug('Using configuration snapshot for %s', run_args)
+                    return store
+        store = self._read_store(run_args)
+        if snapshot_key is not None and all(
+                isinstance(f, Path) for f in store['files']):
+            # configuration from blobs would require a git call to validate
+            # a snapshot, there is nothing to gain
+            _dump_config_snapshot(
+                snapshot_key, store, self._get_watched_stats())
+        return store
+
+    def _read_store(self, run_args):
+        """Read a configuration store, without calling git-config if possible
+        """
+        store = self._reload_from_files(run_args)
+        if store is None:
+            store = self._reload_from_git(run_args)
+        return store
+
+    def _reload_from_files(self, run_args):
+        """Read a configuration store with the in-process reader
+
+        Returns None, if the configuration can only be read via git-config.
+        """
+        if on_windows or '--blob' in run_args \
+                or not self._get_startup_flag(
+                    'datalad.runtime.config-reader', False):
+            return None
+        if self._repo_dot_git is None and self._runner.cwd:
+            # a dataset without a repository, Git could discover one
+            # in any parent directory
+            return None
+        reader = GitConfigReader(self._repo_dot_git)
+        try:
+            if '--file' in run_args:
+                cfg, files = reader.read_file(
+                    Path(run_args[run_args.index('--file') + 1]))
+            elif '--local' in run_args:
+                # like git-config, no includes for a specific file
+                cfg, files = reader.read(scopes=('local',), includes=False)
+            else:
+                cfg, files = reader.read()
+        except UnsupportedGitConfig as e:
+            lgr.debug('Cannot read configuration in-process, '
+                      'using git-config: %s', e)
+            return None
+        store = dict(cfg=cfg, files=files)
+        store['stats'] = self._get_stats(store)
+        return store
+
+    def _reload_from_git(self, run_args):
         # query git-config
         stdout, stderr = self._run(
             run_args,
@@ -615,6 +758,58 @@ class ConfigManager(object):
         store['stats'] = self._get_stats(store)
         return store
 
+    def _get_startup_flag(self, var, default):
+        """Get a boolean setting that is needed before reading configuration
+
+        Such a setting can only be given as an environment variable, or as
+        an override.
+        """
+        envvar = 'DATALAD_{}'.format(
+            var[8:].replace('-', '__').replace('.', '_').upper())
+        val = os.environ.get(envvar, self.overrides.get(var, default))
+        try:
+            return anything2bool(val)
+        except TypeError:
+            return default
+
+    def _get_snapshot_key(self, run_args):
+        """Identify a git-config query for the snapshot cache
+
+        Besides the query itself, the key comprises the location it is
+        executed in, and all environment variables that could change which
+        configuration Git reports.
+        """
+        return (
+            tuple(self._config_cmd + run_args),
+            str(self._runner.cwd) if self._runner.cwd else None,
+            tuple(sorted(
+                (k, v) for k, v in os.environ.items()
+                if k.startswith('GIT_')
+                or k in ('HOME', 'XDG_CONFIG_HOME', 'USERPROFILE',
+                         'HOMEDRIVE', 'HOMEPATH'))),
+        )
+
+    def _get_watched_stats(self):
+        """Stats of configuration files that could come into existence
+
+        Git only reports files it read configuration from. A configuration
+        snapshot is also invalid, if any of the standard configuration files
+        was created, or the checked-out branch changed (includeIf onbranch:).
+        """
+        files = [Path(environ.get('GIT_CONFIG_SYSTEM', '/etc/gitconfig'))]
+        if 'GIT_CONFIG_GLOBAL' in environ:
+            files.append(Path(environ['GIT_CONFIG_GLOBAL']))
+        else:
+            home = Path.home()
+            files.extend((
+                home / '.gitconfig',
+                Path(environ.get('XDG_CONFIG_HOME', home / '.config'))
+                / 'git' / 'config'))
+        if self._repo_dot_git:
+            files.extend(self._repo_dot_git / f
+                         for f in ('config', 'config.worktree', 'HEAD'))
+        return self._get_stats(dict(files=files))
+
     def _get_stats(self, store):
         stats = {}
         for f in store['files']:
@@ -977,14 +1172,38 @@ class ConfigManager(object):
         **kwargs
           Keywords arguments for Runner's call
         """
-        if scope:
-            args = self._get_location_args(scope) + args
+        location = self._get_location_args(scope) if scope else []
         if '-l' in args:
             # we are just reading, no need to reload, no need to lock
-            out = self._runner.run(self._config_cmd + args, **kwargs)
+            out = self._runner.run(self._config_cmd + location + args,
+                                   **kwargs)
             return out['stdout'], out['stderr']
 
         # all other calls are modifications
+        pending = getattr(self._transaction, 'pending', None)
+        if pending is not None:
+            # written at the end of the transaction
+            pending.append((scope, location, args, reload, kwargs))
+            return '', ''
+
+        args = location + args
+        with self._modification_lock(args):
+            out = self._runner.run(self._config_cmd + args, **kwargs)
+
+        if reload:
+            self.reload()
+            # this function is only used to modify config. If any manager
+            # has modified the global scope, and is not itself the global
+            # manager, we reload that one too in order to avoid stale
+            # configuration reports
+            if scope == 'global' and self is not datalad.cfg:
+                datalad.cfg.reload()
+        return out['stdout'], out['stderr']
+
+    @contextmanager
+    def _modification_lock(self, args):
+        """Lock the configuration file a git-config call with `args` modifies
+        """
         if '--file' in args:
             # all paths we are passing are absolute
             custom_file = Path(args[args.index('--file') + 1])
@@ -997,19 +1216,78 @@ class ConfigManager(object):
             # follow pattern in downloaders for lockfile location
             lockfile = Path(self.obtain('datalad.locations.locks')) \
                        / 'gitconfig.lck'
-
         with ConfigManager._run_lock, InterProcessLock(lockfile, logger=lgr):
-            out = self._runner.run(self._config_cmd + args, **kwargs)
-
-        if reload:
+            yield
+
+    @contextmanager
+    def transaction(self):
+        """Batch modifications of the configuration
+
+        Within the context, any modification via `add()`, `set()`,
+        `unset()`, `rename_section()`, or `remove_section()` (except for the
+        'override' scope) is queued. At the end of the context, all queued
+        modifications of a configuration file are written at once, and the
+        configuration is reloaded a single time (unless no modification
+        requested a reload). Until then, queued modifications are not
+        reported by any query. If the context is left with an exception,
+        queued modifications are discarded. Nested transactions are part of
+        the outermost one.
+
+        Transactions are specific to the thread that started them.
+        """
+        if getattr(self._transaction, 'pending', None) is not None:
+            yield
+            return
+        self._transaction.pending = pending = []
+        try:
+            yield
+        finally:
+            self._transaction.pending = None
+        self._apply_pending(pending)
+
+    def _apply_pending(self, pending):
+        # group modifications by configuration file, keeping their order
+        by_location = {}
+        for _, location, args, _, kwargs in pending:
+            by_location.setdefault(tuple(location), []).append((args, kwargs))
+        for location, calls in by_location.items():
+            location = list(location)
+            with self._modification_lock(location):
+                try:
+                    edit_gitconfig_file(
+                        self._get_modification_target(location),
+                        [args for args, _ in calls])
+                    continue
+                except UnsupportedGitConfig as e:
+                    lgr.debug('Cannot modify configuration in-process, '
+                              'using git-config: %s', e)
+                for args, kwargs in calls:
+                    self._runner.run(
+                        self._config_cmd + location + args, **kwargs)
+        if any(p[3] for p in pending):
             self.reload()
-            # this function is only used to modify config. If any manager
-            # has modified the global scope, and is not itself the global
-            # manager, we reload that one too in order to avoid stale
-            # configuration reports
-            if scope == 'global' and self is not datalad.cfg:
+            # see _run()
+            if any(p[0] == 'global' for p in pending) \
+                    and self is not datalad.cfg:
                 datalad.cfg.reload()
-        return out['stdout'], out['stderr']
+
+    def _get_modification_target(self, location):
+        """Return the config file the git-config `location` args point to
+
+        Raises
+        ------
+        UnsupportedGitConfig
+          If modifications cannot be written in-process.
+        """
+        if on_windows or not self._get_startup_flag(
+                'datalad.runtime.config-reader', False):
+            raise UnsupportedGitConfig('in-process modification disabled')
+        if location[0] == '--file':
+            return Path(location[1])
+        if self._repo_dot_git is None and location == ['--local']:
+            raise UnsupportedGitConfig('no repository')
+        return GitConfigReader(self._repo_dot_git).get_scope_file(
+            location[0][2:])
 
     def _get_location_args(self, scope, args=None):
         if args is None:
@@ -56,9 +56,11 @@ from .clone_utils import (  # needed because other code imports it from here
     _check_autoenable_special_remotes,
     _format_clone_errors,
     _generate_candidate_clone_sources,
+    _get_local_clone_source,
     _get_remote,
     _get_tracking_source,
     _map_urls,
+    _rank_clone_candidates,
     _test_existing_clone_target,
     _try_clone_candidates,
     decode_source_spec,
@@ -417,7 +419,8 @@ def clone_dataset(
         cfg=None,
         checkout_gitsha=None,
         clone_opts=None,
-        cfg_proc=None):
+        cfg_proc=None,
+        src_costs=None):
     """Internal helper to perform cloning without sanity checks (assumed done)
 
     This helper does not handle any saving of subdataset modification or adding
@@ -429,7 +432,7 @@ def clone_dataset(
       Any suitable clone source specifications (paths, URLs)
     destds : Dataset
       Dataset instance for the clone destination
-    reckless : {None, 'auto', 'ephemeral', 'shared-...'}, optional
+    reckless : {None, 'auto', 'ephemeral', 'reference', 'shared-...'}, optional
       Mode switch to put cloned dataset into unsafe/throw-away configurations, i.e.
       sacrifice data safety for performance or resource footprint. When None
       and `cfg` is specified, use the value of `datalad.clone.reckless`.
@@ -452,6 +455,9 @@ def clone_dataset(
       --branch argument included in this value.
     cfg_proc : list of str, optional
       List of procedures to be run on the cloned datasets.
+    src_costs : list, optional
+      Cost of each source in `srcs`. Only used to rank the clone candidates
+      when they are probed (see `datalad.clone.probe-timeout`).
 
     Yields
     ------
@@ -476,7 +482,7 @@ def clone_dataset(
         result_props = result_props.copy()
 
     candidate_sources = _generate_candidate_clone_sources(
-        destds, srcs, cfg)
+        destds, srcs, cfg, costs=src_costs)
 
     # important test!
     # based on this `rmtree` will happen below after failed clone
@@ -495,6 +501,17 @@ def clone_dataset(
         # in a reckless mode, and inherit it for the coming clone
         reckless = cfg.get('datalad.clone.reckless', None)
 
+    if reckless == 'reference':
+        for cand in candidate_sources:
+            cand['reference'] = _get_local_clone_source(cand['giturl'])
+
+    probe_timeout = (cfg or destds.config).obtain(
+        'datalad.clone.probe-timeout')
+    if probe_timeout and len(candidate_sources) > 1:
+        # try the fastest of the reachable candidates first
+        candidate_sources = _rank_clone_candidates(
+            candidate_sources, probe_timeout)
+
     last_candidate, error_msgs, stop_props = _try_clone_candidates(
         destds=destds,
         candidate_sources=candidate_sources,
@@ -741,7 +758,8 @@ def _post_annex_init_processing_(
     repo = destds.repo
     ds = destds
 
-    if reckless == 'auto' or (reckless and reckless.startswith('shared-')):
+    if reckless in ('auto', 'reference') \
+            or (reckless and reckless.startswith('shared-')):
         repo.call_annex(['untrust', 'here'])
 
     _check_autoenable_special_remotes(repo)
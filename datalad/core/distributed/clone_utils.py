@@ -3,12 +3,17 @@
 __docformat__ = 'restructuredtext'
 
 import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from os.path import expanduser
 from pathlib import Path
 from typing import (
     Dict,
     List,
+    Optional,
     Tuple,
 )
 from urllib.parse import unquote as urlunquote
@@ -17,6 +22,7 @@ from datalad.cmd import (
     CommandError,
     GitWitlessRunner,
     StdOutCapture,
+    StdOutErrCapture,
 )
 from datalad.config import ConfigManager
 from datalad.distributed.ora_remote import (
@@ -51,6 +57,7 @@ from datalad.utils import (
     ensure_bool,
     ensure_list,
     make_tempfile,
+    on_windows,
     rmtree,
 )
 
@@ -505,9 +512,17 @@ def _get_tracking_source(ds):
 def _generate_candidate_clone_sources(
         destds: Dataset,
         srcs: List,
-        cfg: ConfigManager or None) -> List:
+        cfg: ConfigManager or None,
+        costs: Optional[List] = None) -> List:
     """Convert "raw" clone source specs to candidate URLs
 
+    Parameters
+    ----------
+    costs: list, optional
+      Cost of each source spec in `srcs`, e.g. as configured for a
+      subdataset source candidate. If given, it is recorded as the 'cost'
+      property of all candidates generated from a source.
+
     Returns
     -------
     Each item in the list is a dictionary with clone candidate properties.
@@ -518,7 +533,14 @@ def _generate_candidate_clone_sources(
     # check for configured URL mappings, either in the given config manager
     # or in the one of the destination dataset, which is typically not existent
     # yet and the process config is then used effectively
-    srcs = _map_urls(cfg or destds.config, srcs)
+    if costs is None:
+        srcs = _map_urls(cfg or destds.config, srcs)
+    else:
+        # map one source at a time, to know the cost of the mapped URLs
+        mapped = [(m, c) for s, c in zip(srcs, costs)
+                  for m in _map_urls(cfg or destds.config, [s])]
+        srcs = [m for m, _ in mapped]
+        costs = [c for _, c in mapped]
 
     # decode all source candidate specifications
     # use a given config or pass None to make it use the process config
@@ -526,6 +548,9 @@ def _generate_candidate_clone_sources(
     # `cfg or destds.config` as done above, but some tests patch
     # the process config manager
     candidate_sources = [decode_source_spec(s, cfg=cfg) for s in srcs]
+    if costs is not None:
+        for props, cost in zip(candidate_sources, costs):
+            props['cost'] = cost
 
     # now expand the candidate sources with additional variants of the decoded
     # giturl, while duplicating the other properties in the additional records
@@ -537,6 +562,184 @@ def _generate_candidate_clone_sources(
     ]
 
 
+def _get_local_clone_source(giturl: str) -> Optional[str]:
+    """Return the path of a local repository a candidate URL points to
+
+    Returns
+    -------
+    str or None
+      The path, if `giturl` is a local path or a file:// URL of an existing
+      directory, or None otherwise.
+    """
+    try:
+        # Note, that accessing localpath on a non-local RI throws ValueError
+        path = Path(RI(giturl).localpath)
+    except (ValueError, AttributeError) as e:
+        CapturedException(e)
+        return None
+    return str(path) if path.is_dir() else None
+
+
+class _ProbeProtocol(StdOutErrCapture):
+    """Capture the output of a probe, and stop it when it hangs"""
+    def __init__(self, done_future=None, encoding=None):
+        super().__init__(done_future, encoding)
+        self.timed_out = False
+
+    def timeout(self, fd):
+        if fd is not None:
+            # a quiet output stream is no reason to give up, only the
+            # runtime of the process is limited
+            return False
+        self.timed_out = True
+        # terminate the process
+        return True
+
+    def _prepare_result(self):
+        result = super()._prepare_result()
+        result['timed_out'] = self.timed_out
+        return result
+
+
+# latency of a `git ls-remote` per host, in seconds, for the whole session.
+# None marks a host that did not respond within the probe timeout.
+_host_probes: Dict[str, Optional[float]] = {}
+_host_probes_lock = threading.Lock()
+
+# URL schemes that git can probe natively, and quickly
+_PROBE_SCHEMES = ('http', 'https', 'ssh', 'git', 'git+ssh', 'ssh+git')
+
+# cost units of a candidate that equal one second of probe latency
+_PROBE_LATENCY_COST = 100
+
+
+def _get_candidate_host(giturl: str) -> Optional[str]:
+    """Return the host a candidate URL needs to be probed at, if any
+
+    Local paths, file:// URLs, and URLs that git would hand to some
+    remote helper are not probed, and None is returned for them.
+    """
+    try:
+        ri = RI(giturl)
+    except Exception as e:
+        CapturedException(e)
+        return None
+    if isinstance(ri, SSHRI):
+        return ri.hostname or None
+    if isinstance(ri, URL) and ri.scheme in _PROBE_SCHEMES:
+        return ri.hostname or None
+    return None
+
+
+def _probe_clone_candidate(
+        giturl: str,
+        timeout: float) -> Tuple[bool, Optional[float]]:
+    """Test whether `git ls-remote` can reach a candidate URL
+
+    Returns
+    -------
+    (bool, float or None)
+      Whether the candidate is reachable, and the latency of the probe in
+      seconds. The latency is None, if the probe timed out.
+    """
+    # never prompt for credentials, a probe must not block
+    runner = GitWitlessRunner(env=dict(os.environ, GIT_TERMINAL_PROMPT='0'))
+    start = time.monotonic()
+    try:
+        runner.run(
+            ['git', 'ls-remote', '--', giturl, 'HEAD'],
+            protocol=_ProbeProtocol,
+            timeout=timeout,
+        )
+    except CommandError as e:
+        CapturedException(e)
+        if e.kwargs.get('timed_out'):
+            lgr.debug("Probing clone candidate %s timed out", giturl)
+            return False, None
+        return False, time.monotonic() - start
+    return True, time.monotonic() - start
+
+
+def _rank_clone_candidates(
+        candidate_sources: List,
+        timeout: float) -> List:
+    """Sort clone candidates by their cost and response time
+
+    All candidates on remote hosts are probed concurrently with a
+    lightweight `git ls-remote`. Candidates are then ranked by their 'cost'
+    property (if any), plus the measured latency, and candidates that could
+    not be reached go last. The latency of each host is remembered for the
+    rest of the session, and a host that did not respond within `timeout`
+    is not probed again, but its candidates always rank last.
+
+    Parameters
+    ----------
+    candidate_sources: list
+      Each value is a dict with properties, as returned by
+      `_generate_candidate_clone_sources()`
+    timeout: float
+      Time in seconds, after which a probe is given up.
+
+    Returns
+    -------
+    list
+      The candidate records in the order they should be tried.
+    """
+    if len(candidate_sources) < 2:
+        return candidate_sources
+    hosts = [_get_candidate_host(c['giturl']) for c in candidate_sources]
+    with _host_probes_lock:
+        to_probe = {
+            i: c['giturl'] for i, (c, host)
+            in enumerate(zip(candidate_sources, hosts))
+            if host is not None and host not in _host_probes
+        }
+    probes = {}
+    if to_probe:
+        lgr.debug("Probing %s concurrently",
+                  single_or_plural('clone candidate', 'clone candidates',
+                                   len(to_probe), include_count=True))
+        with ThreadPoolExecutor(len(to_probe)) as executor:
+            futures = {
+                i: executor.submit(_probe_clone_candidate, url, timeout)
+                for i, url in to_probe.items()
+            }
+            probes = {i: f.result() for i, f in futures.items()}
+        with _host_probes_lock:
+            for i, (_, latency) in probes.items():
+                host = hosts[i]
+                if latency is None:
+                    _host_probes[host] = None
+                elif _host_probes.get(host, 0) is not None:
+                    # keep the fastest response from a host
+                    _host_probes[host] = min(
+                        latency, _host_probes.get(host, latency))
+
+    def _rank(i):
+        cand = candidate_sources[i]
+        host = hosts[i]
+        if i in probes:
+            reachable, latency = probes[i]
+        elif host is not None:
+            # a host probed before
+            latency = _host_probes.get(host)
+            reachable = latency is not None
+        else:
+            # local, or not probed
+            reachable, latency = True, 0
+        return (
+            not reachable,
+            (cand.get('cost') or 0)
+            + _PROBE_LATENCY_COST * (latency or 0),
+        )
+
+    # a stable sort, that keeps the given order for equal ranks
+    order = sorted(range(len(candidate_sources)), key=_rank)
+    ranked = [candidate_sources[i] for i in order]
+    lgr.debug("Ranked clone candidates: %s", [c['giturl'] for c in ranked])
+    return ranked
+
+
 def _test_existing_clone_target(
         destds: Dataset,
         candidate_sources: List) -> Tuple:
@@ -730,6 +933,15 @@ def _try_git_clone_candidate(
         opts = clone_opts + ["--branch=" + cand['version']]
     else:
         opts = clone_opts
+    if cand.get('reference', None):
+        # share the Git objects of a local source via alternates, instead of
+        # hardlinking (paths) or copying (file:// URLs) them. Either option
+        # alone sets up the alternates, but git ignores --shared for URLs.
+        # GitRepo.clone() passes file:// URLs on as URLs on Windows only
+        if on_windows and isinstance(RI(cand['giturl']), URL):
+            opts = opts + ['--reference-if-able', cand['reference']]
+        else:
+            opts = opts + ['--shared']
 
     try:
         GitRepo.clone(
@@ -13,7 +13,9 @@
 __docformat__ = 'restructuredtext'
 
 import logging
+import os
 import re
+from functools import partial
 from itertools import chain
 
 from datalad.core.local.diff import diff_dataset
@@ -45,6 +47,10 @@ from datalad.support.constraints import (
 )
 from datalad.support.exceptions import CommandError
 from datalad.support.gitrepo import GitRepo
+from datalad.support.parallel import (
+    Prefetcher,
+    ProducerConsumer,
+)
 from datalad.support.param import Parameter
 from datalad.utils import (
     Path,
@@ -246,18 +252,12 @@ class Push(Interface):
             recursive,
             recursion_limit)
 
-        # instead of a loop, this could all be done in parallel
         matched_anything = False
-        for dspath, dsrecords in ds_spec:
+        for dspath, results in _push_datasets(
+                ds_spec, to, data, force, jobs, res_kwargs,
+                got_path_arg=True if path else False):
             matched_anything = True
-            lgr.debug('Pushing Dataset at %s', dspath)
-            pbars = {}
-            yield from _push(
-                dspath, dsrecords, to, data, force, jobs, res_kwargs.copy(), pbars,
-                got_path_arg=True if path else False)
-            # take down progress bars for this dataset
-            for i, ds in pbars.items():
-                log_progress(lgr.info, i, 'Finished push of %s', ds)
+            yield from results
         if not matched_anything:
             potential_remote = False
             if not to and len(paths) == 1:
@@ -405,6 +405,102 @@ def _datasets_since_(dataset, since, paths, recursive, recursion_limit):
         yield (cur_ds, ds_res)
 
 
+def _push_ds(dspath, content, target, data, force, jobs, res_kwargs,
+             got_path_arg, wait_for_subdatasets=None):
+    lgr.debug('Pushing Dataset at %s', dspath)
+    pbars = {}
+    yield from _push(
+        dspath, content, target, data, force, jobs, res_kwargs.copy(), pbars,
+        got_path_arg=got_path_arg,
+        wait_for_subdatasets=wait_for_subdatasets)
+    # take down progress bars for this dataset
+    for i, ds in pbars.items():
+        log_progress(lgr.info, i, 'Finished push of %s', ds)
+
+
+def _collect_push_ds(*args, **kwargs):
+    # collect all results of a push in a worker thread, and any exception,
+    # to re-raise it only after the results obtained before were reported
+    results = []
+    try:
+        for res in _push_ds(*args, **kwargs):
+            results.append(res)
+    except Exception as e:
+        return results, e
+    return results, None
+
+
+def _wait_for_futures(futures):
+    for f in futures:
+        # raises CancelledError, if the call was cancelled
+        _, exc = f.result()
+        if exc is not None:
+            # like a push of datasets one by one, do not go on with a
+            # superdataset that would reference the state of a subdataset
+            # that failed to be pushed
+            raise exc
+
+
+def _push_datasets(ds_spec, target, data, force, jobs, res_kwargs,
+                   got_path_arg):
+    """Push several datasets, concurrently if possible
+
+    A single budget of `jobs` is shared by all datasets: up to that many
+    datasets are pushed concurrently, and the data transfer of each runs
+    with an equal share of the jobs. With `jobs` of None or 'auto',
+    'datalad.runtime.max-jobs' datasets are pushed concurrently.
+
+    The branches of a dataset are only pushed after the pushes of all its
+    subdatasets are done, such that a superdataset at the target never
+    references a subdataset state that is not yet available. This relies on
+    the bottom-up order of `ds_spec`.
+
+    Yields
+    ------
+    (str, iterable)
+      Path of each dataset, in the order of `ds_spec`, and all its results.
+    """
+    n_jobs = ProducerConsumer.get_effective_jobs(jobs)
+    if n_jobs and n_jobs > 1:
+        # all datasets need to be known to start pushing them
+        ds_spec = list(ds_spec)
+    if not n_jobs or n_jobs <= 1 or len(ds_spec) <= 1:
+        for dspath, dsrecords in ds_spec:
+            yield dspath, _push_ds(
+                dspath, dsrecords, target, data, force, jobs, res_kwargs,
+                got_path_arg)
+        return
+
+    n_concurrent = min(n_jobs, len(ds_spec))
+    ds_jobs = jobs if jobs in (None, 'auto') \
+        else max(1, jobs // n_concurrent)
+    with Prefetcher(jobs=n_concurrent) as prefetcher:
+        # futures of the pushes not yet waited for by a superdataset
+        pending = {}
+        for i, (dspath, dsrecords) in enumerate(ds_spec):
+            prefix = dspath + os.sep
+            subds_futures = [
+                pending.pop(p) for p in list(pending)
+                if p.startswith(prefix)]
+            # subdatasets were submitted before, and will be evaluated
+            # first, hence no worker waits for a call that cannot start
+            pending[dspath] = prefetcher.submit(
+                i, _collect_push_ds,
+                dspath, dsrecords, target, data, force, ds_jobs,
+                res_kwargs, got_path_arg,
+                wait_for_subdatasets=partial(
+                    _wait_for_futures, subds_futures)
+                if subds_futures else None)
+        for i, (dspath, dsrecords) in enumerate(ds_spec):
+            results, exc = prefetcher.get(
+                i, _collect_push_ds,
+                dspath, dsrecords, target, data, force, ds_jobs,
+                res_kwargs, got_path_arg)
+            yield dspath, results
+            if exc is not None:
+                raise exc
+
+
 @todo_interface_for_extensions
 def _transfer_data(repo, ds, target, content, data, force, jobs, res_kwargs,
                    got_path_arg):
@@ -421,7 +517,7 @@ def _transfer_data(repo, ds, target, content, data, force, jobs, res_kwargs,
 
 
 def _push(dspath, content, target, data, force, jobs, res_kwargs, pbars,
-          got_path_arg=False):
+          got_path_arg=False, wait_for_subdatasets=None):
     force_git_push = force in ('all', 'gitpush')
 
     # nothing recursive in here, we only need a repo to work with
@@ -624,6 +720,7 @@ def _push(dspath, content, target, data, force, jobs, res_kwargs, pbars,
             res_kwargs.copy(),
             pbars,
             got_path_arg=got_path_arg,
+            wait_for_subdatasets=wait_for_subdatasets,
         )
 
     # git-annex data copy
@@ -711,6 +808,11 @@ def _push(dspath, content, target, data, force, jobs, res_kwargs, pbars,
         lgr.debug('No refspecs found that need to be pushed')
         return
 
+    if wait_for_subdatasets is not None:
+        # subdataset states must be available at the target before
+        # they are referenced by a pushed commit
+        wait_for_subdatasets()
+
     # and push all relevant branches, plus the git-annex branch to announce
     # local availability info too
     yield from _push_refspecs(
@@ -26,8 +26,12 @@ from datalad.api import (
 from datalad.cmd import GitWitlessRunner
 from datalad.cmd import WitlessRunner as Runner
 from datalad.config import ConfigManager
+from datalad.core.distributed import clone_utils
 from datalad.core.distributed.clone_utils import (
+    _get_candidate_host,
     _get_installationpath_from_url,
+    _probe_clone_candidate,
+    _rank_clone_candidates,
     decode_source_spec,
 )
 from datalad.distribution.dataset import Dataset
@@ -1681,6 +1685,47 @@ def test_clone_git_clone_opts(path=None):
          f"refs/remotes/{DEFAULT_REMOTE}/{DEFAULT_BRANCH}"})
 
 
+@with_tempfile
+def test_clone_reference(path=None):
+    path = Path(path)
+    ds_a = create(path / "ds_a", annex=False)
+    ds_a.repo.commit(msg="c1", options=["--allow-empty"])
+
+    for i, source in enumerate((ds_a.path, get_local_file_url(ds_a.path))):
+        ds_b = clone(source, path / "ds_b{}".format(i), reckless='reference')
+        eq_(ds_b.repo.get_hexsha(), ds_a.repo.get_hexsha())
+        # Git objects are shared via alternates, not copied or hardlinked
+        alternates = ds_b.repo.dot_git / 'objects' / 'info' / 'alternates'
+        eq_([Path(p).resolve() for p in alternates.read_text().splitlines()],
+            [(ds_a.repo.dot_git / 'objects').resolve()])
+        eq_([p for p in (ds_b.repo.dot_git / 'objects').rglob('*')
+             if p.is_file() and p.parent.name not in ('info', 'pack')],
+            [])
+        # the mode is inherited to subdataset clones
+        eq_(ds_b.config.get('datalad.clone.reckless'), 'reference')
+
+    # without the mode, nothing is shared
+    ds_c = clone(ds_a.path, path / "ds_c")
+    assert_false((ds_c.repo.dot_git / 'objects' / 'info' / 'alternates')
+                 .exists())
+
+
+@with_tempfile
+def test_clone_reference_untrusted(path=None):
+    path = Path(path)
+    src = create(path / "src")
+    src.create('sub')
+    ds = clone(src.path, path / "ds", reckless='reference')
+    # the clone shares objects with its source, and must not be counted
+    # as a copy of any content
+    eq_(ds.repo.repo_info()['untrusted repositories'][0]['here'], True)
+    # the same goes for subdatasets, which inherit the mode
+    sub = ds.get('sub', get_data=False, result_xfm='datasets',
+                 return_type='item-or-list')
+    eq_(sub.config.get('datalad.clone.reckless'), 'reference')
+    eq_(sub.repo.repo_info()['untrusted repositories'][0]['here'], True)
+
+
 @with_tempfile
 @with_tempfile
 def test_clone_url_mapping(src_path=None, dest_path=None):
@@ -1807,3 +1852,89 @@ def test_clone_self_referential_remote(path=None):
         raise AssertionError("Clone encountered infinite recursion with self-referential remote")
     finally:
         sys.setrecursionlimit(old_limit)
+
+
+@with_tempfile(mkdir=True)
+def test_rank_clone_candidates(path=None):
+    eq_(_get_candidate_host('https://example.com/ds'), 'example.com')
+    eq_(_get_candidate_host('user@example.com:ds'), 'example.com')
+    ok_(_get_candidate_host(path) is None)
+    ok_(_get_candidate_host('file:///some/ds') is None)
+    ok_(_get_candidate_host('osf://abcd') is None)
+
+    # a real probe of a local repository, no remote host needed
+    GitRepo(path, create=True)
+    reachable, latency = _probe_clone_candidate(path, timeout=10)
+    ok_(reachable)
+    ok_(latency >= 0)
+    eq_(_probe_clone_candidate(op.join(path, 'missing'), timeout=10)[0],
+        False)
+
+    latencies = {
+        'https://slow.example.com/ds': (True, 0.5),
+        'https://fast.example.com/ds': (True, 0.01),
+        'https://dead.example.com/ds': (False, None),
+        'https://fast.example.com/missing': (False, 0.01),
+    }
+    probed = []
+
+    def fake_probe(giturl, timeout):
+        probed.append(giturl)
+        return latencies[giturl]
+
+    cands = [
+        dict(giturl='https://dead.example.com/ds', cost=100),
+        dict(giturl='https://fast.example.com/missing', cost=100),
+        dict(giturl='https://slow.example.com/ds', cost=100),
+        dict(giturl=path, cost=200),
+        dict(giturl='https://fast.example.com/ds', cost=100),
+    ]
+    with patch.dict(clone_utils._host_probes, clear=True), \
+            patch.object(clone_utils, '_probe_clone_candidate', fake_probe):
+        # nothing to rank
+        eq_(_rank_clone_candidates(cands[:1], 1), cands[:1])
+        eq_(probed, [])
+        ranked = _rank_clone_candidates(cands, 1)
+        # all remote candidates were probed, the local one not
+        eq_(sorted(probed), sorted(latencies))
+        # cost plus latency decides, unreachable candidates go last
+        eq_([c['giturl'] for c in ranked], [
+            'https://fast.example.com/ds',
+            'https://slow.example.com/ds',
+            path,
+            'https://dead.example.com/ds',
+            'https://fast.example.com/missing',
+        ])
+        # hosts are remembered for the session, and not probed again
+        eq_(clone_utils._host_probes['dead.example.com'], None)
+        probed.clear()
+        ranked = _rank_clone_candidates(list(reversed(cands)), 1)
+        eq_(probed, [])
+        # the given order is kept for equal ranks
+        eq_([c['giturl'] for c in ranked][:3], [
+            'https://fast.example.com/ds',
+            'https://fast.example.com/missing',
+            'https://slow.example.com/ds',
+        ])
+        eq_(ranked[-1]['giturl'], 'https://dead.example.com/ds')
+
+
+def test_probe_clone_candidate_timeout():
+    import socket
+    import time
+
+    # a server that accepts connections, but never answers
+    with socket.socket() as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        url = 'git://127.0.0.1:{}/ds'.format(server.getsockname()[1])
+        start = time.monotonic()
+        eq_(_probe_clone_candidate(url, timeout=1), (False, None))
+        # the hanging probe was stopped, and not waited for
+        ok_(time.monotonic() - start < 10)
+        # the probe process is gone, and has closed its connection
+        conn, _ = server.accept()
+        with conn:
+            conn.settimeout(10)
+            while conn.recv(4096):
+                pass
@@ -12,9 +12,12 @@
 
 import logging
 import os
+import time
+from unittest.mock import patch
 
 import pytest
 
+from datalad.core.distributed import push as push_mod
 from datalad.core.distributed.clone import Clone
 from datalad.core.distributed.push import Push
 from datalad.distribution.dataset import Dataset
@@ -1073,3 +1076,76 @@ def test_push_custom_summary(path=None):
         ds.push(to="sib", result_renderer="default", on_failure="ignore")
         assert_in("Hints:", cmo.out)
         assert_in("action summary:", cmo.out)
+
+
+@with_tempfile
+def test_push_recursive_concurrent(path=None):
+    path = Path(path)
+    ds = Dataset(path / "ds").create(annex=False)
+    ds.create("sub1", annex=False).create("subsub", annex=False)
+    ds.create("sub2", annex=False)
+    ds.save()
+    subsub = Path("sub1") / "subsub"
+    assert_repo_status(ds.path)
+    for sub in ds.subdatasets(recursive=True, result_xfm='datasets') + [ds]:
+        mk_push_target(sub, "target", str(path / "target" / sub.pathobj.name),
+                       annex=False)
+
+    pushed = []
+    orig_push_refspecs = push_mod._push_refspecs
+
+    def slow_push_refspecs(repo, *args, **kwargs):
+        if repo.path != ds.path:
+            # give a superdataset the chance to overtake
+            time.sleep(0.2)
+        pushed.append(repo.path)
+        yield from orig_push_refspecs(repo, *args, **kwargs)
+
+    with patch.object(push_mod, '_push_refspecs', slow_push_refspecs):
+        res = ds.push(to="target", recursive=True, jobs=4, **ckwa)
+    dspaths = [str(ds.pathobj / p) for p in (subsub, "sub1", "sub2")] \
+        + [ds.path]
+    # results are reported in the usual bottom-up order
+    eq_([r['path'] for r in res if r['action'] == 'publish'], dspaths)
+    assert_status('ok', res)
+    # git pushes of superdatasets only happen after those of their
+    # subdatasets
+    ok_(pushed.index(dspaths[0]) < pushed.index(dspaths[1]))
+    eq_(pushed[-1], ds.path)
+    for dspath in dspaths:
+        eq_(GitRepo(str(path / "target" / Path(dspath).name))
+            .get_hexsha(DEFAULT_BRANCH),
+            GitRepo(dspath).get_hexsha(DEFAULT_BRANCH))
+
+
+@with_tempfile
+def test_push_recursive_concurrent_failure(path=None):
+    path = Path(path)
+    ds = Dataset(path / "ds").create(annex=False)
+    ds.create("sub1", annex=False)
+    ds.create("sub2", annex=False)
+    ds.save()
+    assert_repo_status(ds.path)
+    for sub in ds.subdatasets(result_xfm='datasets') + [ds]:
+        mk_push_target(sub, "target", str(path / "target" / sub.pathobj.name),
+                       annex=False)
+
+    pushed = []
+    orig_push_refspecs = push_mod._push_refspecs
+
+    def failing_push_refspecs(repo, *args, **kwargs):
+        if repo.path == str(ds.pathobj / "sub1"):
+            # give the superdataset the chance to overtake
+            time.sleep(0.2)
+            raise RuntimeError("push failed")
+        pushed.append(repo.path)
+        yield from orig_push_refspecs(repo, *args, **kwargs)
+
+    with patch.object(push_mod, '_push_refspecs', failing_push_refspecs):
+        with assert_raises(RuntimeError):
+            ds.push(to="target", recursive=True, jobs=4, **ckwa)
+    # the superdataset branch was not pushed, it would reference a state of
+    # a subdataset that is not available at the target
+    assert_not_in(ds.path, pushed)
+    assert_not_in(DEFAULT_BRANCH,
+                  GitRepo(str(path / "target" / "ds")).get_branches())
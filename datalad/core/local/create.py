@@ -361,11 +361,6 @@ class Create(Interface):
         # Note, that Dataset property `id` will change when we unset the
         # respective config. Therefore store it before:
         tbds_id = tbds.id
-        if id_var in tbds_config:
-            # make sure we reset this variable completely, in case of a
-            # re-create
-            tbds_config.unset(id_var, scope='branch')
-
         if _seed is None:
             # just the standard way
             # use a fully random identifier (i.e. UUID version 4)
@@ -373,23 +368,27 @@ class Create(Interface):
         else:
             # Let's generate preseeded ones
             uuid_id = str(uuid.UUID(int=random.getrandbits(128)))
-        tbds_config.add(
-            id_var,
-            tbds_id if tbds_id is not None else uuid_id,
-            scope='branch',
-            reload=False)
-
-        # make config overrides permanent in the repo config
-        # this is similar to what `annex init` does
-        # we are only doing this for config overrides and do not expose
-        # a dedicated argument, because it is sufficient for the cmdline
-        # and unnecessary for the Python API (there could simply be a
-        # subsequence ds.config.add() call)
-        for k, v in tbds_config.overrides.items():
-            tbds_config.add(k, v, scope='local', reload=False)
-
-        # all config manipulation is done -> fll reload
-        tbds_config.reload()
+
+        # all config manipulation is written at once, followed by a single
+        # reload
+        with tbds_config.transaction():
+            if id_var in tbds_config:
+                # make sure we reset this variable completely, in case of a
+                # re-create
+                tbds_config.unset(id_var, scope='branch')
+            tbds_config.add(
+                id_var,
+                tbds_id if tbds_id is not None else uuid_id,
+                scope='branch')
+
+            # make config overrides permanent in the repo config
+            # this is similar to what `annex init` does
+            # we are only doing this for config overrides and do not expose
+            # a dedicated argument, because it is sufficient for the cmdline
+            # and unnecessary for the Python API (there could simply be a
+            # subsequence ds.config.add() call)
+            for k, v in tbds_config.overrides.items():
+                tbds_config.add(k, v, scope='local')
 
         # must use the repo.pathobj as this will have resolved symlinks
         add_to_git[tbrepo.pathobj / '.datalad'] = {
@@ -35,6 +35,7 @@ from datalad.support.constraints import (
     EnsureStr,
 )
 from datalad.support.exceptions import InvalidGitReferenceError
+from datalad.support.parallel import Prefetcher
 from datalad.support.param import Parameter
 from datalad.utils import (
     ensure_list,
@@ -122,7 +123,8 @@ class Diff(Interface):
             annex=None,
             untracked='normal',
             recursive=False,
-            recursion_limit=None):
+            recursion_limit=None,
+            jobs=None):
         yield from diff_dataset(
             dataset=dataset,
             fr=ensure_unicode(fr),
@@ -132,7 +134,8 @@ class Diff(Interface):
             annex=annex,
             untracked=untracked,
             recursive=recursive,
-            recursion_limit=recursion_limit)
+            recursion_limit=recursion_limit,
+            jobs=jobs)
 
     @staticmethod
     def custom_result_renderer(res, **kwargs):  # pragma: more cover
@@ -151,6 +154,7 @@ def diff_dataset(
         recursion_limit=None,
         reporting_order='depth-first',
         datasets_only=False,
+        jobs=None,
 ):
     """Internal helper to diff a dataset
 
@@ -191,6 +195,9 @@ def diff_dataset(
       Consider only changes to (sub)datasets but limiting operation only to
       paths of subdatasets.
       Note: ATM incompatible with explicit specification of `path`.
+    jobs : int or None or "auto", optional
+      Number of subdatasets to query concurrently (see main diff() command).
+      The order of reports is not affected.
 
     Yields
     ------
@@ -269,32 +276,147 @@ def diff_dataset(
 
     # cache to help avoid duplicate status queries
     content_info_cache = {}
-    for res in _diff_ds(
-            ds,
-            fr,
-            to,
-            constant_refs,
-            recursion_limit
-            if recursion_limit is not None and recursive
-            else -1 if recursive else 0,
-            # TODO recode paths to repo path reference
-            origpaths=None if not path else dict(path),
+    # with multiple jobs, subdatasets are queried concurrently, while
+    # results are reported in the same order
+    with Prefetcher(jobs) as prefetcher:
+        for res in _diff_ds(
+                ds,
+                fr,
+                to,
+                constant_refs,
+                recursion_limit
+                if recursion_limit is not None and recursive
+                else -1 if recursive else 0,
+                # TODO recode paths to repo path reference
+                origpaths=None if not path else dict(path),
+                untracked=untracked,
+                annexinfo=annex,
+                cache=content_info_cache,
+                order=reporting_order,
+                datasets_only=datasets_only,
+                prefetcher=prefetcher,
+        ):
+            res.update(
+                refds=ds.path,
+                logger=lgr,
+                action='diff',
+            )
+            yield res
+
+
+def _diff_ds(ds, fr, to, constant_refs, recursion_level, origpaths, untracked,
+             annexinfo, cache, order='depth-first', datasets_only=False,
+             prefetcher=None):
+    query_args = (
+        ds, fr, to, origpaths, untracked, annexinfo, cache, datasets_only,
+        # with concurrent queries, obtain all records at once
+        bool(prefetcher and prefetcher.jobs))
+    try:
+        query = prefetcher.get(
+            _get_diff_key(ds, fr, to), _query_ds, *query_args) \
+            if prefetcher else _query_ds(*query_args)
+    except InvalidGitReferenceError as e:
+        yield dict(
+            path=ds.path,
+            status='impossible',
+            message=str(e),
+        )
+        return
+    if query is None:
+        return
+    paths, diff_items = query
+
+    repo_path = ds.repo.pathobj
+    if prefetcher and prefetcher.jobs:
+        # query all subdatasets that we will report on concurrently,
+        # while reporting on this dataset
+        for path, props in diff_items:
+            if props.get('state', None) not in ('added', 'modified'):
+                continue
+            subdiff = _get_subds_diff(
+                ds, path, props, paths, fr, to, constant_refs,
+                recursion_level)
+            if subdiff:
+                subds, subfr, subto, _ = subdiff
+                prefetcher.submit(
+                    _get_diff_key(subds, subfr, subto),
+                    _query_ds,
+                    subds, subfr, subto, origpaths, untracked, annexinfo,
+                    cache, datasets_only, True)
+
+    # potentially collect subdataset diff call specs for the end
+    # (if order == 'breadth-first')
+    ds_diffs = []
+    subds_diffcalls = []
+    for path, props in diff_items:
+        pathinds = str(ds.pathobj / path.relative_to(repo_path))
+        path_rec = dict(
+            props,
+            path=pathinds,
+            # report the dataset path rather than the repo path to avoid
+            # realpath/symlink issues
+            parentds=ds.path,
+            status='ok',
+        )
+        if order in ('breadth-first', 'depth-first'):
+            yield path_rec
+        elif order == 'bottom-up':
+            ds_diffs.append(path_rec)
+        else:
+            raise ValueError(order)
+        subdiff = _get_subds_diff(
+            ds, path, props, paths, fr, to, constant_refs, recursion_level)
+        if not subdiff:
+            continue
+        subds, subfr, subto, subrecursion_level = subdiff
+        call_args = (subds, subfr, subto, constant_refs)
+        call_kwargs = dict(
+            recursion_level=subrecursion_level,
+            origpaths=origpaths,
             untracked=untracked,
-            annexinfo=annex,
-            cache=content_info_cache,
-            order=reporting_order,
+            annexinfo=annexinfo,
+            cache=cache,
+            order=order,
             datasets_only=datasets_only,
-    ):
-        res.update(
-            refds=ds.path,
-            logger=lgr,
-            action='diff',
+            prefetcher=prefetcher,
         )
-        yield res
+        if order in ('depth-first', 'bottom-up'):
+            yield from _diff_ds(*call_args, **call_kwargs)
+        elif order == 'breadth-first':
+            subds_diffcalls.append((call_args, call_kwargs))
+        else:
+            raise ValueError(order)
+    # deal with staged ds diffs (for bottom-up)
+    for rec in ds_diffs:
+        yield rec
+    # deal with staged subdataset diffs (for breadth-first)
+    for call_args, call_kwargs in subds_diffcalls:
+        yield from _diff_ds(*call_args, **call_kwargs)
 
 
-def _diff_ds(ds, fr, to, constant_refs, recursion_level, origpaths, untracked,
-             annexinfo, cache, order='depth-first', datasets_only=False):
+def _get_diff_key(ds, fr, to):
+    """Helper to identify a diff query of a dataset for a Prefetcher"""
+    return ds.pathobj, fr, to
+
+
+def _query_ds(ds, fr, to, origpaths, untracked, annexinfo, cache,
+              datasets_only, as_list=False):
+    """Helper of _diff_ds() to query the difference of a dataset
+
+    Returns
+    -------
+    tuple or None
+      None, if there is nothing to report on. Otherwise, the paths the query
+      was constrained to (dict with repo paths and a flag whether to
+      go inside, or None), and the (path, props) items as reported by
+      Repo.diffstatus(), optionally amended by annex properties. With
+      `as_list`, the items are reported as a list.
+
+    Raises
+    ------
+    InvalidGitReferenceError
+      If `fr` or `to` cannot be resolved in the dataset.
+    """
     if not ds.is_installed():
         # asked to query a subdataset that is not available
         lgr.debug("Skip diff of unavailable subdataset: %s", ds)
@@ -326,24 +448,28 @@ def _diff_ds(ds, fr, to, constant_refs, recursion_level, origpaths, untracked,
                 if ds.pathobj in p.parents or (p == ds.pathobj and goinside)
             )
     paths_arg = list(paths) if paths else None
-    try:
-        lgr.debug("Diff %s from '%s' to '%s'", ds, fr, to)
-        diff_state = repo.diffstatus(
+    with_annexinfo = annexinfo and hasattr(repo, 'get_content_annexinfo')
+    # report one record at a time, annex reports need all records at once,
+    # though
+    stream = not with_annexinfo and ds.config.obtain('datalad.status.stream')
+    lgr.debug("Diff %s from '%s' to '%s'", ds, fr, to)
+    if stream:
+        diff_items = repo.diffstatus_(
             fr,
             to,
             paths=paths_arg,
             untracked=untracked,
-            eval_submodule_state='full' if to is None else 'commit',
-            _cache=cache)
-    except InvalidGitReferenceError as e:
-        yield dict(
-            path=ds.path,
-            status='impossible',
-            message=str(e),
-        )
-        return
+            eval_submodule_state='full' if to is None else 'commit')
+        return paths, list(diff_items) if as_list else diff_items
+    diff_state = repo.diffstatus(
+        fr,
+        to,
+        paths=paths_arg,
+        untracked=untracked,
+        eval_submodule_state='full' if to is None else 'commit',
+        _cache=cache)
 
-    if annexinfo and hasattr(repo, 'get_content_annexinfo'):
+    if with_annexinfo:
         # this will amend `diff_state`
         repo.get_content_annexinfo(
             paths=paths_arg,
@@ -359,86 +485,57 @@ def _diff_ds(ds, fr, to, constant_refs, recursion_level, origpaths, untracked,
                 eval_availability=annexinfo in ('availability', 'all'),
                 ref=fr,
                 key_prefix="prev_")
+    return paths, list(diff_state.items()) if as_list else diff_state.items()
 
-    # potentially collect subdataset diff call specs for the end
-    # (if order == 'breadth-first')
-    ds_diffs = []
-    subds_diffcalls = []
-    for path, props in diff_state.items():
-        pathinds = str(ds.pathobj / path.relative_to(repo_path))
-        path_rec = dict(
-            props,
-            path=pathinds,
-            # report the dataset path rather than the repo path to avoid
-            # realpath/symlink issues
-            parentds=ds.path,
-            status='ok',
-        )
-        if order in ('breadth-first', 'depth-first'):
-            yield path_rec
-        elif order == 'bottom-up':
-            ds_diffs.append(path_rec)
-        else:
-            raise ValueError(order)
-        # for a dataset we need to decide whether to dive in, or not
-        if props.get('type', None) == 'dataset' and (
-                # subdataset path was given in rsync-style 'ds/'
-                (paths and paths.get(path, False))
-                # there is still sufficient recursion level left
-                or recursion_level != 0
-                # no recursion possible anymore, but one of the given
-                # path arguments is in this subdataset
-                or (recursion_level == 0
-                    and paths
-                    and any(path in p.parents for p in paths))):
-            subds_state = props.get('state', None)
-            if subds_state in ('clean', 'deleted'):
-                # no need to look into the subdataset
-                continue
-            elif subds_state in ('added', 'modified'):
-                # dive
-                subds = Dataset(pathinds)
-                call_args = (
-                    subds,
-                    # from before time or from the reported state
-                    fr if constant_refs
-                    else None
-                    if subds_state == 'added'
-                    else props['prev_gitshasum'],
-                    # to the last recorded state, or the worktree
-                    None if to is None
-                    else to if constant_refs
-                    else props['gitshasum'],
-                    constant_refs,
-                )
-                call_kwargs = dict(
-                    # subtract on level on the way down, unless the path
-                    # args instructed to go inside this subdataset
-                    recursion_level=recursion_level
-                    # protect against dropping below zero (would mean unconditional
-                    # recursion)
-                    if not recursion_level or (paths and paths.get(path, False))
-                    else recursion_level - 1,
-                    origpaths=origpaths,
-                    untracked=untracked,
-                    annexinfo=annexinfo,
-                    cache=cache,
-                    order=order,
-                    datasets_only=datasets_only,
-                )
-                if order in ('depth-first', 'bottom-up'):
-                    yield from _diff_ds(*call_args, **call_kwargs)
-                elif order == 'breadth-first':
-                    subds_diffcalls.append((call_args, call_kwargs))
-                else:
-                    raise ValueError(order)
-            else:
-                raise RuntimeError(
-                    "Unexpected subdataset state '{}'. That sucks!".format(
-                        subds_state))
-    # deal with staged ds diffs (for bottom-up)
-    for rec in ds_diffs:
-        yield rec
-    # deal with staged subdataset diffs (for breadth-first)
-    for call_args, call_kwargs in subds_diffcalls:
-        yield from _diff_ds(*call_args, **call_kwargs)
+
+def _get_subds_diff(ds, path, props, paths, fr, to, constant_refs,
+                    recursion_level):
+    """Helper of _diff_ds() to decide whether to dive into a subdataset
+
+    Returns
+    -------
+    tuple or None
+      None, if there is no need to look into the subdataset. Otherwise,
+      the subdataset, the commit-ish to compare from and to, and the
+      recursion level for its diff.
+    """
+    # for a dataset we need to decide whether to dive in, or not
+    if not (props.get('type', None) == 'dataset' and (
+            # subdataset path was given in rsync-style 'ds/'
+            (paths and paths.get(path, False))
+            # there is still sufficient recursion level left
+            or recursion_level != 0
+            # no recursion possible anymore, but one of the given
+            # path arguments is in this subdataset
+            or (recursion_level == 0
+                and paths
+                and any(path in p.parents for p in paths)))):
+        return
+    subds_state = props.get('state', None)
+    if subds_state in ('clean', 'deleted'):
+        # no need to look into the subdataset
+        return
+    elif subds_state not in ('added', 'modified'):
+        raise RuntimeError(
+            "Unexpected subdataset state '{}'. That sucks!".format(
+                subds_state))
+    # dive
+    return (
+        Dataset(str(ds.pathobj / path.relative_to(ds.repo.pathobj))),
+        # from before time or from the reported state
+        fr if constant_refs
+        else None
+        if subds_state == 'added'
+        else props['prev_gitshasum'],
+        # to the last recorded state, or the worktree
+        None if to is None
+        else to if constant_refs
+        else props['gitshasum'],
+        # subtract on level on the way down, unless the path
+        # args instructed to go inside this subdataset
+        recursion_level
+        # protect against dropping below zero (would mean unconditional
+        # recursion)
+        if not recursion_level or (paths and paths.get(path, False))
+        else recursion_level - 1,
+    )
@@ -40,9 +40,11 @@ from datalad.interface.common_opts import (
 from datalad.interface.utils import generic_result_renderer
 from datalad.support.constraints import (
     EnsureChoice,
+    EnsureInt,
     EnsureNone,
     EnsureStr,
 )
+from datalad.support.parallel import Prefetcher
 from datalad.support.param import Parameter
 from datalad.utils import (
     bytes2human,
@@ -77,7 +79,11 @@ _common_diffstatus_params = dict(
         not call git-annex), this will add the result properties
         'has_content' (boolean flag) and 'objloc' (absolute path to an
         existing annex object file); or 'all' which will report all
-        available information (presently identical to 'availability').
+        available information, i.e. additionally the result property
+        'copies', the number of annexes that are known to have a copy of
+        the file content, not counting untrusted ones (like git-annex does
+        for 'numcopies'). It is read from the git-annex branch, without
+        calling git-annex.
         [CMD: The 'basic' mode will be assumed when this option is given,
         but no mode is specified. CMD]
         """),
@@ -90,7 +96,15 @@ _common_diffstatus_params = dict(
         untracked directories are reported as such; 'all': report
         individual files even in fully untracked directories."""),
     recursive=recursion_flag,
-    recursion_limit=recursion_limit)
+    recursion_limit=recursion_limit,
+    jobs=Parameter(
+        args=("-J", "--jobs"),
+        metavar="NJOBS",
+        constraints=EnsureInt() | EnsureNone() | EnsureChoice('auto'),
+        doc="""how many subdatasets to query concurrently in a recursive
+        operation. "auto" corresponds to the number defined by the
+        'datalad.runtime.max-jobs' configuration item. The order of reports
+        is not affected."""))
 
 
 STATE_COLOR_MAP = {
@@ -104,7 +118,7 @@ STATE_COLOR_MAP = {
 
 def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
                          queried, eval_submodule_state, eval_filetype, cache,
-                         reporting_order):
+                         reporting_order, prefetcher=None):
     """Internal helper to obtain status information on a dataset
 
     Parameters
@@ -132,6 +146,9 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
       on the subdataset's submodule in a superdataset (depth-first).
       Alternatively, report all superdataset records first, before reporting
       any subdataset content records (breadth-first).
+    prefetcher : Prefetcher, optional
+      If given, the status of subdatasets is queried concurrently, ahead of
+      reporting on them. The order of reports is not affected.
 
     Yields
     ------
@@ -150,12 +167,50 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
     if ds.pathobj in queried:
         # do not report on a single dataset twice
         return
+    status_args = (
+        ds, paths, annexinfo, untracked, eval_submodule_state, cache,
+        # with concurrent queries, obtain all records at once
+        bool(prefetcher and prefetcher.jobs))
+    status_items = prefetcher.get(
+        _get_status_key(ds, paths), _get_status_items, *status_args) \
+        if prefetcher else _get_status_items(*status_args)
+    yield from _yield_status_items(
+        ds, status_items, annexinfo, untracked, recursion_limit, queried,
+        eval_submodule_state, cache, reporting_order, prefetcher)
+
+
+def _get_status_key(ds, paths):
+    """Helper to identify a status query of a dataset for a Prefetcher"""
+    return ds.pathobj, tuple(paths) if paths else None
+
+
+def _get_status_items(ds, paths, annexinfo, untracked, eval_submodule_state,
+                      cache, as_list=False):
+    """Helper of yield_dataset_status() to query the status of a dataset
+
+    Returns
+    -------
+    iterable
+      (path, props) items, as reported by Repo.diffstatus(), optionally
+      amended by annex properties. With `as_list`, a list.
+    """
     # take the dataset that went in first
     repo = ds.repo
     repo_path = repo.pathobj
     lgr.debug('Querying %s.diffstatus() for paths: %s', repo, paths)
     # recode paths with repo reference for low-level API
     paths = [repo_path / p.relative_to(ds.pathobj) for p in paths] if paths else None
+    with_annexinfo = annexinfo and hasattr(repo, 'get_content_annexinfo')
+    if not with_annexinfo and ds.config.obtain('datalad.status.stream'):
+        # report one record at a time, annex reports need all records
+        # at once, though
+        status_items = repo.diffstatus_(
+            fr='HEAD' if repo.get_hexsha() else None,
+            to=None,
+            paths=paths,
+            untracked=untracked,
+            eval_submodule_state=eval_submodule_state)
+        return list(status_items) if as_list else status_items
     status = repo.diffstatus(
         fr='HEAD' if repo.get_hexsha() else None,
         to=None,
@@ -163,16 +218,16 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
         untracked=untracked,
         eval_submodule_state=eval_submodule_state,
         _cache=cache)
-    if annexinfo and hasattr(repo, 'get_content_annexinfo'):
+    if with_annexinfo:
         if paths:
             # when an annex query has been requested for specific paths,
             # exclude untracked files from the annex query (else gh-7032)
-            untracked = [k for k, v in status.items() if
-                         v['state'] == 'untracked']
+            untracked_paths = [k for k, v in status.items() if
+                               v['state'] == 'untracked']
             lgr.debug(
                 'Skipping %s.get_content_annexinfo() for untracked paths: %s',
                 repo, paths)
-            [paths.remove(p) for p in untracked]
+            [paths.remove(p) for p in untracked_paths]
         lgr.debug('Querying %s.get_content_annexinfo() for paths: %s', repo, paths)
         # this will amend `status`
         repo.get_content_annexinfo(
@@ -180,10 +235,53 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
             init=status,
             eval_availability=annexinfo in ('availability', 'all'),
             ref=None)
+        if annexinfo == 'all':
+            _mark_copies(repo, status)
+    return list(status.items()) if as_list else status.items()
+
+
+def _mark_copies(repo, status):
+    """Add the number of copies of the content of annexed files to `status`
+
+    The locations of all keys are looked up at once.
+    """
+    keys = {props['key'] for props in status.values() if 'key' in props}
+    if not keys:
+        return
+    table = repo.get_key_availability(keys=keys, native=True)
+    untrusted = [
+        uuid for uuid, level in repo.annex_branch.get_trust_levels().items()
+        if level == 'untrusted'
+    ]
+    copies = dict(zip(table.keys, table.copies(exclude=untrusted)))
+    for props in status.values():
+        if 'key' in props:
+            props['copies'] = copies[props['key']]
+
+
+def _yield_status_items(ds, status_items, annexinfo, untracked,
+                        recursion_limit, queried, eval_submodule_state, cache,
+                        reporting_order, prefetcher=None):
+    """Helper of yield_dataset_status() to report on (path, props) items"""
+    repo_path = ds.repo.pathobj
+    if prefetcher and prefetcher.jobs and recursion_limit:
+        # query all subdatasets that we will report on concurrently,
+        # while reporting on this dataset
+        for path, props in status_items:
+            if props.get('type', None) != 'dataset':
+                continue
+            subds = Dataset(str(ds.pathobj / path.relative_to(repo_path)))
+            if subds.pathobj != ds.pathobj and subds.pathobj not in queried \
+                    and subds.is_installed():
+                prefetcher.submit(
+                    _get_status_key(subds, None),
+                    _get_status_items,
+                    subds, None, annexinfo, untracked, eval_submodule_state,
+                    cache, True)
     # potentially collect subdataset status call specs for the end
     # (if order == 'breadth-first')
     subds_statuscalls = []
-    for path, props in status.items():
+    for path, props in status_items:
         cpath = ds.pathobj / path.relative_to(repo_path)
         yield dict(
             props,
@@ -215,6 +313,7 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
                 )
                 call_kwargs = dict(
                     reporting_order='depth-first',
+                    prefetcher=prefetcher,
                 )
                 if reporting_order == 'depth-first':
                     yield from yield_dataset_status(*call_args, **call_kwargs)
@@ -373,7 +472,8 @@ class Status(Interface):
             recursive=False,
             recursion_limit=None,
             eval_subdataset_state='full',
-            report_filetype=None):
+            report_filetype=None,
+            jobs=None):
         if report_filetype is not None:
             warnings.warn(
                 "status(report_filetype=) no longer supported, and will be removed "
@@ -397,31 +497,35 @@ class Status(Interface):
         ds_path = ds.path
         queried = set()
         content_info_cache = {}
-        for res in _yield_paths_by_ds(ds, dataset, ensure_list(path)):
-            if 'status' in res:
-                # this is an error
-                yield res
-                continue
-            for r in yield_dataset_status(
-                    res['ds'],
-                    res['paths'],
-                    annex,
-                    untracked,
-                    recursion_limit
-                    if recursion_limit is not None else -1
-                    if recursive else 0,
-                    queried,
-                    eval_subdataset_state,
-                    None,
-                    content_info_cache,
-                    reporting_order='depth-first'):
-                if 'status' not in r:
-                    r['status'] = 'ok'
-                yield dict(
-                    r,
-                    refds=ds_path,
-                    action='status',
-                )
+        # with multiple jobs, subdatasets are queried concurrently, while
+        # results are reported in the same order
+        with Prefetcher(jobs) as prefetcher:
+            for res in _yield_paths_by_ds(ds, dataset, ensure_list(path)):
+                if 'status' in res:
+                    # this is an error
+                    yield res
+                    continue
+                for r in yield_dataset_status(
+                        res['ds'],
+                        res['paths'],
+                        annex,
+                        untracked,
+                        recursion_limit
+                        if recursion_limit is not None else -1
+                        if recursive else 0,
+                        queried,
+                        eval_subdataset_state,
+                        None,
+                        content_info_cache,
+                        reporting_order='depth-first',
+                        prefetcher=prefetcher):
+                    if 'status' not in r:
+                        r['status'] = 'ok'
+                    yield dict(
+                        r,
+                        refds=ds_path,
+                        action='status',
+                    )
 
     @staticmethod
     def custom_result_renderer(res, **kwargs):  # pragma: more cover
@@ -9,9 +9,13 @@
 """Test status command"""
 
 import os.path as op
+from unittest.mock import patch
 
 import datalad.utils as ut
-from datalad.api import status
+from datalad.api import (
+    clone,
+    status,
+)
 from datalad.core.local.status import get_paths_by_ds
 from datalad.distribution.dataset import Dataset
 from datalad.support.annexrepo import AnnexRepo
@@ -20,6 +24,7 @@ from datalad.support.exceptions import (
     IncompleteResultsError,
     NoDatasetFound,
 )
+from datalad.support.gitrepo import GitRepo
 from datalad.tests.utils_pytest import (
     OBSCURE_FILENAME,
     SkipTest,
@@ -236,6 +241,33 @@ def test_untracked_annex_query(path=None):
         )
 
 
+@with_tempfile(mkdir=True)
+@with_tempfile
+def test_status_copies(origpath=None, path=None):
+    origin = Dataset(origpath).create()
+    (origin.pathobj / 'f1').write_text('content1')
+    (origin.pathobj / 'f2').write_text('content2')
+    origin.save()
+    ds = clone(origin.path, path)
+    ds.get('f1')
+    # 'copies' is only reported with all annex information
+    assert_not_in_results(
+        ds.status(annex='availability', result_renderer='disabled'),
+        copies=2)
+
+    def copies():
+        return {
+            r['path']: r['copies']
+            for r in ds.status(annex='all', result_renderer='disabled')
+            if 'key' in r
+        }
+
+    eq_(copies(), {str(ds.pathobj / 'f1'): 2, str(ds.pathobj / 'f2'): 1})
+    # copies in untrusted annexes do not count
+    ds.repo.call_annex(['untrust', 'here'])
+    eq_(copies(), {str(ds.pathobj / 'f1'): 1, str(ds.pathobj / 'f2'): 1})
+
+
 # https://github.com/datalad/datalad-revolution/issues/64
 # breaks when the tempdir is a symlink
 @with_tempfile(mkdir=True)
@@ -419,3 +451,72 @@ def test_get_paths_by_ds(path=None, otherdspath=None):
         list(paths_by_ds.keys()),
         [ds.pathobj, subds_modified.pathobj]
     )
+
+
+@with_tempfile(mkdir=True)
+def test_status_stream(path=None):
+    ds = Dataset(path).create(annex=False)
+    sub = ds.create('sub', annex=False)
+    subsub = sub.create('subsub', annex=False)
+    for d in (ds, sub, subsub):
+        (d.pathobj / 'committed').write_text('committed')
+    ds.save(recursive=True)
+    (ds.pathobj / 'committed').write_text('modified')
+    (sub.pathobj / 'untracked').write_text('untracked')
+    (subsub.pathobj / 'committed').unlink()
+
+    def _get_report(**kwargs):
+        return sorted(
+            (r['path'], r['state'], r['type'])
+            for r in ds.status(recursive=True, result_renderer='disabled',
+                               **kwargs))
+
+    def _set_stream(value):
+        for d in (ds, sub, subsub):
+            d.config.set('datalad.status.stream', value, scope='local')
+
+    for kwargs in (dict(),
+                   dict(eval_subdataset_state='commit'),
+                   dict(path=['sub'])):
+        report = _get_report(**kwargs)
+        _set_stream('true')
+        # the non-streaming implementation is not used
+        with patch.object(GitRepo, 'diffstatus', side_effect=AssertionError):
+            eq_(report, _get_report(**kwargs))
+        _set_stream('false')
+    diff_kwargs = dict(fr='HEAD~1', to='HEAD', recursive=True,
+                       result_renderer='disabled')
+    report = sorted((r['path'], r['state']) for r in ds.diff(**diff_kwargs))
+    _set_stream('true')
+    with patch.object(GitRepo, 'diffstatus', side_effect=AssertionError):
+        eq_(report,
+            sorted((r['path'], r['state']) for r in ds.diff(**diff_kwargs)))
+
+
+@with_tempfile(mkdir=True)
+def test_status_parallel(path=None):
+    ds = Dataset(path).create(annex=False)
+    for i in range(3):
+        sub = ds.create('sub{}'.format(i), annex=False)
+        sub.create('subsub', annex=False)
+        (sub.pathobj / 'committed').write_text('committed')
+    ds.save(recursive=True)
+    (ds.pathobj / 'sub0' / 'committed').write_text('modified')
+    (ds.pathobj / 'sub1' / 'subsub' / 'untracked').write_text('untracked')
+    (ds.pathobj / 'sub2' / 'committed').unlink()
+
+    # concurrent queries of subdatasets yield the same reports, in the
+    # same order
+    for kwargs in (dict(),
+                   dict(eval_subdataset_state='commit'),
+                   dict(untracked='all'),
+                   dict(path=['sub1', 'sub2'])):
+        eq_(ds.status(recursive=True, result_renderer='disabled', **kwargs),
+            ds.status(recursive=True, jobs=3, result_renderer='disabled',
+                      **kwargs))
+    for kwargs in (dict(fr='HEAD~1', to='HEAD'),
+                   dict(fr='HEAD~1'),
+                   dict()):
+        eq_(ds.diff(recursive=True, result_renderer='disabled', **kwargs),
+            ds.diff(recursive=True, jobs=3, result_renderer='disabled',
+                    **kwargs))
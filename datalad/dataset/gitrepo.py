@@ -52,6 +52,7 @@ from datalad.runner.utils import (
     AssemblingDecoderMixIn,
     LineSplitter,
 )
+from datalad.support.catfile import CatFileService
 from datalad.support.exceptions import (
     CommandError,
     GitIgnoreError,
@@ -127,12 +128,14 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         pass
 
     @classmethod
-    def _cleanup(cls, path):
+    def _cleanup(cls, path, cat_file=None):
         # Ben: I think in case of GitRepo there's nothing to do ATM. Statements
         #      like the one in the out commented __del__ above, don't make sense
         #      with python's GC, IMO, except for manually resolving cyclic
         #      references (not the case w/ ConfigManager ATM).
         lgr.log(1, "Finalizer called on: GitRepo(%s)", path)
+        if cat_file is not None:
+            cat_file.close()
 
     def __hash__(self):
         # the flyweight key is already determining unique instances
@@ -160,13 +163,17 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
 
         self._line_splitter = None
 
+        # no process is started before the first request
+        self._cat_file = CatFileService(self.pathobj)
+
         # Finally, register a finalizer (instead of having a __del__ method).
         # This will be called by garbage collection as well as "atexit". By
         # keeping the reference here, we can also call it explicitly.
         # Note, that we can pass required attributes to the finalizer, but not
         # `self` itself. This would create an additional reference to the object
         # and thereby preventing it from being collected at all.
-        self._finalizer = finalize(self, GitRepo._cleanup, self.pathobj)
+        self._finalizer = finalize(self, GitRepo._cleanup, self.pathobj,
+                                   self._cat_file)
 
     def __eq__(self, obj):
         """Decides whether or not two instances of this class are equal.
@@ -222,6 +229,19 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             self._cfg = ConfigManager(dataset=self, source='any')
         return self._cfg
 
+    @property
+    def cat_file(self):
+        """Get a CatFileService instance for this repository
+
+        The service keeps `git cat-file --batch` processes running for
+        repeated reads of Git objects.
+
+        Returns
+        -------
+        CatFileService
+        """
+        return self._cat_file
+
     @property
     def _fake_dates_enabled(self):
         """Is the repository configured to use fake dates?
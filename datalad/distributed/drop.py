@@ -39,13 +39,13 @@ from datalad.interface.results import (
     success_status_map,
 )
 from datalad.runner.exception import CommandError
+from datalad.support.annexbranch import AnnexBranchReader
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.constraints import (
     EnsureChoice,
     EnsureNone,
     EnsureStr,
 )
-from datalad.support.exceptions import CapturedException
 from datalad.support.param import Parameter
 from datalad.utils import (
     ensure_list,
@@ -678,48 +678,21 @@ def _detect_nondead_annex_at_remotes(repo, annex_uuid):
       Names of any matching remote, the local repository is indicated using
       a `None` label.
     """
-    # build the refs for all remotes and local
+    # read the git-annex branches of all remotes and the local one
     remotes_w_registration = []
     for remote in chain([''], repo.get_remotes()):
-        refprefix = '{}{}git-annex:'.format(
-            remote,
-            '/' if remote else '',
+        annex_branch = AnnexBranchReader(
+            repo,
+            ref='{}{}git-annex'.format(remote, '/' if remote else ''),
         )
-        uuid_known = False
-        try:
-            for line in repo.call_git_items_(
-                    ['cat-file', '-p', refprefix + 'uuid.log']):
-                if line.startswith(annex_uuid):
-                    # use None to label the local repo
-                    uuid_known = True
-                    break
-        except CommandError as e:
-            CapturedException(e)
-            # this is not a problem per-se, logged above, just continue
-            continue
-        if not uuid_known:
-            # if an annex id is not even in the uuid.log, we can stop here
-            # (for this remote)
-            continue
-
-        # annex is known, but maybe is declared dead already, must check
-        # trust.log in addition
-        try:
-            for line in repo.call_git_items_(
-                    ['cat-file', '-p', refprefix + 'trust.log']):
-                columns = line.split()
-                if columns[0] == annex_uuid:
-                    # not known if dead
-                    uuid_known = False if columns[1] == 'X' else True
-                    break
-        except CommandError as e:
-            CapturedException(e)
-            # this is not a problem per-se, logged above, just continue
-            continue
-        finally:
-            if uuid_known:
-                remotes_w_registration.append(remote or None)
-    return(remotes_w_registration)
+        # if an annex id is not even in the uuid.log, we can stop here
+        # (for this remote). If it is known, it may have been declared
+        # dead already
+        if annex_uuid in annex_branch.get_uuids() \
+                and annex_branch.get_trust_levels().get(annex_uuid) != 'dead':
+            # use None to label the local repo
+            remotes_w_registration.append(remote or None)
+    return remotes_w_registration
 
 
 def _kill_dataset(ds):
@@ -36,6 +36,7 @@ from datalad.support.exceptions import (
 )
 from datalad.support.network import url_path2local_path
 from datalad.utils import (
+    copy_file_reflink,
     ensure_write_permission,
     on_osx,
 )
@@ -190,6 +191,11 @@ class LocalIO(IOBase):
 
     ensure_writeable = staticmethod(ensure_write_permission)
 
+    def __init__(self, reflink=False):
+        # whether to obtain files as reflinks, where the file system
+        # supports it
+        self.reflink = reflink
+
     def mkdir(self, path):
         path.mkdir(
             parents=True,
@@ -206,6 +212,11 @@ class LocalIO(IOBase):
         )
 
     def get(self, src, dst, progress_cb):
+        if self.reflink:
+            # falls back on a copy, if the store and the annex do not share
+            # a file system that supports reflinks
+            copy_file_reflink(src, dst)
+            return
         shutil.copy(
             str(src),
             str(dst),
@@ -925,6 +936,8 @@ class ORARemote(SpecialRemote):
         self.read_only = False
         self.force_write = None
         self.ignore_remote_config = None
+        # obtain content from a local store as reflinks
+        self.reflink = False
         self.remote_log_enabled = None
         self.remote_dataset_tree_version = None
         self.remote_object_tree_version = None
@@ -997,6 +1010,11 @@ class ORARemote(SpecialRemote):
         # but it is not capable of reading out dataset/branch config
         self._repo = AnnexRepo(self.gitdir)
 
+        # a clone in 'reference' mode shares its Git objects with the store,
+        # and may as well share the data blocks of annexed content
+        self.reflink = self._repo.config.get(
+            'datalad.clone.reckless') == 'reference'
+
         cfg_map = {"ora-force-write": "force_write",
                    "ora-ignore-ria-config": "ignore_remote_config",
                    "ora-buffer-size": "buffer_size",
@@ -1396,7 +1414,7 @@ class ORARemote(SpecialRemote):
     def io(self):
         if not self._io:
             if self._local_io():
-                self._io = LocalIO()
+                self._io = LocalIO(reflink=self.reflink)
             elif self.ria_store_url.startswith("ria+http"):
                 # TODO: That construction of "http(s)://host/" should probably
                 #       be moved, so that we get that when we determine
@@ -1439,7 +1457,7 @@ class ORARemote(SpecialRemote):
                 # push-url, so either local or SSH:
                 if not self.storage_host_push:
                     # local operation
-                    self._push_io = LocalIO()
+                    self._push_io = LocalIO(reflink=self.reflink)
                 else:
                     self._push_io = SSHRemoteIO(self.storage_host_push,
                                                 self.buffer_size)
@@ -9,6 +9,7 @@
 
 import logging
 import stat
+from unittest.mock import patch
 
 from datalad.api import (
     Dataset,
@@ -21,6 +22,7 @@ from datalad.customremotes.ria_utils import (
     create_store,
     get_layout_locations,
 )
+from datalad.distributed import ora_remote
 from datalad.distributed.ora_remote import (
     LocalIO,
     SSHRemoteIO,
@@ -810,3 +812,25 @@ def test_obtain_permission_ssh():
 @skip_if_root
 def test_obtain_permission_root():
     _test_permission(None)
+
+
+@with_tempfile(mkdir=True)
+def test_localio_get_reflink(path=None):
+    src = Path(path) / 'src'
+    src.write_text("content")
+    reflinks = []
+    orig_copy_file_reflink = ora_remote.copy_file_reflink
+
+    def copy_file_reflink(src, dst):
+        reflinks.append(dst)
+        return orig_copy_file_reflink(src, dst)
+
+    with patch.object(ora_remote, 'copy_file_reflink', copy_file_reflink):
+        # by default, a file is copied
+        LocalIO().get(src, Path(path) / 'copy', None)
+        assert_equal(reflinks, [])
+        assert_equal((Path(path) / 'copy').read_text(), "content")
+        # a reflink is only tried for a clone in 'reference' mode
+        LocalIO(reflink=True).get(src, Path(path) / 'reflink', None)
+        assert_equal(reflinks, [Path(path) / 'reflink'])
+        assert_equal((Path(path) / 'reflink').read_text(), "content")
@@ -47,6 +47,7 @@ from datalad.interface.results import (
     success_status_map,
 )
 from datalad.local.subdatasets import Subdatasets
+from datalad.log import log_progress
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.collections import ReadOnlyDict
 from datalad.support.constraints import (
@@ -69,7 +70,11 @@ from datalad.support.network import (
     URL,
     urlquote,
 )
-from datalad.support.parallel import ProducerConsumerProgressLog
+from datalad.support.parallel import (
+    Prefetcher,
+    ProducerConsumer,
+    ProducerConsumerProgressLog,
+)
 from datalad.support.param import Parameter
 from datalad.utils import (
     Path,
@@ -326,6 +331,7 @@ def _install_subds_from_flexible_source(ds, sm, **kwargs):
     # prevent inevitable exception from `clone`
     dest_path = op.join(ds.path, sm_path)
     clone_urls_ = [src['url'] for src in clone_urls if src['url'] != dest_path]
+    clone_costs = [src['cost'] for src in clone_urls if src['url'] != dest_path]
 
     if not clone_urls:
         # yield error
@@ -345,6 +351,7 @@ def _install_subds_from_flexible_source(ds, sm, **kwargs):
             Dataset(dest_path),
             cfg=ds.config,
             checkout_gitsha=sm['gitshasum'],
+            src_costs=clone_costs,
             **kwargs):
         if res.get('action', None) == 'install' and \
                 res.get('status', None) == 'ok' and \
@@ -743,6 +750,101 @@ def _get_targetpaths(ds, content, refds_path, source, jobs, data):
         yield r
 
 
+def _get_ds_content(ds, content, refds_path, source, jobs, data):
+    # all results of getting the content of a dataset
+    return list(_get_targetpaths(
+        Dataset(ds), content, refds_path, source, jobs, data))
+
+
+def _get_ds_jobs(jobs, n_concurrent):
+    # the share of a single dataset in the jobs budget
+    return jobs if jobs in (None, 'auto') \
+        else max(1, jobs // max(1, n_concurrent))
+
+
+def _prefetch_content(prefetcher, ds, content, refds_path, source, jobs,
+                      data):
+    """Start getting the content of a dataset, while others are installed
+
+    This is only done if the entire content of the dataset is requested, as
+    no further content could be added to the request later on. Datasets on
+    an adjusted branch are left out, as they might still need to be synced.
+    So are datasets with subdatasets that are not installed (yet), to not
+    transfer content while subdatasets are installed into the same worktree.
+    """
+    if Path(ds) not in content:
+        return
+    dataset = Dataset(ds)
+    repo = dataset.repo
+    if isinstance(repo, AnnexRepo) and repo.is_managed_branch():
+        return
+    if any(True for _ in dataset.subdatasets(
+            state='absent',
+            return_type='generator',
+            result_renderer='disabled')):
+        return
+    prefetcher.submit(
+        ds, _get_ds_content, ds, set(content), refds_path, source,
+        _get_ds_jobs(jobs, prefetcher.jobs), data)
+
+
+def _get_content_by_ds(content_by_ds, refds_path, source, jobs, data,
+                       prefetcher=None):
+    """Get the content of several datasets, concurrently if possible
+
+    A single budget of `jobs` is shared by all datasets: up to that many
+    datasets are processed concurrently, and the `git annex get` of each
+    runs with an equal share of the remaining jobs. With `jobs` of None or
+    'auto', 'datalad.runtime.max-jobs' datasets are processed concurrently,
+    each with an automatic number of annex jobs.
+
+    All results of a dataset are yielded together, in the order in which
+    `git annex get` reported them, and datasets are reported in order.
+
+    Parameters
+    ----------
+    prefetcher: Prefetcher, optional
+      Used to get the content concurrently, e.g. after the retrieval of some
+      datasets was started by `_prefetch_content()`. It is closed when done.
+    """
+    if prefetcher is None:
+        n_concurrent = min(
+            ProducerConsumer.get_effective_jobs(jobs), len(content_by_ds))
+        if n_concurrent <= 1:
+            for ds, content in content_by_ds.items():
+                yield from _get_targetpaths(
+                    Dataset(ds), content, refds_path, source, jobs, data)
+            return
+        prefetcher = Prefetcher(jobs=n_concurrent)
+
+    ds_jobs = _get_ds_jobs(jobs, prefetcher.jobs)
+    pbar_id = 'get-content-{}'.format(id(content_by_ds))
+    log_progress(
+        lgr.info, pbar_id,
+        'Getting content of %d datasets', len(content_by_ds),
+        label='Get content', unit=' Datasets',
+        total=len(content_by_ds),
+        noninteractive_level=5)
+    with prefetcher:
+        for ds, content in content_by_ds.items():
+            prefetcher.submit(
+                ds, _get_ds_content, ds, content, refds_path, source,
+                ds_jobs, data)
+        try:
+            for ds, content in content_by_ds.items():
+                results = prefetcher.get(
+                    ds, _get_ds_content, ds, content, refds_path, source,
+                    ds_jobs, data)
+                log_progress(
+                    lgr.info, pbar_id, 'Got content of %s', ds,
+                    update=1, increment=True,
+                    noninteractive_level=5)
+                yield from results
+        finally:
+            log_progress(lgr.info, pbar_id, 'Finished getting content',
+                         noninteractive_level=5)
+
+
 def _check_error_reported_before(res: dict, error_dict: dict):
     # Helper to check if an impossible result for a path that does
     # not exist has already been yielded before. If not, add path
@@ -951,6 +1053,12 @@ class Get(Interface):
         # Track parent datasets that need syncing on adjusted branches.
         # These will be synced bottom-up after all installations complete.
         adjusted_branch_parents = set()
+        # with pipelined transfers, the content of datasets is obtained
+        # concurrently, as soon as they are installed
+        prefetcher = Prefetcher(jobs=jobs, background=True) \
+            if get_data and data != 'nothing' \
+            and refds.config.obtain('datalad.get.pipeline-transfers') \
+            else None
         # use subdatasets() to discover any relevant content that is not
         # already present in the root dataset (refds)
         for sdsres in Subdatasets.__call__(
@@ -1006,6 +1114,10 @@ class Get(Interface):
                             dsrec = content_by_ds.get(res['path'], set())
                             dsrec.update(res['contains'])
                             content_by_ds[res['path']] = dsrec
+                            if prefetcher is not None:
+                                _prefetch_content(
+                                    prefetcher, res['path'], dsrec,
+                                    refds_path, source, jobs, data)
                         # Collect parent datasets needing sync on adjusted branches
                         if '_adjusted_branch_parent' in res:
                             adjusted_branch_parents.add(res['_adjusted_branch_parent'])
@@ -1050,6 +1162,10 @@ class Get(Interface):
                         dsrec = content_by_ds.get(res['path'], set())
                         dsrec.update(res['contains'])
                         content_by_ds[res['path']] = dsrec
+                        if prefetcher is not None:
+                            _prefetch_content(
+                                prefetcher, res['path'], dsrec,
+                                refds_path, source, jobs, data)
                     # Collect parent datasets needing sync on adjusted branches
                     if '_adjusted_branch_parent' in res:
                         adjusted_branch_parents.add(res['_adjusted_branch_parent'])
@@ -1078,19 +1194,18 @@ class Get(Interface):
             # done already
             return
 
-        # and now annex-get, this could all be done in parallel now
-        for ds, content in content_by_ds.items():
-            for res in _get_targetpaths(
-                    Dataset(ds),
-                    content,
-                    refds.path,
-                    source,
-                    jobs,
-                    data):
-                if 'path' not in res or res['path'] not in content_by_ds:
-                    # we had reports on datasets and subdatasets already
-                    # before the annex stage
-                    yield res
+        # and now annex-get
+        for res in _get_content_by_ds(
+                content_by_ds,
+                refds.path,
+                source,
+                jobs,
+                data,
+                prefetcher=prefetcher):
+            if 'path' not in res or res['path'] not in content_by_ds:
+                # we had reports on datasets and subdatasets already
+                # before the annex stage
+                yield res
 
 
 def _parse_source_candidate_name(name):
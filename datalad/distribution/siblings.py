@@ -528,26 +528,27 @@ def _configure_remote(
                     )
 
         if publish_depends:
-            if depvar in ds.config:
-                # config vars are incremental, so make sure we start from
-                # scratch
-                ds.config.unset(depvar, scope='local', reload=False)
-            for d in ensure_list(publish_depends):
-                lgr.info(
-                    'Configure additional publication dependency on "%s"',
-                    d)
-                ds.config.add(depvar, d, scope='local', reload=False)
-            ds.config.reload()
+            # written with a single modification of the config file
+            with ds.config.transaction():
+                if depvar in ds.config:
+                    # config vars are incremental, so make sure we start from
+                    # scratch
+                    ds.config.unset(depvar, scope='local')
+                for d in ensure_list(publish_depends):
+                    lgr.info(
+                        'Configure additional publication dependency on "%s"',
+                        d)
+                    ds.config.add(depvar, d, scope='local')
 
         if publish_by_default:
-            if dfltvar in ds.config:
-                ds.config.unset(dfltvar, scope='local', reload=False)
-            for refspec in ensure_list(publish_by_default):
-                lgr.info(
-                    'Configure additional default publication refspec "%s"',
-                    refspec)
-                ds.config.add(dfltvar, refspec, 'local')
-            ds.config.reload()
+            with ds.config.transaction():
+                if dfltvar in ds.config:
+                    ds.config.unset(dfltvar, scope='local')
+                for refspec in ensure_list(publish_by_default):
+                    lgr.info(
+                        'Configure additional default publication refspec "%s"',
+                        refspec)
+                    ds.config.add(dfltvar, refspec, 'local')
 
         assert isinstance(repo, GitRepo)  # just against silly code
         if isinstance(repo, AnnexRepo):
@@ -24,8 +24,10 @@ from datalad.api import (
     install,
 )
 from datalad.distribution.get import (
+    _get_content_by_ds,
     _get_flexible_source_candidates_for_submodule,
     _parse_source_candidate_name,
+    _prefetch_content,
 )
 from datalad.distribution.get import lgr as get_lgr
 from datalad.interface.results import only_matching_paths
@@ -35,6 +37,7 @@ from datalad.support.exceptions import (
     RemoteNotAvailableError,
 )
 from datalad.support.network import get_local_file_url
+from datalad.support.parallel import Prefetcher
 from datalad.tests.utils_pytest import (
     DEFAULT_REMOTE,
     assert_false,
@@ -957,3 +960,72 @@ def test_get_data_auto_wanted_anything(path=None, ds_dir=None):
     eq_(set([basename(item.get('path')) for item in result]),
         {'file3.txt', 'file4.txt'})
     ok_(all(ds.repo.file_has_content(file_list)))
+
+
+def _fake_get_targetpaths(calls):
+    def get_targetpaths(ds, content, refds_path, source, jobs, data):
+        calls.append((ds.path, jobs))
+        for c in sorted(content):
+            yield dict(action='get', path=str(c), status='ok')
+    return get_targetpaths
+
+
+@pytest.mark.parametrize("jobs,concurrent,ds_jobs", [
+    (1, False, 1),
+    (2, True, 1),
+    (8, True, 2),
+])
+def test_get_content_by_ds(jobs, concurrent, ds_jobs, tmp_path):
+    path = str(tmp_path)
+    calls = []
+    content_by_ds = {
+        opj(path, 'ds{}'.format(i)): {
+            opj(path, 'ds{}'.format(i), 'file{}'.format(j))
+            for j in range(3)}
+        for i in range(4)
+    }
+    with patch('datalad.distribution.get._get_targetpaths',
+               _fake_get_targetpaths(calls)), \
+            patch('datalad.distribution.get.Prefetcher',
+                  wraps=Prefetcher) as prefetcher:
+        res = list(_get_content_by_ds(
+            content_by_ds, path, None, jobs, 'anything'))
+    eq_(prefetcher.called, concurrent)
+    # the jobs budget is shared among the datasets
+    eq_(sorted(calls), [(ds, ds_jobs) for ds in sorted(content_by_ds)])
+    # results of a dataset are reported together, datasets in order
+    eq_([r['path'] for r in res],
+        [p for ds in content_by_ds for p in sorted(content_by_ds[ds])])
+
+
+def test_get_content_pipelined(tmp_path):
+    calls = []
+    whole = str(tmp_path / 'whole')
+    partial = str(tmp_path / 'partial')
+    parent = str(tmp_path / 'parent')
+    for ds in (whole, partial, parent):
+        Dataset(ds).create(annex=False, result_renderer='disabled')
+    # a subdataset that is still to be installed
+    Dataset(parent).create('sub', annex=False, result_renderer='disabled')
+    rmtree(opj(parent, 'sub'))
+    content_by_ds = {
+        whole: {Path(whole)},
+        partial: {Path(partial, 'file')},
+        parent: {Path(parent)},
+    }
+    prefetcher = Prefetcher(jobs=4)
+    with patch('datalad.distribution.get._get_targetpaths',
+               _fake_get_targetpaths(calls)):
+        for ds, content in content_by_ds.items():
+            _prefetch_content(prefetcher, ds, content, str(tmp_path), None,
+                              8, 'anything')
+        # only the dataset whose entire content is requested, and which has
+        # no subdataset to be installed into its worktree, is started
+        eq_(set(prefetcher._futures), {whole})
+        res = list(_get_content_by_ds(
+            content_by_ds, str(tmp_path), None, 8, 'anything',
+            prefetcher=prefetcher))
+    # the content of each dataset was obtained once, with a share of jobs
+    eq_(sorted(calls), [(parent, 2), (partial, 2), (whole, 2)])
+    eq_([r['path'] for r in res],
+        [whole, str(Path(partial, 'file')), parent])
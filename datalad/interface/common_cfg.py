@@ -204,6 +204,22 @@ _definitions = {
             r',^https://osf.io/([^/]+)[/]*$,osf://\1',
         )
     },
+    'datalad.clone.probe-timeout': {
+        'ui': ('question', {
+               'title': 'Timeout for probing clone candidates',
+               'text': 'If set to a positive number of seconds, all candidate '
+                       'sources of a clone on remote hosts are first probed '
+                       'concurrently with `git ls-remote`. The clone is then '
+                       'attempted from the reachable candidates, in the order '
+                       'of their configured cost plus their response time, '
+                       'and candidates that could not be reached are tried '
+                       'last. A host that does not respond within the timeout '
+                       'is not probed again for the rest of the session. '
+                       'Zero disables probing, and candidates are tried in '
+                       'order.'}),
+        'type': EnsureFloat(),
+        'default': 0.0,
+    },
     # this is actually used in downloaders, but kept cfg name original
     'datalad.crawl.cache': {
         'ui': ('yesno', {
@@ -516,6 +532,33 @@ _definitions = {
         'default': False,
         'type': EnsureBool(),
     },
+    'datalad.annex.batch-annexinfo': {
+        'ui': ('question', {
+               'title': 'Maximum number of paths to query annex properties '
+                        'for in batch mode',
+               'text': 'Annex properties (e.g. for `status --annex`) of up to '
+                       'this many explicitly given files are queried via a '
+                       'persistent git-annex process that is kept running '
+                       'for subsequent queries, instead of starting git-annex '
+                       'for every query. Zero disables batch mode.'}),
+        'type': EnsureInt(),
+        'default': 0,
+    },
+    'datalad.annex.content-index': {
+        'ui': ('yesno', {
+               'title': 'Index the content of the local annex',
+               'text': 'If enabled, the availability of annexed content is '
+                       'determined by a lookup in an index of the local '
+                       'annex object store, instead of by testing for the '
+                       'presence of each object file. The index is built from '
+                       'a single scan of the object store, kept for the '
+                       'duration of a session, and updated by the results of '
+                       'git-annex commands run by DataLad. Changes to the '
+                       'object store that are made by other processes during '
+                       'a session are not detected.'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.annex.retry': {
         'ui': ('question',
                {'title': 'Value for annex.retry to use for git-annex calls',
@@ -533,6 +576,20 @@ _definitions = {
                'text': 'Backend to use when creating git-annex repositories'}),
         'default': 'MD5E',
     },
+    'datalad.repo.content-info-cache': {
+        'ui': ('yesno', {
+               'title': 'Persistent cache for repository content reports',
+               'text': "If enabled, the parsed report of Git on the content "
+                       "of the index, and on the content of particular "
+                       "commits, is cached in .git/datalad/cache. Repeated "
+                       "queries, e.g. by 'status' or 'save', are then "
+                       "answered without asking Git for a full listing "
+                       "again, as long as the index did not change. This "
+                       "can save substantial time on repositories with many "
+                       "files, at the expense of disk space for the cache."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.repo.direct': {
         'ui': ('yesno', {
                'title': 'Direct Mode for git-annex repositories',
@@ -547,6 +604,37 @@ _definitions = {
         'type': EnsureInt(),
         'default': 10,
     },
+    'datalad.runtime.config-reader': {
+        'ui': ('yesno', {
+               'title': 'Read configuration files without calling Git',
+               'text': "If enabled, Git configuration files are read by "
+                       "DataLad itself, rather than via 'git config'. "
+                       "Likewise, modifications batched in a configuration "
+                       "transaction are written by DataLad itself. Git "
+                       "is still called for configuration that this reader "
+                       "does not support, and for any other modification. "
+                       "As it "
+                       "must be known before any configuration is read, this "
+                       "setting is only effective when given as the "
+                       "environment variable DATALAD_RUNTIME_CONFIG__READER."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.runtime.config-snapshot-cache': {
+        'ui': ('yesno', {
+               'title': 'Persistent cache for configuration snapshots',
+               'text': "If enabled, configuration read via 'git config' is "
+                       "cached in the user's cache directory, and reused by "
+                       "any DataLad process as long as none of the "
+                       "configuration files and no relevant environment "
+                       "variable changed. This avoids 'git config' calls on "
+                       "startup. As it must be known before any configuration "
+                       "is read, this setting is only effective when given "
+                       "as the environment variable "
+                       "DATALAD_RUNTIME_CONFIG__SNAPSHOT__CACHE."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.runtime.max-annex-jobs': {
         'ui': ('question', {
                'title': 'Maximum number of git-annex jobs to request when "jobs" option set to "auto" (default)',
@@ -561,6 +649,31 @@ _definitions = {
         'type': EnsureInt(),
         'default': 20,
     },
+    'datalad.runtime.max-batched-per-repo': {
+        'ui': ('question', {
+            'title': 'Maximum number of batched commands to keep running for '
+                     'a single repository',
+            'text': 'Batched commands are kept running for reuse while a '
+                    'repository is in use. If a '
+                    'repository has more than this many, its least recently '
+                    'used inactive ones are closed first, before those of '
+                    'other repositories.'}),
+        'type': EnsureInt(),
+        'default': 5,
+    },
+    'datalad.runtime.max-chunk-jobs': {
+        'ui': ('question', {
+            'title': 'Maximum number of parallel invocations of a read-only '
+                     'command on chunks of a long file list',
+            'text': 'If a list of files is too long for a single command line, '
+                    'a command is invoked repeatedly on chunks of the list. '
+                    'For commands that only query information (e.g., '
+                    "'git annex find', 'info', or 'whereis'), up to this many "
+                    'invocations are run in parallel. The outputs are '
+                    'combined in the order of the chunks.'}),
+        'type': EnsureInt(),
+        'default': 1,
+    },
     'datalad.runtime.max-inactive-age': {
         'ui': ('question', {
             'title': 'Maximum time (in seconds) a batched command can be'
@@ -606,6 +719,22 @@ _definitions = {
         'type': EnsureChoice('all', 'success', 'failure', 'ok', 'notneeded', 'impossible', 'error'),
         'default': None,
     },
+    'datalad.runtime.runner-backend': {
+        'ui': ('question', {
+            'title': 'Implementation of the execution of subprocesses',
+            'text': "With 'threads', helper threads exchange data with any "
+                    "subprocess. With 'selector', all data is exchanged in "
+                    "the calling thread, which saves the creation of the "
+                    "threads for each subprocess. 'selector' is not "
+                    "supported on Windows, and not used for subprocesses "
+                    "that receive input continuously (e.g., batched "
+                    "commands). As it must be known before any "
+                    "configuration is read, this setting is only effective "
+                    "when given as the environment variable "
+                    "DATALAD_RUNTIME_RUNNER__BACKEND."}),
+        'type': EnsureChoice('threads', 'selector'),
+        'default': 'threads',
+    },
     'datalad.runtime.stalled-external': {
         'ui': ('question', {
             'title': 'Behavior for handing external processes',
@@ -678,6 +807,22 @@ _definitions = {
         'default': True,
         'type': EnsureBool(),
     },
+    'datalad.get.pipeline-transfers': {
+        'ui': ('yesno', {
+            'title': 'Start content transfers while installing subdatasets',
+            'text': "If enabled, a recursive 'get' starts to transfer the "
+                    "content of a subdataset as soon as it is installed, "
+                    "while further subdatasets are still being installed. "
+                    "Transfers run in up to 'jobs' (at least one) datasets "
+                    "concurrently to the installation, each 'git annex get' "
+                    "with an equal share of the jobs. The content of a "
+                    "dataset is only transferred early, if none of its "
+                    "subdatasets remain to be installed. "
+                    "This shortens the runtime for deep hierarchies of many "
+                    "subdatasets."}),
+        'default': False,
+        'type': EnsureBool(),
+    },
     'datalad.save.windows-compat-warning': {
         'ui': ('question', {
             'title': 'Action when Windows-incompatible file names are saved',
@@ -701,6 +846,58 @@ _definitions = {
         'type': EnsureChoice('none', 'skip', 'warning', 'error'),
         'default': 'none',
     },
+    'datalad.status.stream': {
+        'ui': ('yesno', {
+            'title': 'Stream status and diff reports',
+            'text': "If enabled, 'status' and 'diff' compare the states of "
+                    "a dataset one file at a time, instead of loading "
+                    "reports on all files into memory first. This keeps "
+                    "memory demands flat, regardless of the number of "
+                    "files in a dataset. Results are then reported in "
+                    "the sort order of Git. Not in effect, when annex "
+                    "properties are requested."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.status.porcelain': {
+        'ui': ('yesno', {
+            'title': "Single-pass worktree status",
+            'text': "If enabled, the state of a worktree with respect to "
+                    "HEAD is determined from a single 'git status "
+                    "--porcelain=v2' call, instead of comparing complete "
+                    "reports on HEAD, the index, and the worktree. This "
+                    "speeds up 'status' and 'save' in datasets with many "
+                    "files and few modifications."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.status.untracked-cache': {
+        'ui': ('yesno', {
+            'title': "Use Git's untracked cache for status reports",
+            'text': "If enabled, untracked and modified worktree content "
+                    "is determined via a single 'git status' call with "
+                    "Git's untracked cache ('core.untrackedCache') "
+                    "enabled, instead of separate 'git ls-files' calls "
+                    "that always inspect the entire worktree. This speeds "
+                    "up 'status' and 'save' in datasets with many files. "
+                    "The cache is stored in the Git index of a dataset."}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.status.fsmonitor': {
+        'ui': ('question', {
+            'title': "File system monitor for status reports",
+            'text': "Value for Git's 'core.fsmonitor' setting to be used for "
+                    "worktree queries (like 'datalad.status.untracked-cache', "
+                    "which is implied by this setting). This can be 'true' "
+                    "to use Git's builtin file system monitor daemon (where "
+                    "supported, Git 2.36+), or the path to a file system "
+                    "monitor hook (e.g. for Watchman). With a file system "
+                    "monitor Git only needs to inspect files that changed "
+                    "since the last query."}),
+        'type': EnsureStr() | EnsureNone(),
+        'default': None,
+    },
     'datalad.source.epoch': {
         'ui': ('question', {
             'title': 'Datetime epoch to use for dates in built materials',
@@ -177,9 +177,9 @@ reckless_opt = Parameter(
     nargs='?',
     # boolean types only for backward compatibility
     constraints=
-    EnsureChoice(None, True, False, 'auto', 'ephemeral') | \
+    EnsureChoice(None, True, False, 'auto', 'ephemeral', 'reference') | \
     EnsureStrPrefix('shared-'),
-    metavar='auto|ephemeral|shared-...',
+    metavar='auto|ephemeral|reference|shared-...',
     doc="""Obtain a dataset or subdatset and set it up in a potentially
     unsafe way for performance, or access reasons.
     Use with care, any dataset is marked as 'untrusted'.
@@ -198,6 +198,14 @@ reckless_opt = Parameter(
     non-bare repositories or a RIA store! Otherwise two different annex object tree
     structures (dirhashmixed vs dirhashlower) will be used simultaneously, and annex keys
     using the respective other structure will be inaccessible.
+    ['reference']: share Git objects with a local source (a path, or a
+    file:// URL, e.g. of a RIA store on a local or network file system) via
+    Git's alternates mechanism, instead of copying them. Annex content is
+    obtained from a local RIA store as a reflink (copy-on-write clone) on file
+    systems that support it. The clone depends on the source's Git objects,
+    hence the source must not be removed or have its history rewritten and
+    garbage collected. The clone's annex is marked as untrusted, so that no
+    other annex relies on its copies when dropping content.
     ['shared-<mode>']: set up repository and annex permission to enable multi-user
     access. This disables the standard write protection of annex'ed files.
     <mode> can be any value support by 'git init --shared=', such as 'group', or
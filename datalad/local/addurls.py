@@ -18,9 +18,14 @@ import sys
 from collections import defaultdict
 from collections.abc import Mapping
 from functools import partial
+from itertools import (
+    groupby,
+    islice,
+)
 from urllib.parse import urlparse
 
 import datalad.support.path as op
+from datalad.cmd import BatchedCommand
 from datalad.distribution.dataset import resolve_path
 from datalad.dochelpers import single_or_plural
 from datalad.interface.base import (
@@ -937,19 +942,37 @@ class RegisterUrl(object):
                 key = parsed_key["key"]
 
             self.registerurl(key, row["url"])
-            res = annexjson2result(self.fromkey(key, filename),
-                                   self.ds, type="file", logger=lgr)
-            if not res.get("message"):
-                res["message"] = "registered URL"
+            res = self._fromkey_result(self.fromkey(key, filename))
         except CommandError as exc:
-            ce = CapturedException(exc)
-            yield dict(self._err_res,
-                       path=row["filename_abs"],
-                       message=str(ce),
-                       exception=ce)
+            yield self._error_result(row, exc)
         else:
             yield res
 
+    def process(self, rows):
+        """Register the URLs of `rows`.
+
+        Yields
+        ------
+        tuple
+          A row and a list with the results of its registration, in the order
+          of `rows`.
+        """
+        for row in rows:
+            yield row, list(self(row))
+
+    def _fromkey_result(self, record):
+        res = annexjson2result(record, self.ds, type="file", logger=lgr)
+        if not res.get("message"):
+            res["message"] = "registered URL"
+        return res
+
+    def _error_result(self, row, exc):
+        ce = CapturedException(exc)
+        return dict(self._err_res,
+                    path=row["filename_abs"],
+                    message=str(ce),
+                    exception=ce)
+
 
 # Note: If any other modules end up needing these batch operations, this should
 # find a new home.
@@ -970,7 +993,21 @@ class BatchedRegisterUrl(RegisterUrl):
                json=False,
                batch_options=None):
 
-        bcmd = self._batch_commands.get(command)
+        return self._get_batch_command(
+            command,
+            output_proc=output_proc,
+            json=json,
+            batch_options=batch_options)(batch_input)
+
+    def _get_batch_command(self,
+                           command,
+                           output_proc=None,
+                           json=False,
+                           batch_options=None):
+        # batch processes that run with different options are different
+        # processes, see BatchedAnnexes.get()
+        codename = (command, tuple(batch_options or ()))
+        bcmd = self._batch_commands.get(codename)
         if not bcmd:
             repo = self.repo
             bcmd = repo._batched.get(
@@ -979,8 +1016,94 @@ class BatchedRegisterUrl(RegisterUrl):
                 json=json,
                 output_proc=output_proc,
                 annex_options=batch_options)
-            self._batch_commands[command] = bcmd
-        return bcmd(batch_input)
+            self._batch_commands[codename] = bcmd
+        return bcmd
+
+    def process(self, rows):
+        """Register the URLs of `rows`, pipelining the requests to git-annex.
+
+        Rows are processed in chunks. Each step, i.e. `examinekey`,
+        `registerurl`, and `fromkey`, is done for all rows of a chunk, before
+        the next step is taken, which allows to send many requests to the
+        batch process without waiting for each response.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, BatchedCommand.pipeline_window))
+            if not chunk:
+                return
+            yield from self._process_chunk(chunk)
+
+    def _process_chunk(self, rows):
+        results = [None] * len(rows)
+        keys = [None] * len(rows)
+        # rows that are processed one by one because a request for a previous
+        # row in the same step failed
+        deferred = set()
+
+        def pipeline(indices, command, requests, **kwargs):
+            # yield the index and the response of all successful requests
+            done = 0
+            try:
+                for response, i in zip(
+                        self._get_batch_command(command, **kwargs).map(
+                            requests),
+                        indices):
+                    done += 1
+                    yield i, response
+            except CommandError as exc:
+                results[indices[done]] = [
+                    self._error_result(rows[indices[done]], exc)]
+                deferred.update(indices[done + 1:])
+
+        migrate = defaultdict(list)
+        for i, row in enumerate(rows):
+            parsed_key = row["key"]
+            if "target_backend" in parsed_key:
+                migrate[parsed_key["target_backend"]].append(i)
+            else:
+                keys[i] = parsed_key["key"]
+
+        for backend, indices in migrate.items():
+            for i, ek_info in pipeline(
+                    indices,
+                    "examinekey",
+                    [(rows[i]["key"]["key"], rows[i]["ds_filename"])
+                     for i in indices],
+                    json=True,
+                    batch_options=["--migrate-to-backend=" + backend]):
+                if ek_info:
+                    keys[i] = ek_info["key"]
+                else:
+                    results[i] = [
+                        dict(self._err_res,
+                             path=rows[i]["filename_abs"],
+                             message=("Failed to get information for %s",
+                                      rows[i]["key"]))]
+
+        def todo():
+            return [i for i in range(len(rows))
+                    if results[i] is None and i not in deferred]
+
+        indices = todo()
+        for _ in pipeline(
+                indices,
+                "registerurl",
+                [(keys[i], rows[i]["url"]) for i in indices],
+                output_proc=self._ignore):
+            pass
+
+        indices = todo()
+        for i, record in pipeline(
+                indices,
+                "fromkey",
+                [(keys[i], rows[i]["ds_filename"]) for i in indices],
+                json=True,
+                batch_options=["--force"]):
+            results[i] = [self._fromkey_result(record)]
+
+        for i, row in enumerate(rows):
+            yield row, list(self(row)) if i in deferred else results[i]
 
     def examinekey(self, parsed_key, filename, migrate=False):
         if migrate:
@@ -1023,33 +1146,55 @@ def _add_urls(rows, ds, repo, ifexists=None, options=None,
             register_url = RegisterUrl(ds, repo)
         else:
             register_url = BatchedRegisterUrl(ds, repo)
+
+    # results for rows that are skipped, reported along with the results of
+    # the processed rows
+    skipped = []
+
+    def rows_to_process():
+        for row in rows:
+            filename_abs = row["filename_abs"]
+            lgr.debug("Adding URLs to %s in %s", row["ds_filename"], ds.path)
+
+            if os.path.exists(filename_abs) or os.path.islink(filename_abs):
+                if ifexists == "skip":
+                    skipped.append(get_status_dict(action="addurls",
+                                                   ds=ds,
+                                                   type="file",
+                                                   path=filename_abs,
+                                                   status="notneeded"))
+                    continue
+                elif ifexists == "overwrite":
+                    lgr.debug("Removing %s", filename_abs)
+                    unlink(filename_abs)
+                else:
+                    lgr.debug("File %s already exists", filename_abs)
+            yield row
+
+    def process_rows():
+        # Rows without a key, e.g. with empty key fields, are downloaded.
+        # Registering URLs can process several rows at once, hence
+        # consecutive rows with a key are passed on together.
+        for has_key, group in groupby(rows_to_process(),
+                                      key=lambda row: bool(row.get("key"))):
+            if has_key:
+                yield from register_url.process(group)
+            else:
+                for row in group:
+                    yield row, add_url(row)
+
+    if by_key:
+        processed = process_rows()
     else:
-        def register_url(*args, **kwargs):
-            raise RuntimeError("bug: this should be impossible")
+        processed = ((row, add_url(row)) for row in rows_to_process())
 
     add_metadata = {}
-    for row in rows:
-        filename_abs = row["filename_abs"]
-        filename = row["ds_filename"]
-        lgr.debug("Adding URLs to %s in %s", filename, ds.path)
-
-        if os.path.exists(filename_abs) or os.path.islink(filename_abs):
-            if ifexists == "skip":
-                yield get_status_dict(action="addurls",
-                                      ds=ds,
-                                      type="file",
-                                      path=filename_abs,
-                                      status="notneeded")
-                continue
-            elif ifexists == "overwrite":
-                lgr.debug("Removing %s", filename_abs)
-                unlink(filename_abs)
-            else:
-                lgr.debug("File %s already exists", filename_abs)
+    for row, results in processed:
+        yield from skipped
+        skipped.clear()
 
-        fn = register_url if row.get("key") else add_url
         all_ok = True
-        for res in fn(row):
+        for res in results:
             if res["status"] != "ok":
                 all_ok = False
             yield res
@@ -1057,7 +1202,8 @@ def _add_urls(rows, ds, repo, ifexists=None, options=None,
             continue
 
         if row.get("meta_args"):
-            add_metadata[filename] = row["meta_args"]
+            add_metadata[row["ds_filename"]] = row["meta_args"]
+    yield from skipped
 
     if not add_metadata:
         return
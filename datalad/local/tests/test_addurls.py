@@ -17,7 +17,10 @@ import shutil
 import tempfile
 from copy import deepcopy
 from io import StringIO
-from unittest.mock import patch
+from unittest.mock import (
+    MagicMock,
+    patch,
+)
 from urllib.parse import urlparse
 
 import pytest
@@ -30,6 +33,7 @@ from datalad.api import (
     subdatasets,
 )
 from datalad.cmd import WitlessRunner
+from datalad.runner.exception import CommandError
 from datalad.consts import WEB_SPECIAL_REMOTE_UUID
 from datalad.support.exceptions import IncompleteResultsError
 from datalad.support.external_versions import external_versions
@@ -359,6 +363,111 @@ def test_registerurl_constructor(path=None):
     au.RegisterUrl(ds)
 
 
+class _FakeBatchedCommand:
+    """Responds to batched requests of BatchedRegisterUrl, some fail"""
+
+    def __init__(self, command, failing, calls):
+        self.command = command
+        self.failing = failing
+        self.calls = calls
+
+    def _respond(self, request):
+        if request[-1] in self.failing:
+            raise CommandError(cmd=self.command, msg='failed')
+        if self.command == 'examinekey':
+            return {'key': request[0] + '-migrated'}
+        elif self.command == 'fromkey':
+            return {'command': 'fromkey', 'success': True,
+                    'key': request[0], 'file': request[1]}
+
+    def __call__(self, request):
+        self.calls.append((self.command, 'single', request))
+        return self._respond(request)
+
+    def map(self, requests):
+        requests = list(requests)
+        self.calls.append((self.command, 'map', requests))
+        for request in requests:
+            yield self._respond(request)
+
+
+@pytest.mark.parametrize('window', [2, 100])
+def test_batched_registerurl_process(tmp_path, window):
+    ds = Dataset(tmp_path)
+    repo = MagicMock()
+    repo.is_managed_branch.return_value = False
+    rows = [{'key': {'key': 'MD5E-s1--{}'.format(i)},
+             'url': 'http://example.com/{}'.format(i),
+             'ds_filename': 'f{}'.format(i),
+             'filename_abs': str(tmp_path / 'f{}'.format(i))}
+            for i in range(5)]
+    # one row needs its key migrated
+    rows[1]['key']['target_backend'] = 'SHA256E'
+    calls = []
+    failing = {'http://example.com/2'}
+    with patch.object(au.BatchedRegisterUrl, '_get_batch_command',
+                      lambda self, command, **kwargs: _FakeBatchedCommand(
+                          command, failing, calls)), \
+            patch.object(au.BatchedCommand, 'pipeline_window', window):
+        res = list(au.BatchedRegisterUrl(ds, repo).process(rows))
+    # results are reported in the order of the rows
+    eq_([row for row, _ in res], rows)
+    eq_([[r['status'] for r in results] for _, results in res],
+        [['ok'], ['ok'], ['error'], ['ok'], ['ok']])
+    # the failing URL is reported for its row only
+    eq_(res[2][1][0]['path'], rows[2]['filename_abs'])
+    assert_in('failed', res[2][1][0]['message'])
+    eq_([results[0]['annexkey'] for i, (_, results) in enumerate(res)
+         if i != 2],
+        ['MD5E-s1--0', 'MD5E-s1--1-migrated', 'MD5E-s1--3', 'MD5E-s1--4'])
+    # requests are pipelined, the rows after a failed request are
+    # processed one by one
+    if window == 100:
+        eq_([c for c in calls if c[1] == 'map'][1],
+            ('registerurl', 'map',
+             [('MD5E-s1--{}'.format(i) + ('-migrated' if i == 1 else ''),
+               'http://example.com/{}'.format(i)) for i in range(5)]))
+        eq_([c[2] for c in calls if c[:2] == ('registerurl', 'single')],
+            [('MD5E-s1--3', 'http://example.com/3'),
+             ('MD5E-s1--4', 'http://example.com/4')])
+
+
+def test_add_urls_mixed_keys(tmp_path):
+    ds = Dataset(tmp_path)
+    repo = MagicMock()
+    repo.is_managed_branch.return_value = False
+    repo.fake_dates_enabled = False
+    # rows with empty key fields have no key, and are downloaded
+    rows = [{'key': {'key': 'MD5E-s1--{}'.format(i)} if i in (0, 1, 3)
+             else {},
+             'url': 'http://example.com/{}'.format(i),
+             'ds_filename': 'f{}'.format(i),
+             'filename_abs': str(tmp_path / 'f{}'.format(i))}
+            for i in range(5)]
+    calls = []
+    downloaded = []
+
+    def fake_add_url(row, ds, repo, options=None, drop_after=False):
+        downloaded.append(row['ds_filename'])
+        yield dict(action='addurls', type='file', status='ok',
+                   path=row['filename_abs'])
+
+    with patch.object(au.BatchedRegisterUrl, '_get_batch_command',
+                      lambda self, command, **kwargs: _FakeBatchedCommand(
+                          command, set(), calls)), \
+            patch.object(au, '_add_url', fake_add_url):
+        res = list(au._add_urls(rows, ds, repo, by_key=True))
+    # results are reported in the order of the rows
+    eq_([r['path'] for r in res], [row['filename_abs'] for row in rows])
+    eq_([r['status'] for r in res], ['ok'] * 5)
+    eq_(downloaded, ['f2', 'f4'])
+    # consecutive rows with a key are registered together
+    eq_([c[2] for c in calls if c[:2] == ('registerurl', 'map')],
+        [[('MD5E-s1--0', 'http://example.com/0'),
+          ('MD5E-s1--1', 'http://example.com/1')],
+         [('MD5E-s1--3', 'http://example.com/3')]])
+
+
 @with_tempfile(mkdir=True)
 def test_addurls_nonannex_repo(path=None):
     ds = Dataset(path).create(force=True, annex=False)
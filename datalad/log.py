@@ -34,6 +34,7 @@ __all__ = [
     'ColorFormatter',
     'LoggerHelper',
     'filter_noninteractive_progress',
+    'is_progress_reported',
     'log_progress',
     'with_progress',
     'with_result_progress',
@@ -370,6 +371,46 @@ def filter_noninteractive_progress(logger, record):
     return level is None or level >= logger.level
 
 
+def is_progress_reported(logger, noninteractive_level=None):
+    """Whether progress logged via log_progress(logger.info) is reported
+
+    This allows callers to skip the preparation of progress reports that
+    would be discarded anyway. Only handlers set up by LoggerHelper are
+    known to discard progress reports, any other handler is assumed to
+    report them.
+
+    Parameters
+    ----------
+    logger: logging.Logger
+      The logger that progress would be logged with.
+    noninteractive_level: int, optional
+      As given to log_progress().
+
+    Returns
+    -------
+    bool
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    current = logger
+    while current:
+        for handler in current.handlers:
+            if handler.level > logging.INFO:
+                continue
+            if isinstance(handler, ProgressHandler):
+                return True
+            if noninteractive_level is None or not any(
+                    isinstance(f, partial)
+                    and f.func is filter_noninteractive_progress
+                    and noninteractive_level < f.args[0].level
+                    for f in handler.filters):
+                return True
+        if not current.propagate:
+            break
+        current = current.parent
+    return False
+
+
 def log_progress(lgrcall, pid, *args, **kwargs):
     """Emit progress log messages
 
@@ -12,6 +12,7 @@
 import logging
 import os
 import os.path as op
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from datalad.dochelpers import borrowdoc
@@ -150,6 +151,7 @@ class GitWitlessRunner(WitlessRunner, GitRunnerBase):
                              cwd=None,
                              env=None,
                              pathspec_from_file: Optional[bool] = False,
+                             chunk_jobs: Optional[int] = None,
                              **kwargs):
 
         assert isinstance(cmd, list)
@@ -173,6 +175,32 @@ class GitWitlessRunner(WitlessRunner, GitRunnerBase):
                     **kwargs)
                 return
 
+        if chunk_jobs and chunk_jobs > 1 and len(file_chunks) > 1:
+            assert not issubclass(protocol, GeneratorMixIn), \
+                "cannot run chunks in parallel with a generator protocol"
+            lgr.debug('Process %i file list chunks with %i jobs',
+                      len(file_chunks), chunk_jobs)
+            with ThreadPoolExecutor(
+                    max_workers=min(chunk_jobs, len(file_chunks))) as executor:
+                futures = [
+                    executor.submit(
+                        self.run,
+                        cmd=cmd + ['--'] + file_chunk,
+                        protocol=protocol,
+                        cwd=cwd,
+                        env=env,
+                        **kwargs)
+                    for file_chunk in file_chunks
+                ]
+                try:
+                    # report in the order of the chunks
+                    for future in futures:
+                        yield future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+            return
+
         # "classical" chunking
         for i, file_chunk in enumerate(file_chunks):
             # do not pollute with message when there only ever is a single chunk
@@ -195,6 +223,7 @@ class GitWitlessRunner(WitlessRunner, GitRunnerBase):
                                 cwd=None,
                                 env=None,
                                 pathspec_from_file: Optional[bool] = False,
+                                chunk_jobs: Optional[int] = None,
                                 **kwargs):
         """
         Run a git-style command multiple times if `files` is too long,
@@ -225,6 +254,10 @@ class GitWitlessRunner(WitlessRunner, GitRunnerBase):
           Could be set to True for a `git` command which supports
           --pathspec-from-file and --pathspec-file-nul options. Then pathspecs
           would be passed through a temporary file.
+        chunk_jobs : int, optional
+          If `files` is split into multiple chunks, run up to this many
+          commands in parallel. Only use for commands that do not modify
+          the repository. The outputs are merged in the order of the chunks.
         kwargs :
           Passed to the Protocol class constructor.
 
@@ -258,6 +291,7 @@ class GitWitlessRunner(WitlessRunner, GitRunnerBase):
                                              cwd=cwd,
                                              env=env,
                                              pathspec_from_file=pathspec_from_file,
+                                             chunk_jobs=chunk_jobs,
                                              **kwargs):
             if results is None:
                 results = res
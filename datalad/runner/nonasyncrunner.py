@@ -460,13 +460,39 @@ class ThreadedRunner:
         if self.timeout:
             self.last_touched[None] = current_time
 
-        cmd_string = self.cmd if isinstance(self.cmd, str) else " ".join(self.cmd)
         if self.catch_stderr:
-            if self.timeout:
-                self.last_touched[self.process_stderr_fileno] = current_time
             self.active_file_numbers.add(self.process_stderr_fileno)
             self.last_touched[self.process_stderr_fileno] = current_time
             assert self.process.stderr is not None
+
+        if self.catch_stdout:
+            self.active_file_numbers.add(self.process_stdout_fileno)
+            self.last_touched[self.process_stdout_fileno] = current_time
+            assert self.process.stdout is not None
+
+        if self.write_stdin:
+            # No timeouts for stdin
+            self.active_file_numbers.add(self.process_stdin_fileno)
+            assert self.stdin_queue is not None
+            assert self.process.stdin is not None
+
+        self._start_transport()
+
+        if isinstance(self.protocol, GeneratorMixIn):
+            self.generator = _ResultGenerator(
+                self,
+                self.protocol.result_queue
+            )
+            self.owning_thread = threading.get_ident()
+            return self.generator
+
+        return self.process_loop()
+
+    def _start_transport(self) -> None:
+        """Start the threads that exchange data with the process"""
+        assert self.process is not None
+        cmd_string = self.cmd if isinstance(self.cmd, str) else " ".join(self.cmd)
+        if self.catch_stderr:
             self.stderr_enqueueing_thread = ReadThread(
                 identifier="STDERR: " + cmd_string[:20],
                 signal_queues=[self.output_queue],
@@ -476,11 +502,6 @@ class ThreadedRunner:
             self.stderr_enqueueing_thread.start()
 
         if self.catch_stdout:
-            if self.timeout:
-                self.last_touched[self.process_stdout_fileno] = current_time
-            self.active_file_numbers.add(self.process_stdout_fileno)
-            self.last_touched[self.process_stdout_fileno] = current_time
-            assert self.process.stdout is not None
             self.stdout_enqueueing_thread = ReadThread(
                 identifier="STDOUT: " + cmd_string[:20],
                 signal_queues=[self.output_queue],
@@ -490,10 +511,6 @@ class ThreadedRunner:
             self.stdout_enqueueing_thread.start()
 
         if self.write_stdin:
-            # No timeouts for stdin
-            self.active_file_numbers.add(self.process_stdin_fileno)
-            assert self.stdin_queue is not None
-            assert self.process.stdin is not None
             self.stdin_enqueueing_thread = WriteThread(
                 identifier="STDIN: " + cmd_string[:20],
                 user_info=self.process_stdin_fileno,
@@ -508,16 +525,6 @@ class ThreadedRunner:
             self.process)
         self.process_waiting_thread.start()
 
-        if isinstance(self.protocol, GeneratorMixIn):
-            self.generator = _ResultGenerator(
-                self,
-                self.protocol.result_queue
-            )
-            self.owning_thread = threading.get_ident()
-            return self.generator
-
-        return self.process_loop()
-
     def process_loop(self) -> dict:
         # Process internal messages until no more active file descriptors
         # are present. This works because active file numbers are only
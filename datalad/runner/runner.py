@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from os import PathLike
 from queue import Queue
 from typing import (
@@ -18,6 +19,8 @@ from typing import (
     cast,
 )
 
+from datalad.utils import on_windows
+
 from .coreprotocols import NoCapture
 from .exception import CommandError
 from .nonasyncrunner import (
@@ -28,21 +31,37 @@ from .protocol import (
     GeneratorMixIn,
     WitlessProtocol,
 )
+from .selectorrunner import SelectorRunner
 
 lgr = logging.getLogger('datalad.runner.runner')
 
 
+# the runner is needed to read the configuration itself, hence the backend
+# can only be selected via the environment, and is determined once
+_default_backend = os.environ.get('DATALAD_RUNTIME_RUNNER__BACKEND', 'threads')
+
+
+def _get_runner_class(stdin, backend: str) -> type[ThreadedRunner]:
+    """Select the runner implementation for a backend"""
+    if on_windows or isinstance(stdin, Queue):
+        # pipes cannot be selected on Windows, and a queue cannot be
+        # selected at all
+        return ThreadedRunner
+    return SelectorRunner if backend == 'selector' else ThreadedRunner
+
+
 class WitlessRunner(object):
     """Minimal Runner with support for online command output processing
 
     It aims to be as simple as possible, providing only essential
     functionality.
     """
-    __slots__ = ['cwd', 'env']
+    __slots__ = ['cwd', 'env', 'backend']
 
     def __init__(self,
                  cwd: str | PathLike | None = None,
-                 env: dict | None = None
+                 env: dict | None = None,
+                 backend: str | None = None,
                  ):
         """
         Parameters
@@ -57,9 +76,15 @@ class WitlessRunner(object):
           the sub-process, i.e.  no values from the environment of the current
           process will be inherited. If `env` and `cwd` are given, 'PWD' in the
           environment is set to the string-value of `cwd`.
+        backend : {'threads', 'selector'}, optional
+          Implementation of the execution of subprocesses, see the
+          'datalad.runtime.runner-backend' configuration. If not given, the
+          environment variable DATALAD_RUNTIME_RUNNER__BACKEND, as set when
+          DataLad was imported, determines it.
         """
         self.env = env
         self.cwd = cwd
+        self.backend = backend or _default_backend
 
     def _get_adjusted_env(self,
                           env: dict | None = None,
@@ -212,7 +237,7 @@ class WitlessRunner(object):
             applied_cwd
         )
 
-        threaded_runner = ThreadedRunner(
+        threaded_runner = _get_runner_class(stdin, self.backend)(
             cmd=cmd,
             protocol_class=protocol,
             stdin=stdin,
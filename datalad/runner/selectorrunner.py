@@ -0,0 +1,196 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""
+Subprocess execution without helper threads, based on `selectors`
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import subprocess
+import time
+from typing import Optional
+
+from datalad.utils import COPY_BUFSIZE
+
+from .nonasyncrunner import ThreadedRunner
+
+__docformat__ = 'restructuredtext'
+
+lgr = logging.getLogger("datalad.runner.selectorrunner")
+
+# selector key data of the file descriptor that signals the process exit
+_PROCESS_EXIT = 'process_exit'
+
+
+class SelectorRunner(ThreadedRunner):
+    """
+    A `ThreadedRunner` that does not start any threads. Instead, it
+    multiplexes stdout, stderr, and stdin of the subprocess in the calling
+    thread, using `selectors`. On Linux, the process exit is detected via a
+    process file descriptor, elsewhere by polling the process.
+
+    This saves the creation of up to four threads per subprocess, and the
+    hand-off of all data via a queue. Protocols, including those based on
+    `GeneratorMixIn`, see the same sequence of callbacks as with a
+    `ThreadedRunner`.
+
+    This runner is only supported on POSIX systems, and `stdin` can only be
+    None, a file-like, or bytes. Use `ThreadedRunner` for a `Queue`.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._pidfd: Optional[int] = None
+        self._stdin_data: Optional[memoryview] = None
+
+    def _start_transport(self) -> None:
+        assert self.process is not None
+        if self.write_stdin and not isinstance(self.stdin, bytes):
+            raise ValueError(
+                f"{self.__class__.__name__} cannot write stdin from "
+                f"{type(self.stdin)}")
+        self._selector = selectors.DefaultSelector()
+        for fileno in (self.process_stdout_fileno,
+                       self.process_stderr_fileno):
+            if fileno is not None:
+                self._selector.register(fileno, selectors.EVENT_READ)
+
+        if self.write_stdin:
+            assert isinstance(self.stdin, bytes)
+            assert self.process_stdin_fileno is not None
+            self._stdin_data = memoryview(self.stdin)
+            # never block on a full pipe, we could not read stdout and stderr
+            # of the process while waiting
+            os.set_blocking(self.process_stdin_fileno, False)
+            self._selector.register(
+                self.process_stdin_fileno, selectors.EVENT_WRITE)
+
+        try:
+            self._pidfd = os.pidfd_open(self.process.pid)
+        except (AttributeError, OSError):
+            # not on Linux, we will poll for the process exit
+            self._pidfd = None
+        else:
+            self._selector.register(
+                self._pidfd, selectors.EVENT_READ, _PROCESS_EXIT)
+
+    def is_stalled(self) -> bool:
+        # without threads, there is nothing that could stall
+        return False
+
+    def process_queue(self):
+        """
+        Handle all events of a single `select()`, or a timeout. This method
+        might modify the set of active file numbers if a file is closed, or if
+        a timeout-callback return True.
+        """
+        assert self._selector is not None
+        if not self._selector.get_map():
+            if None not in self.active_file_numbers:
+                return
+            # only the process is left, and it cannot be selected
+            try:
+                self.process.wait(timeout=self.timeout_resolution)
+            except subprocess.TimeoutExpired:
+                self.process_timeouts()
+                return
+            self.remove_process()
+            return
+
+        events = self._selector.select(timeout=self.timeout_resolution)
+        if not events:
+            self.process_timeouts()
+        for key, _ in events:
+            if key.fd not in self._selector.get_map():
+                # closed while handling a previous event
+                continue
+            if key.data == _PROCESS_EXIT:
+                self._close_pidfd()
+                self.process.wait()
+                self.remove_process()
+            elif key.fd == self.process_stdin_fileno:
+                self._write_stdin()
+            else:
+                self._read(key.fd)
+        if self._pidfd is None and None in self.active_file_numbers \
+                and self.process.poll() is not None:
+            self.remove_process()
+
+    def _read(self, file_number: int):
+        try:
+            data = os.read(file_number, COPY_BUFSIZE)
+        except OSError:
+            data = b''
+        if not data:
+            # Received an EOF for stdout or stderr.
+            self.remove_file_number(file_number)
+            return
+        self.last_touched[file_number] = time.time()
+        self.protocol.pipe_data_received(
+            self.fileno_mapping[file_number],
+            data)
+
+    def _write_stdin(self):
+        file_number = self.process_stdin_fileno
+        data = self._stdin_data
+        assert file_number is not None and data is not None
+        try:
+            written = os.write(file_number, data)
+        except BlockingIOError:
+            return
+        except (OSError, ValueError):
+            # The process has most likely closed its stdin
+            self.remove_file_number(file_number)
+            return
+        self._stdin_data = data[written:]
+        if not self._stdin_data:
+            self.remove_file_number(file_number)
+
+    def _unregister(self, file_number: Optional[int]):
+        if self._selector is not None and file_number is not None:
+            try:
+                self._selector.unregister(file_number)
+            except (KeyError, ValueError):
+                pass
+
+    def _close_pidfd(self):
+        if self._pidfd is not None:
+            self._unregister(self._pidfd)
+            os.close(self._pidfd)
+            self._pidfd = None
+
+    def remove_process(self):
+        super().remove_process()
+        # the process will no longer consume input
+        self.close_stdin()
+
+    def remove_file_number(self, file_number: int):
+        self._unregister(file_number)
+        super().remove_file_number(file_number)
+
+    def close_stdin(self):
+        if self.write_stdin \
+                and self.process_stdin_fileno in self.active_file_numbers:
+            self.remove_file_number(self.process_stdin_fileno)
+
+    def _ensure_closed(self, file_objects):
+        for file_object in file_objects:
+            if file_object is not None:
+                self._unregister(self.file_to_fileno.get(file_object, None))
+        super()._ensure_closed(file_objects)
+
+    def _set_process_exited(self):
+        super()._set_process_exited()
+        self._close_pidfd()
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
@@ -7,6 +7,7 @@ from datalad.runner.protocol import GeneratorMixIn
 from datalad.tests.utils_pytest import assert_equal
 
 from ..gitrunner import GitWitlessRunner
+from .utils import py2cmd
 
 
 class TestGeneratorProtocol(GeneratorMixIn, StdOutErrCapture):
@@ -42,3 +43,21 @@ def test_gitrunner_list() -> None:
             ["f1.txt", "f2.txt"],
             protocol=StdOutErrCapture)
         assert_equal(result, {"a": 4, "b": 6})
+
+
+def test_gitrunner_parallel_chunks() -> None:
+    # Expect that chunks are run in parallel if requested, and that the
+    # results are merged in the order of the chunks, although later chunks
+    # finish first.
+    git_runner = GitWitlessRunner()
+    cmd = py2cmd(
+        "import sys, time\n"
+        "files = sys.argv[2:]\n"
+        "time.sleep(.1 * (3 - len(files)))\n"
+        "print(' '.join(files))\n")
+    files = ["a", "b", "c", "d", "e", "f"]
+    with patch("datalad.runner.gitrunner.generate_file_chunks") as chunks_mock:
+        chunks_mock.return_value = iter([files[:1], files[1:3], files[3:]])
+        result = git_runner.run_on_filelist_chunks(
+            cmd, files, protocol=StdOutErrCapture, chunk_jobs=3)
+    assert_equal(result["stdout"].split(), files)
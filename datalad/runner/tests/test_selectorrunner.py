@@ -0,0 +1,125 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test the thread-less, selector-based runner"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import nullcontext
+from queue import Queue
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_raises,
+    assert_true,
+    skip_if_on_windows,
+)
+
+from .. import (
+    CommandError,
+    NoCapture,
+    Runner,
+    StdOutErrCapture,
+)
+from ..nonasyncrunner import ThreadedRunner
+from .. import runner as runner_module
+from ..runner import _get_runner_class
+from ..selectorrunner import SelectorRunner
+from .test_nonasyncrunner import GenStdoutLines
+from .utils import py2cmd
+
+# echo stdin to stdout, and its size to stderr, after consuming all of it
+_echo_cmd = py2cmd(
+    "import sys\n"
+    "data = sys.stdin.buffer.read()\n"
+    "sys.stdout.buffer.write(data)\n"
+    "sys.stderr.write(str(len(data)))\n"
+    "sys.exit(3)\n")
+
+
+@skip_if_on_windows
+@pytest.mark.parametrize("pidfd", [True, False])
+def test_selector_runner(pidfd: bool) -> None:
+    # more data than fits into any pipe buffer in both directions
+    data = b"0123456789" * 200000
+    # without a process file descriptor, the process is polled
+    with nullcontext() if pidfd \
+            else patch.object(os, 'pidfd_open', side_effect=OSError,
+                              create=True):
+        threads = threading.active_count()
+        result = SelectorRunner(
+            cmd=_echo_cmd,
+            protocol_class=StdOutErrCapture,
+            stdin=data,
+        ).run()
+        # no helper threads were started
+        assert_equal(threading.active_count(), threads)
+    assert isinstance(result, dict)
+    assert_equal(result['code'], 3)
+    assert_equal(result['stdout'], data.decode())
+    assert_equal(result['stderr'], str(len(data)))
+
+    # a generator protocol reports like with threads
+    for runner_class in (ThreadedRunner, SelectorRunner):
+        gen = runner_class(
+            cmd=py2cmd("for i in range(3): print(i)"),
+            protocol_class=GenStdoutLines,
+            stdin=None,
+        ).run()
+        assert_equal(list(gen), ['0', '1', '2'])
+        assert_equal(gen.return_code, 0)
+
+
+@skip_if_on_windows
+def test_selector_runner_timeout() -> None:
+    class TimeoutProtocol(NoCapture):
+        def __init__(self, timeouts: list[Optional[int]]) -> None:
+            NoCapture.__init__(self)
+            self.timeouts = timeouts
+
+        def timeout(self, fd: Optional[int]) -> bool:
+            self.timeouts.append(fd)
+            # terminate the process
+            return True
+
+    timeouts: list[Optional[int]] = []
+    result = SelectorRunner(
+        cmd=['sleep', '10'],
+        protocol_class=TimeoutProtocol,
+        protocol_kwargs=dict(timeouts=timeouts),
+        stdin=None,
+        timeout=.1,
+    ).run()
+    assert isinstance(result, dict)
+    assert_true(result['code'] < 0)
+    assert_equal(timeouts, [None])
+
+
+@skip_if_on_windows
+def test_runner_backend_selection() -> None:
+    assert_equal(_get_runner_class(b'', 'selector'), SelectorRunner)
+    # data sent continuously needs a thread
+    assert_equal(_get_runner_class(Queue(), 'selector'), ThreadedRunner)
+    assert_equal(_get_runner_class(b'', 'threads'), ThreadedRunner)
+    with assert_raises(CommandError) as cme:
+        Runner(backend='selector').run(
+            _echo_cmd, stdin=b'input', protocol=StdOutErrCapture)
+    assert_equal(cme.value.code, 3)
+    assert_equal(cme.value.stdout, 'input')
+    # the default is determined once, from the environment
+    with patch('datalad.runner.runner._default_backend', 'selector'):
+        assert_equal(Runner().backend, 'selector')
+    with patch.dict(os.environ,
+                    {'DATALAD_RUNTIME_RUNNER__BACKEND': 'selector'}):
+        assert_equal(Runner().backend, runner_module._default_backend)
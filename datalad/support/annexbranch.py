@@ -0,0 +1,350 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Read-only access to the logs on a git-annex branch, without git-annex
+
+The log files are read via the persistent `git cat-file` processes of a
+repository. This is much cheaper than calling a git-annex command, which
+needs to start up, and possibly merge the git-annex branches first. Hence,
+the logs only reflect the state of the given branch, and for the local
+`git-annex` branch also the journal of changes that have not been committed
+to it yet. Changes that git-annex has not yet merged from the git-annex
+branches of remotes are not reported.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+from hashlib import md5
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+lgr = logging.getLogger('datalad.support.annexbranch')
+
+# chunk fields are not part of the key that a location log is recorded for
+_CHUNK_FIELDS_REGEX = re.compile(r'-S\d+-C\d+(?=-)')
+
+# reverse the escaping of keys in file names
+_KEYFILE_UNESCAPE = {'%': '/', '&c': ':', '&s': '%', '&a': '&'}
+_KEYFILE_UNESCAPE_REGEX = re.compile(r'%|&[csa]')
+
+# git-annex trust levels, as recorded in trust.log
+TRUST_LEVELS = {
+    '1': 'trusted',
+    '?': 'semitrusted',
+    '0': 'untrusted',
+    'X': 'dead',
+}
+
+
+def _parse_timestamp(value: str) -> float:
+    # git-annex timestamps look like "1523283745.683191724s"
+    try:
+        return float(value.rstrip('s'))
+    except ValueError:
+        return 0.0
+
+
+def _split_timestamp(line: str) -> tuple[str, float]:
+    """Split a trailing "timestamp=...s" field off a log line"""
+    head, sep, tail = line.rpartition(' timestamp=')
+    if not sep:
+        # logs written by old git-annex versions have no timestamps
+        return line, 0.0
+    return head, _parse_timestamp(tail)
+
+
+def _latest_by_uuid(
+        lines: Iterable[str],
+        parse: Callable[[str], Optional[tuple[str, float, Any]]],
+) -> dict[str, Any]:
+    """Reduce log lines to the most recent value per UUID
+
+    Like git-annex, the union of all lines is considered, and for lines with
+    the same timestamp, a later one wins.
+    """
+    latest: dict[str, tuple[float, Any]] = {}
+    for line in lines:
+        if not line:
+            continue
+        parsed = parse(line)
+        if parsed is None:
+            lgr.debug('Ignoring unrecognized git-annex log line: %r', line)
+            continue
+        uuid, timestamp, value = parsed
+        if uuid not in latest or timestamp >= latest[uuid][0]:
+            latest[uuid] = (timestamp, value)
+    return {uuid: value for uuid, (_, value) in latest.items()}
+
+
+def _parse_location_line(line: str) -> Optional[tuple[str, float, bool]]:
+    # "<timestamp> <status> <uuid>", a status of 1 means present
+    fields = line.split(' ')
+    if len(fields) != 3:
+        return None
+    timestamp, status, uuid = fields
+    return uuid, _parse_timestamp(timestamp), status == '1'
+
+
+def _parse_value_line(line: str) -> Optional[tuple[str, float, str]]:
+    # "<uuid> <value> timestamp=<timestamp>", the value may contain spaces
+    head, timestamp = _split_timestamp(line)
+    uuid, _, value = head.partition(' ')
+    return uuid, timestamp, value
+
+
+def _parse_remote_line(line: str) -> Optional[tuple[str, float, dict]]:
+    # "<uuid> <key>=<value> ... timestamp=<timestamp>"
+    fields = line.split(' ')
+    config = {}
+    for field in fields[1:]:
+        key, sep, value = field.partition('=')
+        if not sep:
+            return None
+        config[key] = value
+    return (
+        fields[0],
+        _parse_timestamp(config.get('timestamp', '0')),
+        config,
+    )
+
+
+def key_log_path(key: str, hash_levels: int = 2) -> str:
+    """Path of the location log of `key` on the git-annex branch
+
+    This is the 'hashdirlower' layout of git-annex, with `hash_levels`
+    directory levels (git-annex uses a single level, when
+    `annex.tune.branchhash1` is set).
+    """
+    digest = md5(  # nosec - not used for security
+        _CHUNK_FIELDS_REGEX.sub('', key).encode('utf-8')).hexdigest()
+    hashdir = ''.join(
+        digest[i * 3:(i + 1) * 3] + '/' for i in range(hash_levels))
+    # the same escaping git-annex applies to keys in file names
+    keyfile = key.replace('&', '&a').replace('%', '&s') \
+        .replace(':', '&c').replace('/', '%')
+    return '{}{}.log'.format(hashdir, keyfile)
+
+
+def _key_from_log_path(path: str, hash_levels: int) -> Optional[str]:
+    """Inverse of `key_log_path()`, None if `path` is no location log"""
+    parts = path.split('/')
+    if len(parts) != hash_levels + 1 or not parts[-1].endswith('.log') \
+            or any(len(p) != 3 for p in parts[:-1]):
+        return None
+    return _KEYFILE_UNESCAPE_REGEX.sub(
+        lambda m: _KEYFILE_UNESCAPE[m.group(0)], parts[-1][:-4])
+
+
+def _journal_file_name(path: str) -> str:
+    # the journal is a flat directory, git-annex mangles the paths
+    return path.replace('_', '__').replace('/', '_')
+
+
+class AnnexBranchReader:
+    """Read logs of a git-annex branch via `git cat-file --batch`
+
+    Queries for the repository-wide logs (uuid.log, remote.log, trust.log)
+    are cached, and only parsed again when the log on the branch, or in the
+    journal has changed.
+
+    Parameters
+    ----------
+    repo: GitRepo
+      Repository to read the branch from. It need not be an annex repository
+      itself, e.g. to read the git-annex branch of a remote.
+    ref: str, optional
+      Name of the git-annex branch, e.g. 'origin/git-annex' to read the state
+      of a remote as known locally. The journal is only considered for the
+      local 'git-annex' branch.
+    """
+    def __init__(self, repo, ref: str = 'git-annex'):
+        self.repo = repo
+        self.ref = ref
+        self._journal = repo.dot_git / 'annex' / 'journal' \
+            if ref == 'git-annex' else None
+        # log path -> (blob SHA, journal file state, parsed log)
+        self._cache: dict[str, tuple[Optional[str], Any, Any]] = {}
+
+    def get_uuids(self) -> dict[str, str]:
+        """Get the descriptions of all annexes known on this branch
+
+        Returns
+        -------
+        dict
+          Description by annex UUID.
+        """
+        return dict(self._read_cached(
+            'uuid.log',
+            lambda lines: _latest_by_uuid(lines, _parse_value_line)))
+
+    def get_remote_configs(self) -> dict[str, dict[str, str]]:
+        """Get the configurations of all special remotes
+
+        Returns
+        -------
+        dict
+          Configuration (as recorded in remote.log) by special remote UUID.
+        """
+        return {
+            uuid: dict(config)
+            for uuid, config in self._read_cached(
+                'remote.log',
+                lambda lines: _latest_by_uuid(
+                    lines, _parse_remote_line)).items()
+        }
+
+    def get_trust_levels(self) -> dict[str, str]:
+        """Get the trust levels of all annexes that have one set
+
+        Returns
+        -------
+        dict
+          Trust level ('trusted', 'semitrusted', 'untrusted', 'dead') by annex
+          UUID. Annexes without a recorded trust level are semitrusted.
+        """
+        return dict(self._read_cached(
+            'trust.log',
+            lambda lines: {
+                uuid: TRUST_LEVELS.get(level, 'semitrusted')
+                for uuid, level in _latest_by_uuid(
+                    lines, _parse_value_line).items()}))
+
+    def get_key_locations(self, keys: Iterable[str]) -> Iterator[list[str]]:
+        """Get the UUIDs of all annexes that have a copy of each key
+
+        The location logs of all keys are read in a single pass. The result
+        includes dead annexes, use `get_trust_levels()` to exclude them.
+
+        Yields
+        ------
+        list
+          UUIDs of the annexes that have a copy, for each key in `keys`, in
+          order.
+        """
+        hash_levels = self._hash_levels()
+        journal_files = self._list_journal()
+        keys = list(keys)
+        paths = [key_log_path(key, hash_levels) for key in keys]
+        objs = self.repo.cat_file.read_many(
+            '{}:{}'.format(self.ref, path) for path in paths)
+        for path, obj in zip(paths, objs):
+            lines = [] if obj is None else \
+                str(obj.data, 'utf-8', errors='replace').splitlines()
+            journal_file = _journal_file_name(path)
+            if journal_file in journal_files:
+                lines.extend(self._read_journal(journal_file))
+            yield [
+                uuid
+                for uuid, present in _latest_by_uuid(
+                    lines, _parse_location_line).items()
+                if present
+            ]
+
+    def get_keys(self) -> Iterator[str]:
+        """Yield all keys that have a location log
+
+        Yields
+        ------
+        str
+          Keys with a location log on the branch, followed by keys that
+          only have one in the journal.
+        """
+        hash_levels = self._hash_levels()
+        seen = set()
+        if self.repo.cat_file.check(self.ref) is not None:
+            for path in self.repo.call_git_items_(
+                    ['ls-tree', '-r', '-z', '--name-only', self.ref],
+                    sep='\0', read_only=True):
+                key = _key_from_log_path(path, hash_levels)
+                if key is not None:
+                    seen.add(key)
+                    yield key
+        for name in sorted(self._list_journal()):
+            # the hash directories have no underscores, hence the path of
+            # the log is easily restored
+            dirs = name[:4 * hash_levels].split('_')[:-1]
+            key = _key_from_log_path(
+                '/'.join(dirs + [name[4 * hash_levels:].replace('__', '_')]),
+                hash_levels)
+            if key is not None and key not in seen:
+                yield key
+
+    def read_log(self, path: str) -> list[str]:
+        """Read the lines of any log on the branch and in the journal
+
+        Parameters
+        ----------
+        path: str
+          Path of the log on the branch, e.g. 'uuid.log'.
+
+        Returns
+        -------
+        list
+          Lines of the log on the branch, followed by any lines in the
+          journal. Empty if the log does not exist.
+        """
+        obj = self.repo.cat_file.read('{}:{}'.format(self.ref, path))
+        return self._log_lines(obj, path)
+
+    def _log_lines(self, obj, path: str) -> list[str]:
+        lines = [] if obj is None or obj.type != 'blob' else \
+            str(obj.data, 'utf-8', errors='replace').splitlines()
+        if self._journal is not None:
+            lines.extend(self._read_journal(_journal_file_name(path)))
+        return lines
+
+    def _read_cached(self, path: str, parse: Callable[[list[str]], Any]):
+        obj = self.repo.cat_file.check('{}:{}'.format(self.ref, path))
+        sha = None if obj is None else obj.sha
+        journal_state = self._stat_journal(_journal_file_name(path))
+        cached = self._cache.get(path)
+        if cached is not None and cached[:2] == (sha, journal_state):
+            return cached[2]
+        parsed = parse(self._log_lines(
+            None if sha is None else self.repo.cat_file.read(sha), path))
+        self._cache[path] = (sha, journal_state, parsed)
+        return parsed
+
+    def _hash_levels(self) -> int:
+        return 1 if self.repo.cfg.getbool(
+            'annex', 'tune.branchhash1', default=False) else 2
+
+    def _list_journal(self) -> set[str]:
+        if self._journal is None:
+            return set()
+        try:
+            return {p.name for p in self._journal.iterdir()}
+        except OSError:
+            return set()
+
+    def _stat_journal(self, name: str):
+        if self._journal is None:
+            return None
+        try:
+            stat = (self._journal / name).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_journal(self, name: str) -> list[str]:
+        if self._journal is None:
+            return []
+        try:
+            return (self._journal / name).read_text(
+                encoding='utf-8', errors='replace').splitlines()
+        except OSError:
+            return []
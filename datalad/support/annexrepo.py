@@ -31,7 +31,10 @@ from os.path import (
     lexists,
     normpath,
 )
-from typing import Dict
+from typing import (
+    Dict,
+    Optional,
+)
 from weakref import (
     WeakValueDictionary,
     finalize,
@@ -40,6 +43,7 @@ from weakref import (
 import datalad.utils as ut
 from datalad.cmd import (  # KillOutput,
     BatchedCommand,
+    BatchedCommandPool,
     GitWitlessRunner,
     SafeDelCloseMixin,
     StdOutCapture,
@@ -53,7 +57,10 @@ from datalad.dochelpers import (
     borrowdoc,
     borrowkwargs,
 )
-from datalad.log import log_progress
+from datalad.log import (
+    is_progress_reported,
+    log_progress,
+)
 from datalad.runner.protocol import GeneratorMixIn
 from datalad.runner.utils import (
     AssemblingDecoderMixIn,
@@ -64,6 +71,11 @@ from datalad.support.annex_utils import (
     _get_non_existing_from_annex_output,
     _sanitize_key,
 )
+from datalad.support.annexbranch import AnnexBranchReader
+from datalad.support.availability import (
+    KeyAvailability,
+    whereis_uuids,
+)
 from datalad.support.exceptions import CapturedException
 from datalad.ui import ui
 from datalad.utils import (
@@ -104,9 +116,29 @@ from .gitrepo import (
     to_options,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 lgr = logging.getLogger('datalad.annex')
 
 
+def decode_json_bytes(data):
+    """Decode a JSON document from a bytes-like object
+
+    If installed, orjson is used, which decodes much faster, and without
+    copying a `memoryview`. Documents that orjson rejects (e.g. with integers
+    beyond 64 bit) are decoded with the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(data))
+
+
 class AnnexRepo(GitRepo, RepoInterface):
     """Representation of an git-annex repository.
 
@@ -121,7 +153,12 @@ class AnnexRepo(GitRepo, RepoInterface):
     _unique_instances = WeakValueDictionary()
 
     def _flyweight_invalid(self):
-        return not self.is_valid_annex(allow_noninitialized=True)
+        invalid = not self.is_valid_annex(allow_noninitialized=True)
+        if invalid:
+            # a new instance for the path must not be handed the processes of
+            # this one
+            self._batched.release()
+        return invalid
 
     # End Flyweight:
 
@@ -147,6 +184,23 @@ class AnnexRepo(GitRepo, RepoInterface):
     repository_versions = None
     _version_kludges = {}
 
+    # git-annex commands that do not change which content is present in the
+    # local annex. Any other command invalidates the content index (see
+    # _get_content_index()), unless its results are used to update the index.
+    _CONTENT_INDEX_KEEPING_COMMANDS = frozenset((
+        'checkpresentkey', 'config', 'contentlocation', 'enableremote',
+        'examinekey', 'find', 'findref', 'fromkey', 'group', 'info',
+        'initremote', 'metadata', 'registerurl', 'version', 'wanted',
+        'whereis',
+    ))
+    # git-annex commands whose successful results report that the content of
+    # a key is present (True) or absent (False) in the local annex afterwards
+    _CONTENT_INDEX_UPDATING_COMMANDS = {
+        'get': True,
+        'drop': False,
+        'dropkey': False,
+    }
+
     def __init__(self, path, runner=None,
                  backend=None, always_commit=True,
                  create=True, create_sanity_checks=True,
@@ -293,7 +347,8 @@ class AnnexRepo(GitRepo, RepoInterface):
             )
 
         self._batched = BatchedAnnexes(
-            batch_size=batch_size, git_options=self._ANNEX_GIT_COMMON_OPTIONS)
+            batch_size=batch_size, git_options=self._ANNEX_GIT_COMMON_OPTIONS,
+            path=self.path)
 
         # set default backend for future annex commands:
         # TODO: Should the backend option of __init__() also migrate
@@ -303,6 +358,8 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         # will be evaluated lazily
         self._n_auto_jobs = None
+        self._content_index = None
+        self._annex_branch = None
 
         # Finally, register a finalizer (instead of having a __del__ method).
         # This will be called by garbage collection as well as "atexit". By
@@ -365,7 +422,7 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         try:
             if batched is not None:
-                batched.close()
+                batched.release()
         except TypeError as e:
             # Workaround:
             # most likely something wasn't accessible anymore; doesn't really
@@ -777,6 +834,17 @@ class AnnexRepo(GitRepo, RepoInterface):
         else:
             return remotes
 
+    @property
+    def annex_branch(self) -> AnnexBranchReader:
+        """Reader for the logs on the local git-annex branch
+
+        Provides cached access to the information git-annex records on its
+        branch, without running git-annex.
+        """
+        if self._annex_branch is None:
+            self._annex_branch = AnnexBranchReader(self)
+        return self._annex_branch
+
     def get_special_remotes(self, include_dead:bool = False) -> Dict[str, dict]:
         """Get info about all known (not just enabled) special remotes.
 
@@ -805,47 +873,14 @@ class AnnexRepo(GitRepo, RepoInterface):
           working with a sameas remote, the presence of either "sameas-name" or
           "sameas-uuid" is a reliable indicator.
         """
-        argspec = re.compile(r'^([^=]*)=(.*)$')
-        srs = {}
-
         # We provide custom implementation to access this metadata since ATM
         # no git-annex command exposes it on CLI.
         #
-        # Information will potentially be obtained from remote.log within
-        # git-annex branch, and git-annex's journal, which might exist e.g.
-        # due to alwayscommit=false operations
-        sources = []
-        try:
-            sources.append(
-                list(
-                    self.call_git_items_(
-                        ['cat-file', 'blob', 'git-annex:remote.log'],
-                        read_only=True)
-                )
-            )
-        except CommandError as e:
-            if (
-                ('Not a valid object name git-annex:remote.log' in e.stderr) or  # e.g. git 2.30.2
-                ("fatal: path 'remote.log' does not exist in 'git-annex'" in e.stderr) or # e.g. 2.35.1+next.20220211-1
-                ("fatal: invalid object name 'git-annex'" in e.stderr) # e.g., 2.43.0
-            ):
-                # no special remotes configured - might still be in the journal
-                pass
-            else:
-                # some unforeseen error
-                raise e
-
-        journal_path = self.dot_git / "annex" / "journal" / "remote.log"
-        if journal_path.exists():
-            sources.append(journal_path.read_text().splitlines())
-
-        for line in chain(*sources):
-            # be precise and split by spaces
-            fields = line.split(' ')
-            # special remote UUID
-            sr_id = fields[0]
-            # the rest are config args for enableremote
-            sr_info = dict(argspec.match(arg).groups()[:2] for arg in fields[1:])
+        # Information is obtained from remote.log within git-annex branch,
+        # and git-annex's journal, which might exist e.g. due to
+        # alwayscommit=false operations
+        srs = self.annex_branch.get_remote_configs()
+        for sr_info in srs.values():
             if "name" not in sr_info:
                 name = sr_info.get("sameas-name")
                 if name is None:
@@ -855,27 +890,48 @@ class AnnexRepo(GitRepo, RepoInterface):
                         sr_info)
                 else:
                     sr_info["name"] = name
-            srs[sr_id] = sr_info
 
         # remove dead ones
         if not include_dead:
-            # code largely copied from drop.py:_detect_nondead_annex_at_remotes
-            # but not using -p and rather blob as above
-            try:
-                for line in self.call_git_items_(
-                        ['cat-file', 'blob', 'git-annex:trust.log']):
-                    columns = line.split()
-                    if columns[1] == 'X':
-                        # .pop if present
-                        srs.pop(columns[0], None)
-            except CommandError as e:
-                # this is not a problem per-se, probably file is not there, just log
-                CapturedException(e)
+            for uuid, level in self.annex_branch.get_trust_levels().items():
+                if level == 'dead':
+                    # .pop if present
+                    srs.pop(uuid, None)
         return srs
 
+    # all call_git*() methods go through these two. Any git call that might
+    # write to the repository can change the content of the local annex,
+    # e.g. `git add` of annexed files or git-annex run via `git annex`
+    def _call_git(self, args, files=None, expect_stderr=False,
+                  expect_fail=False, env=None,
+                  pathspec_from_file: Optional[bool] = False,
+                  read_only=False):
+        try:
+            return super()._call_git(
+                args, files=files, expect_stderr=expect_stderr,
+                expect_fail=expect_fail, env=env,
+                pathspec_from_file=pathspec_from_file, read_only=read_only)
+        finally:
+            if not read_only:
+                self._content_index = None
+
+    def call_git_items_(self, args, files=None, expect_stderr=False,
+                        expect_fail=False, env=None,
+                        pathspec_from_file: Optional[bool] = False,
+                        read_only=False, sep=None, keep_ends=False):
+        try:
+            yield from super().call_git_items_(
+                args, files=files, expect_stderr=expect_stderr,
+                expect_fail=expect_fail, env=env,
+                pathspec_from_file=pathspec_from_file, read_only=read_only,
+                sep=sep, keep_ends=keep_ends)
+        finally:
+            if not read_only:
+                self._content_index = None
+
     def _call_annex(self, args, files=None, jobs=None, protocol=StdOutErrCapture,
                     git_options=None, stdin=None, merge_annex_branches=True,
-                    **kwargs):
+                    read_only=False, **kwargs):
         """Internal helper to run git-annex commands
 
         Standard command options are applied in addition to the given arguments,
@@ -909,6 +965,11 @@ class AnnexRepo(GitRepo, RepoInterface):
           If False, annex.merge-annex-branches=false config will be set for
           git-annex call.  Useful for operations which are not intended to
           benefit from updating information about remote git-annexes
+        read_only: bool, optional
+          If True, the command is known to not modify the repository. If
+          `files` needs to be split into multiple invocations, up to
+          'datalad.runtime.max-chunk-jobs' of them are run in parallel.
+          Ignored for generator protocols.
         **kwargs:
           Additional arguments are passed on to the WitlessProtocol constructor
 
@@ -969,6 +1030,10 @@ class AnnexRepo(GitRepo, RepoInterface):
         if jobs and jobs != 1:
             cmd.append('-J%d' % jobs)
 
+        if not read_only and args[0] not in self._CONTENT_INDEX_KEEPING_COMMANDS \
+                and args[0] not in self._CONTENT_INDEX_UPDATING_COMMANDS:
+            self._content_index = None
+
         runner = self._git_runner
         env = None
         if self.fake_dates_enabled:
@@ -989,6 +1054,9 @@ class AnnexRepo(GitRepo, RepoInterface):
                         files,
                         protocol=protocol,
                         env=env,
+                        chunk_jobs=self.config.obtain(
+                            'datalad.runtime.max-chunk-jobs')
+                        if read_only else None,
                         **kwargs)
             else:
                 return runner.run(
@@ -1040,6 +1108,7 @@ class AnnexRepo(GitRepo, RepoInterface):
                             stdin=None,
                             merge_annex_branches=True,
                             progress=False,
+                            read_only=False,
                             **kwargs):
         """Internal helper to run git-annex commands with JSON result processing
 
@@ -1060,6 +1129,8 @@ class AnnexRepo(GitRepo, RepoInterface):
           See `_call_annex()` for details.
         merge_annex_branches: bool, optional
           See `_call_annex()` for details.
+        read_only: bool, optional
+          See `_call_annex()` for details.
         **kwargs:
           Additional arguments are passed on to the AnnexJsonProtocol constructor
 
@@ -1096,9 +1167,12 @@ class AnnexRepo(GitRepo, RepoInterface):
                 git_options=git_options,
                 stdin=stdin,
                 merge_annex_branches=merge_annex_branches,
+                read_only=read_only,
                 **kwargs,
             )
         except CommandError as e:
+            # whatever happened, was not fully reported
+            self._invalidate_content_index(args[0])
             not_existing = None
             if e.kwargs.get('stdout_json'):
                 # See if may be it was within stdout_json, as e.g. was added around
@@ -1186,6 +1260,7 @@ class AnnexRepo(GitRepo, RepoInterface):
             if len(obj.keys()) == 1 and obj['info']:
                 lgr.info(obj['info'])
             else:
+                self._update_content_index(args[0], obj)
                 return_objects.append(obj)
 
         return return_objects
@@ -1235,9 +1310,11 @@ class AnnexRepo(GitRepo, RepoInterface):
                     lgr.info(json_object['info'])
                 else:
                     json_objects_received = True
+                    self._update_content_index(args[0], json_object)
                     yield json_object
 
         except CommandError as e:
+            self._invalidate_content_index(args[0])
             # Note: Workaround for not existing files as long as annex doesn't
             # report it within JSON response:
             # see http://git-annex.branchable.com/bugs/copy_does_not_reflect_some_failed_copies_in_--json_output/
@@ -2235,6 +2312,8 @@ class AnnexRepo(GitRepo, RepoInterface):
                 path=self.path,
                 json=True
             )
+            # content might be added
+            self._content_index = None
             try:
                 out_json = bcmd((url, file_))
             except Exception as exc:
@@ -2414,6 +2493,8 @@ class AnnexRepo(GitRepo, RepoInterface):
                 'dropkey',
                 annex_options=options, json=True, path=self.path
             )(keys)
+            for j in json_objects:
+                self._update_content_index('dropkey', j)
         # TODO: RF to be consistent with the rest (IncompleteResultError or alike)
         # and/or completely refactor since drop above also has key option
         for j in json_objects:
@@ -2491,7 +2572,8 @@ class AnnexRepo(GitRepo, RepoInterface):
             def _call_cmd(cmd, files=None):
                 """Helper to reuse consistently in case of --key and not invocations"""
                 try:
-                    return self.call_annex_records(cmd, files=files)
+                    return self._call_annex_records(
+                        cmd, files=files, read_only=True)
                 except CommandError as e:
                     if e.stderr.startswith('Invalid'):
                         # would happen when git-annex is called with incompatible options
@@ -2536,6 +2618,59 @@ class AnnexRepo(GitRepo, RepoInterface):
                 if not j.get('key', '').endswith('.this-is-a-test-key')
             }
 
+    def get_key_availability(self, keys=None, native=False):
+        """Get the locations of annexed keys as a table for bulk queries
+
+        In contrast to `whereis()`, no per-key location records are
+        assembled, and queries over all keys, like "keys with fewer than N
+        copies", are cheap even for millions of keys.
+
+        Parameters
+        ----------
+        keys: list of str, optional
+          Keys to report on. By default, all keys that git-annex knows
+          about are reported, including those not used in any branch.
+        native: bool, optional
+          If True, the location logs on the git-annex branch are read
+          without running git-annex. This is much faster, but does not
+          consider changes that git-annex has not merged into the branch
+          yet (e.g., from the git-annex branches of remotes). Otherwise, a
+          single `git annex whereis` process is used.
+
+        Returns
+        -------
+        KeyAvailability
+          Copies in dead annexes are not reported.
+        """
+        if native:
+            branch = self.annex_branch
+            keys = list(branch.get_keys() if keys is None else keys)
+            dead = [uuid for uuid, level in branch.get_trust_levels().items()
+                    if level == 'dead']
+            table = KeyAvailability()
+            for key, uuids in zip(keys, branch.get_key_locations(keys)):
+                table.add(key, uuids)
+            if dead:
+                # zero the columns of dead annexes
+                alive = ~table.mask(dead)
+                table.presence = [p & alive for p in table.presence]
+            return table
+
+        if keys is None:
+            return KeyAvailability.from_whereis_records(
+                self._call_annex_records_items_(
+                    ['whereis', '--all'], read_only=True))
+
+        keys = list(keys)
+        records = self._batched.get(
+            'whereis', json=True, path=self.path,
+            batch_opt='--batch-keys').map(keys)
+        table = KeyAvailability()
+        for key, record in zip(keys, records):
+            # unknown keys have no copies
+            table.add(key, whereis_uuids(record or {}))
+        return table
+
     # TODO:
     # I think we should make interface cleaner and less ambiguous for those annex
     # commands which could operate on globs, files, and entire repositories, separating
@@ -2564,6 +2699,7 @@ class AnnexRepo(GitRepo, RepoInterface):
         if not batch:
             json_objects = self._call_annex_records(
                 ['info'] + options, files=files, merge_annex_branches=False,
+                read_only=True,
                 exception_on_error=False,
             )
         else:
@@ -3286,6 +3422,9 @@ class AnnexRepo(GitRepo, RepoInterface):
     def _mark_content_availability(self, info):
         objectstore = self.pathobj.joinpath(
             self.path, GitRepo.get_git_dir(self), 'annex', 'objects')
+        content_index = None
+        if any('key' in r and 'has_content' not in r for r in info.values()):
+            content_index = self._get_content_index()
         for f, r in info.items():
             if 'key' not in r or 'has_content' in r:
                 # not annexed or already processed
@@ -3300,6 +3439,17 @@ class AnnexRepo(GitRepo, RepoInterface):
             # correctly. Can't limit to URL backend only; custom key backends
             # may need it, too
             key = _sanitize_key(r['key'])
+            if content_index is not None:
+                if key not in content_index:
+                    continue
+                objloc = content_index[key]
+                if objloc:
+                    r.pop('hashdirlower', None)
+                    r.pop('hashdirmixed', None)
+                    r['objloc'] = objloc
+                    r['has_content'] = True
+                    continue
+                # present, but the location is unknown, look for it below
             for testpath in (
                     # ATM git-annex reports hashdir in native path
                     # conventions and the actual file path `f` in
@@ -3316,8 +3466,77 @@ class AnnexRepo(GitRepo, RepoInterface):
                     r.pop('hashdirmixed', None)
                     r['objloc'] = str(testpath)
                     r['has_content'] = True
+                    if content_index is not None:
+                        content_index[key] = r['objloc']
                     break
 
+    def _get_content_index(self):
+        """Get the index of the content of the local annex
+
+        The index is only used if 'datalad.annex.content-index' is enabled. It
+        is built on first use from a scan of the annex object store, and
+        maintained for the lifetime of this instance. Results of git-annex
+        commands that get or drop content update it, any other git-annex call
+        or git call that is not read-only might change the object store and
+        discards it.
+
+        Returns
+        -------
+        dict or None
+          Mapping of sanitized keys of all locally present objects to the
+          path of their object file, or None if the path is not known. None
+          if the index is not enabled.
+        """
+        if not self.config.obtain('datalad.annex.content-index'):
+            return None
+        if self._content_index is None:
+            self._content_index = self._scan_content()
+        return self._content_index
+
+    def _scan_content(self):
+        # scan the two hash directory levels of the object store. Key
+        # directories only exist with content, except on Windows, where they
+        # may not get cleaned up on `drop`.
+        objectstore = opj(
+            self.path, GitRepo.get_git_dir(self), 'annex', 'objects')
+        index = {}
+        try:
+            level1 = list(os.scandir(objectstore))
+        except FileNotFoundError:
+            return index
+        for d1 in level1:
+            if not d1.is_dir():
+                continue
+            for d2 in os.scandir(d1.path):
+                if not d2.is_dir():
+                    continue
+                for keydir in os.scandir(d2.path):
+                    objloc = opj(keydir.path, keydir.name)
+                    if on_windows and not exists(objloc):
+                        continue
+                    index[keydir.name] = objloc
+        lgr.debug('Found %d keys in %s', len(index), objectstore)
+        return index
+
+    def _update_content_index(self, command, record):
+        if self._content_index is None:
+            return
+        if command not in self._CONTENT_INDEX_UPDATING_COMMANDS:
+            return
+        if not record.get('success') or 'key' not in record:
+            return
+        key = _sanitize_key(record['key'])
+        if self._CONTENT_INDEX_UPDATING_COMMANDS[command]:
+            # the location is determined on the next lookup
+            self._content_index.setdefault(key, None)
+        else:
+            self._content_index.pop(key, None)
+
+    def _invalidate_content_index(self, command):
+        if command in self._CONTENT_INDEX_UPDATING_COMMANDS:
+            # not all changes might have been reported
+            self._content_index = None
+
     def get_file_annexinfo(self, path, ref=None, eval_availability=False,
                            key_prefix=''):
         """Query annex properties for a single file
@@ -3375,7 +3594,7 @@ class AnnexRepo(GitRepo, RepoInterface):
 
     def get_content_annexinfo(
             self, paths=None, init='git', ref=None, eval_availability=False,
-            key_prefix='', **kwargs):
+            key_prefix='', batch=None, **kwargs):
         """
         Parameters
         ----------
@@ -3394,6 +3613,13 @@ class AnnexRepo(GitRepo, RepoInterface):
         eval_availability : bool
           If this flag is given, evaluate whether the content of any annex'ed
           file is present in the local annex.
+        batch : bool or None
+          If set, `paths` are queried via a persistent `git annex find
+          --batch` process, which is kept running for subsequent queries.
+          This avoids the startup cost of git-annex for repeated queries on
+          a few paths. It has no effect if `ref` is given, or if any of the
+          `paths` is not reported as a file by `init`. If None, batch mode is
+          used for no more than 'datalad.annex.batch-annexinfo' paths.
         **kwargs :
           Additional arguments for GitRepo.get_content_info(), if `init` is
           set to 'git'.
@@ -3447,7 +3673,28 @@ class AnnexRepo(GitRepo, RepoInterface):
             else:
                 cmd += ['--include', '*']
 
-        for j in self.call_annex_records(cmd, files=files):
+        if batch is None and files:
+            batch = len(files) <= self.config.obtain(
+                'datalad.annex.batch-annexinfo')
+        # `git annex find --batch` reports nothing on directories, and takes
+        # one path per line. Rather than testing the paths on the filesystem,
+        # rely on the (Git) report on them
+        if batch and files and all(
+                '\n' not in f and info.get(
+                    self.pathobj / f, {}).get('type') in ('file', 'symlink')
+                for f in files):
+            records = self._batched.get(
+                'find', json=True, path=self.path,
+                annex_options=['--anything'],
+            ).map(files)
+        else:
+            records = self._call_annex_records(
+                cmd, files=files, read_only=True)
+
+        for j in records:
+            if not j:
+                # batch mode reports an empty record for a non-annexed file
+                continue
             path = self.pathobj.joinpath(ut.PurePosixPath(j['file']))
             rec = info.get(path, None)
             if rec is None:
@@ -3707,9 +3954,16 @@ class AnnexJsonProtocol(WitlessProtocol):
     proc_out = True
     proc_err = True
 
-    # throttle for byte-progress-driven Total-bar updates
+    # throttle for Total-bar updates
     _total_pbar_min_interval = 0.5
 
+    # decoder for a single JSON record, given as bytes-like object
+    decode_json = staticmethod(decode_json_bytes)
+
+    # whether progress reports are shown at all, determined when the
+    # connection is made
+    _report_progress = True
+
     def __init__(self, done_future=None, total_nbytes=None):
         if done_future is not None:
             warnings.warn("`done_future` argument is ignored "
@@ -3760,6 +4014,8 @@ class AnnexJsonProtocol(WitlessProtocol):
     def connection_made(self, transport):
         super().connection_made(transport)
         self._init_total_pbar_state()
+        self._report_progress = is_progress_reported(
+            lgr, noninteractive_level=5)
         if self.total_nbytes:
             # create the Total pbar eagerly so it sits ABOVE per-file bars
             # (tqdm orders bars by creation time). The rate spike from
@@ -3782,32 +4038,51 @@ class AnnexJsonProtocol(WitlessProtocol):
             super().pipe_data_received(fd, data)
             return
         if self._unprocessed:
-            data = self._unprocessed + data
+            # extend the buffer of the incomplete line in place
+            buffer = self._unprocessed
+            buffer += data
             self._unprocessed = None
-        # this is where the JSON records come in
-        lines = data.splitlines()
-        data_ends_with_eol = data.endswith(os.linesep.encode())
+        else:
+            buffer = data
         del data
-        for iline, line in enumerate(lines):
+        # this is where the JSON records come in. Lines are decoded straight
+        # from the received data, without splitting it into a list of copies
+        view = memoryview(buffer)
+        start = 0
+        end = buffer.find(b'\n')
+        while end >= 0:
+            self._proc_json_line(view[start:end])
+            start = end + 1
+            end = buffer.find(b'\n', start)
+        if start < len(buffer):
+            line = view[start:]
             try:
-                j = json.loads(line)
+                j = self.decode_json(line)
             except Exception as exc:
-                if line.strip():
-                    # do not complain on empty lines
-                    if iline == len(lines) - 1 and not data_ends_with_eol:
-                        lgr.debug("Caught %s while trying to parse JSON line %s which might "
-                                  "be not yet a full line", exc, line)
-                        # it is the last line and fails to parse -- it can/likely
-                        # to happen that it was not a complete line and that buffer
-                        # got filled up/provided before the end of line.
-                        # Store it so that it can be prepended to data in the next call.
-                        self._unprocessed = line
-                        break
-                    # TODO turn this into an error result, or put the exception
-                    # onto the result future -- needs more thought
-                    lgr.error('Received undecodable JSON output: %s', line)
-                continue
-            self._proc_json_record(j)
+                # do not keep whitespace only
+                if bytes(line).strip():
+                    lgr.debug("Caught %s while trying to parse JSON line %s which might "
+                              "be not yet a full line", exc, bytes(line))
+                    # it is the last line and fails to parse -- it can/likely
+                    # to happen that it was not a complete line and that buffer
+                    # got filled up/provided before the end of line.
+                    # Keep it, so that the next data can be appended to it.
+                    self._unprocessed = bytearray(line)
+            else:
+                self._proc_json_record(j)
+        view.release()
+
+    def _proc_json_line(self, line):
+        try:
+            j = self.decode_json(line)
+        except Exception:
+            if bytes(line).strip():
+                # do not complain on empty lines
+                # TODO turn this into an error result, or put the exception
+                # onto the result future -- needs more thought
+                lgr.error('Received undecodable JSON output: %s', bytes(line))
+            return
+        self._proc_json_record(j)
 
     def _get_pbar_id(self, record):
         # NOTE: Look at the "action" field for byte-progress records and the
@@ -3893,13 +4168,26 @@ class AnnexJsonProtocol(WitlessProtocol):
         return label
 
     def _proc_json_record(self, j):
-        # check for progress reports and act on them immediately
-        # but only if there is something to build a progress report from
-        pbar_id = self._get_pbar_id(j)
-        known_pbar = pbar_id in self._pbars
         action = j.get('action')
-
         is_progress = action and 'byte-progress' in j
+        if not self._report_progress:
+            # skip all progress bookkeeping, and only deliver the results
+            if is_progress:
+                return
+            if action:
+                for err_msg in action.pop('error-messages', []):
+                    lgr.error(err_msg)
+            self.add_to_output(j)
+            return
+        # check for progress reports and act on them immediately
+        # but only if there is something to build a progress report from.
+        # The progress bar of a record can only matter for a progress report,
+        # or if there are progress bars for files
+        pbar_id = self._get_pbar_id(j) \
+            if is_progress or self._inflight_credited \
+            or len(self._pbars) > (self._global_pbar_id in self._pbars) \
+            else None
+        known_pbar = pbar_id in self._pbars
         # ignore errors repeatedly reported in progress messages. Final message
         # will contain them
         if action and not is_progress:
@@ -3956,6 +4244,15 @@ class AnnexJsonProtocol(WitlessProtocol):
                     )
             # do not let progress reports leak into the return value
             return
+        # don't do anything to the results for now in terms of normalization
+        # TODO the protocol could be made aware of the runner's CWD and
+        # also any dataset the annex command is operating on. This would
+        # enable 'file' property conversion to absolute paths
+        self.add_to_output(j)
+        if not self.total_nbytes or self._total_pbar_finished:
+            # nothing else to report on
+            return
+
         # update overall progress, do not crash when there is no key property
         # in the report (although there should be one)
         key_bytes = AnnexRepo.get_size_from_key(j.get('key', None))
@@ -3979,31 +4276,30 @@ class AnnexJsonProtocol(WitlessProtocol):
             self._resumed_bytes -= resume_offset
             self._error_count += 1
             self._error_bytes += key_bytes
-        # don't do anything to the results for now in terms of normalization
-        # TODO the protocol could be made aware of the runner's CWD and
-        # also any dataset the annex command is operating on. This would
-        # enable 'file' property conversion to absolute paths
-        self.add_to_output(j)
 
-        if self.total_nbytes and not self._total_pbar_finished:
-            if self._effective_total() <= self._byte_count:
-                # take the global pbar down if it was ever created; skip the
-                # emit when it was not, so the handler does not lazily spawn
-                # an empty pbar at the very end of a no-progress run
-                if self._global_pbar_id in self._pbars:
-                    log_progress(
-                        lgr.info,
-                        self._global_pbar_id,
-                        'Finished annex {}'.format(j.get('command', '')),
-                        noninteractive_level=5,
-                    )
-                    self._pbars.discard(self._global_pbar_id)
-                self._total_pbar_finished = True
-            else:
-                self._emit_total_pbar_update(
-                    file_msg=j.get('file', ''),
-                    byte_count=self._byte_count,
+        if self._effective_total() <= self._byte_count:
+            # take the global pbar down if it was ever created; skip the
+            # emit when it was not, so the handler does not lazily spawn
+            # an empty pbar at the very end of a no-progress run
+            if self._global_pbar_id in self._pbars:
+                log_progress(
+                    lgr.info,
+                    self._global_pbar_id,
+                    'Finished annex {}'.format(j.get('command', '')),
+                    noninteractive_level=5,
                 )
+                self._pbars.discard(self._global_pbar_id)
+            self._total_pbar_finished = True
+            return
+        # with many small files, updates are throttled like those for
+        # byte-progress reports
+        now = time.monotonic()
+        if now - self._last_total_emit_ts >= self._total_pbar_min_interval:
+            self._last_total_emit_ts = now
+            self._emit_total_pbar_update(
+                file_msg=j.get('file', ''),
+                byte_count=self._byte_count,
+            )
 
     def _prepare_result(self):
         # first let the base class do its thing
@@ -4026,7 +4322,7 @@ class AnnexJsonProtocol(WitlessProtocol):
         if self._unprocessed:
             lgr.error(
                 "%d bytes of received undecodable JSON output remain: %s",
-                len(self._unprocessed), self._unprocessed
+                len(self._unprocessed), bytes(self._unprocessed)
             )
         super().process_exited()
 
@@ -4108,15 +4404,26 @@ class BatchedAnnex(BatchedCommand):
             output_proc=output_proc)
 
 
+# Batched annex processes of all repositories, shared by all AnnexRepo
+# instances of a repository while it is in use
+batched_annexes_pool = BatchedCommandPool()
+
+
 # TODO: Why was this commented out?
 # @auto_repr
 class BatchedAnnexes(SafeDelCloseMixin, dict):
     """Class to contain the registry of active batch'ed instances of annex for
     a repository
+
+    If the `path` of the repository is given, the instances are taken from,
+    and registered in the process-wide `batched_annexes_pool`. Hence,
+    processes are reused by all instances for the same repository, e.g. when
+    an operation revisits a subdataset.
     """
-    def __init__(self, batch_size=0, git_options=None):
+    def __init__(self, batch_size=0, git_options=None, path=None):
         self.batch_size = batch_size
         self.git_options = git_options or []
+        self.path = path
         super(BatchedAnnexes, self).__init__()
 
     def get(self, codename, annex_cmd=None, **kwargs) -> BatchedAnnex:
@@ -4139,17 +4446,25 @@ class BatchedAnnexes(SafeDelCloseMixin, dict):
             codename += ':{0}:{1}'.format(key, options[key])
         # END RF/BF
 
-        if codename not in self:
+        def create():
             # Create a new git-annex process we will keep around
-            self[codename] = BatchedAnnex(annex_cmd,
-                                          git_options=git_options,
-                                          **kwargs)
+            return BatchedAnnex(annex_cmd, git_options=git_options, **kwargs)
+
+        if self.path is None:
+            if codename not in self:
+                self[codename] = create()
+        else:
+            self[codename] = batched_annexes_pool.get(
+                str(self.path), codename, create)
         return self[codename]
 
     def clear(self):
         """Override just to make sure we don't rely on __del__ to close all
         the pipes"""
         self.close()
+        if self.path is not None:
+            for codename in self:
+                batched_annexes_pool.remove(str(self.path), codename)
         super(BatchedAnnexes, self).clear()
 
     def close(self):
@@ -4160,6 +4475,17 @@ class BatchedAnnexes(SafeDelCloseMixin, dict):
         for p in self.values():
             p.close()
 
+    def release(self):
+        """Give up the batched annexes, when the repository is no longer used
+
+        All processes are closed, to let them flush any pending changes, and
+        removed from the pool. Processes of other repositories that went idle
+        are closed, too.
+        """
+        self.clear()
+        if self.path is not None:
+            batched_annexes_pool.evict()
+
 
 def readlines_until_ok_or_failed(stdout, maxlines=100):
     """Read stdout until line ends with ok or failed"""
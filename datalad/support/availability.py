@@ -0,0 +1,153 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Table of the locations of annexed keys, for bulk availability queries
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+
+
+def whereis_uuids(record: dict) -> Iterator[str]:
+    """Yield the UUIDs of all locations in a `git annex whereis` record
+
+    Both trusted and untrusted locations are reported.
+    """
+    for field in ('whereis', 'untrusted'):
+        for loc in record.get(field) or []:
+            yield loc['uuid']
+
+
+class KeyAvailability:
+    """Locations of annexed keys, as a keys x annexes presence table
+
+    Each row is a single integer bitmap, with bit `i` set if the annex
+    `uuids[i]` has a copy of the key. This is much more compact than a
+    per-key dictionary of location records, and queries over all keys only
+    need integer operations.
+
+    Rows can be added one at a time with `add()`, or from git-annex whereis
+    records with `from_whereis_records()`.
+    """
+    def __init__(self):
+        # columns: annex UUIDs, and their bit position
+        self.uuids: list[str] = []
+        self._columns: dict[str, int] = {}
+        # rows: keys, their presence bitmaps, and the row of each key
+        self.keys: list[str] = []
+        self.presence: list[int] = []
+        self._rows: dict[str, int] = {}
+
+    @classmethod
+    def from_whereis_records(
+            cls, records: Iterable[dict]) -> KeyAvailability:
+        """Build a table from `git annex whereis --json` records
+
+        Records without a key (e.g. for files that are not annexed) are
+        skipped.
+        """
+        table = cls()
+        for record in records:
+            key = record.get('key')
+            if not key:
+                continue
+            table.add(key, whereis_uuids(record))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, key: str, uuids: Iterable[str]):
+        """Record the UUIDs of the annexes that have a copy of `key`
+
+        Locations are added to those already recorded for the key.
+        """
+        mask = self.mask(uuids, add=True)
+        row = self._rows.get(key)
+        if row is None:
+            self._rows[key] = len(self.keys)
+            self.keys.append(key)
+            self.presence.append(mask)
+        else:
+            self.presence[row] |= mask
+
+    def mask(self, uuids: Iterable[str], add: bool = False) -> int:
+        """Get the bitmap of a set of annexes
+
+        Parameters
+        ----------
+        uuids: iterable
+          UUIDs of the annexes.
+        add: bool, optional
+          Whether to add unknown UUIDs as columns of the table. If not, they
+          are ignored.
+        """
+        mask = 0
+        for uuid in uuids:
+            column = self._columns.get(uuid)
+            if column is None:
+                if not add:
+                    continue
+                column = self._columns[uuid] = len(self.uuids)
+                self.uuids.append(uuid)
+            mask |= 1 << column
+        return mask
+
+    def locations(self, key: str) -> list[str]:
+        """Get the UUIDs of the annexes that have a copy of `key`"""
+        presence = self.presence[self._rows[key]]
+        return [uuid for i, uuid in enumerate(self.uuids)
+                if presence >> i & 1]
+
+    def copies(self, exclude: Iterable[str] = ()) -> list[int]:
+        """Get the number of copies of each key, in the order of `keys`
+
+        Parameters
+        ----------
+        exclude: iterable, optional
+          UUIDs of annexes whose copies do not count, e.g. untrusted ones.
+        """
+        keep = ~self.mask(exclude)
+        return [(presence & keep).bit_count() for presence in self.presence]
+
+    def with_fewer_copies(self,
+                          n: int,
+                          exclude: Iterable[str] = ()) -> Iterator[str]:
+        """Yield all keys with less than `n` copies
+
+        Parameters
+        ----------
+        n: int
+          Number of copies, e.g. the value of `annex.numcopies`.
+        exclude: iterable, optional
+          UUIDs of annexes whose copies do not count.
+        """
+        return (key for key, copies in zip(self.keys, self.copies(exclude))
+                if copies < n)
+
+    def only_at(self, uuids: Iterable[str]) -> Iterator[str]:
+        """Yield all keys that have copies, but only in the given annexes
+
+        For example, `only_at([repo.uuid])` yields the keys with no copy
+        anywhere else but in the local annex.
+        """
+        other = ~self.mask(uuids)
+        return (key for key, presence in zip(self.keys, self.presence)
+                if presence and not presence & other)
+
+    def nowhere(self) -> Iterator[str]:
+        """Yield all keys without any known copy"""
+        return (key for key, presence in zip(self.keys, self.presence)
+                if not presence)
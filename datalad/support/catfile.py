@@ -0,0 +1,225 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Read Git objects via persistent `git cat-file --batch` processes
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+from pathlib import Path
+from typing import (
+    Any,
+    NamedTuple,
+    Optional,
+)
+from weakref import finalize
+
+from datalad.cmd import (
+    BatchedCommand,
+    BatchedCommandProtocol,
+)
+from datalad.runner.nonasyncrunner import STDOUT_FILENO
+
+lgr = logging.getLogger('datalad.support.catfile')
+
+
+class CatFileObject(NamedTuple):
+    """Git object as reported by `git cat-file`"""
+    sha: str
+    type: str
+    size: int
+    # object content, None if only the object type and size were requested
+    data: Optional[memoryview]
+
+
+class _CatFileProtocol(BatchedCommandProtocol):
+    """Split the output of `git cat-file --batch[-check]` into objects
+
+    Each object, or None for a missing object, is a single response.
+    Standard error is collected by `BatchedCommand`.
+    """
+    def __init__(self,
+                 batched_command: _CatFileProcess,
+                 done_future: Any = None,
+                 encoding: Optional[str] = None,
+                 output_proc: Optional[Any] = None,
+                 ):
+        super().__init__(batched_command, done_future, encoding, output_proc)
+        self.check = batched_command.check
+        self.buffer = bytearray()
+
+    def pipe_data_received(self, fd: int, data: bytes):
+        if fd != STDOUT_FILENO:
+            super().pipe_data_received(fd, data)
+            return
+        buffer = self.buffer
+        buffer += data
+        while True:
+            header_end = buffer.find(b'\n')
+            if header_end < 0:
+                return
+            header = bytes(buffer[:header_end])
+            if header.endswith((b' missing', b' ambiguous')):
+                del buffer[:header_end + 1]
+                self.send_result((STDOUT_FILENO, None))
+                continue
+            sha, obj_type, size = header.decode().split()
+            size = int(size)
+            data = None
+            if self.check:
+                del buffer[:header_end + 1]
+            else:
+                # every object is terminated by a newline
+                data_end = header_end + 1 + size
+                if len(buffer) <= data_end:
+                    return
+                # the slice is the only copy of the payload
+                data = memoryview(buffer[header_end + 1:data_end])
+                del buffer[:data_end + 1]
+            self.send_result(
+                (STDOUT_FILENO, CatFileObject(sha, obj_type, size, data)))
+
+    def pipe_connection_lost(self, fd: int, exc: Optional[BaseException]):
+        if fd == STDOUT_FILENO and self.buffer:
+            lgr.debug('incomplete git cat-file output: %d bytes',
+                      len(self.buffer))
+
+
+class _CatFileProcess(BatchedCommand):
+    """A single `git cat-file --batch[-check]` process"""
+    protocol_class = _CatFileProtocol
+
+    def __init__(self, path: Path, check: bool):
+        self.check = check
+        super().__init__(
+            ['git', 'cat-file', '--batch-check' if check else '--batch'],
+            path=str(path))
+
+    def _send_request(self, request: str):
+        if '\n' in request:
+            raise ValueError(
+                f'object name must not contain a newline: {request!r}')
+        super()._send_request(request)
+
+    def _receive_response(self) -> Optional[CatFileObject]:
+        # the protocol reports complete objects
+        return self.get_one_line()
+
+
+def _close_processes(processes: list[_CatFileProcess]):
+    for process in processes:
+        process.close()
+    processes.clear()
+
+
+class CatFileService:
+    """Read objects of a Git repository via persistent `git cat-file` processes
+
+    Processes are started on demand, and kept for later requests. Each
+    process serves one request at a time, concurrent requests from multiple
+    threads are served by up to `max_processes` processes for object content,
+    and as many for object types and sizes.
+
+    Object names can be anything `git cat-file` understands, e.g. a SHA, or
+    `<ref>:<path>`.
+    """
+    # maximum number of processes of each kind
+    max_processes = 4
+    # maximum number of requests that are sent ahead of reading responses
+    pipeline_window = 100
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._condition = threading.Condition()
+        # all processes, and processes that are not serving a request, by
+        # kind (i.e. check or not)
+        self._processes: list[_CatFileProcess] = []
+        self._idle: dict[bool, list[_CatFileProcess]] = {True: [], False: []}
+        self._finalizer = finalize(self, _close_processes, self._processes)
+
+    def read(self, obj: str) -> Optional[CatFileObject]:
+        """Read type, size, and content of an object
+
+        Returns
+        -------
+        CatFileObject or None
+          None, if the object does not exist.
+        """
+        return list(self.read_many([obj]))[0]
+
+    def read_many(self,
+                  objs: Iterable[str]) -> Iterator[Optional[CatFileObject]]:
+        """Read type, size, and content of objects
+
+        Requests are pipelined through a single process.
+
+        Yields
+        ------
+        CatFileObject or None
+          For each object in `objs`, in order. None, if the object does not
+          exist.
+        """
+        return self._map(objs, check=False)
+
+    def check(self, obj: str) -> Optional[CatFileObject]:
+        """Read type and size of an object
+
+        Returns
+        -------
+        CatFileObject or None
+          With `data` set to None. None, if the object does not exist.
+        """
+        return list(self.check_many([obj]))[0]
+
+    def check_many(self,
+                   objs: Iterable[str]) -> Iterator[Optional[CatFileObject]]:
+        """Read type and size of objects, see `read_many()`"""
+        return self._map(objs, check=True)
+
+    def close(self):
+        """Terminate all processes"""
+        with self._condition:
+            self._idle[True].clear()
+            self._idle[False].clear()
+            _close_processes(self._processes)
+
+    def _map(self,
+             objs: Iterable[str],
+             check: bool) -> Iterator[Optional[CatFileObject]]:
+        process = self._acquire(check)
+        try:
+            # a process that is left with unanswered requests, or that
+            # failed, is closed by map(), and restarted on the next request
+            yield from process.map(objs, window=self.pipeline_window)
+        finally:
+            self._release(process)
+
+    def _acquire(self, check: bool) -> _CatFileProcess:
+        with self._condition:
+            while not self._idle[check] and sum(
+                    p.check is check for p in self._processes) \
+                    >= self.max_processes:
+                self._condition.wait()
+            if self._idle[check]:
+                return self._idle[check].pop()
+            lgr.debug('Starting git cat-file process for %s', self.path)
+            process = _CatFileProcess(self.path, check)
+            self._processes.append(process)
+            return process
+
+    def _release(self, process: _CatFileProcess):
+        with self._condition:
+            if process in self._processes:
+                self._idle[process.check].append(process)
+            self._condition.notify()
@@ -0,0 +1,527 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Helpers for (cached) content info reports of Git repositories
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from hashlib import sha1
+from collections.abc import (
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from typing import (
+    Any,
+    Optional,
+    TypeVar,
+)
+
+from datalad.utils import (
+    Path,
+    PurePosixPath,
+    ensure_dir,
+    on_windows,
+)
+
+lgr = logging.getLogger('datalad.support.content_info')
+
+# a parsed report on a single item, as produced by `git ls-files` or
+# `git ls-tree -l`: (POSIX path relative to the repository root, type label,
+# gitshasum (None for untracked content), bytesize (only for files in trees,
+# None otherwise))
+ContentInfoItem = tuple[str, str, Optional[str], Optional[int]]
+
+_hexsha_re = re.compile(r'^([0-9a-f]{40}|[0-9a-f]{64})$')
+
+V = TypeVar('V')
+
+
+def is_full_hexsha(ref: str) -> bool:
+    """Whether `ref` is a full (SHA1 or SHA256) object ID"""
+    return _hexsha_re.match(ref) is not None
+
+
+def item_to_props(item: ContentInfoItem) -> dict[str, str | int | None]:
+    """Convert a content info item into a get_content_info() property dict"""
+    _, type_, sha, size = item
+    props: dict[str, str | int | None] = {'gitshasum': sha, 'type': type_}
+    if size is not None:
+        props['bytesize'] = size
+    return props
+
+
+class ContentInfoRecord(Mapping):
+    """Read-only, dict-compatible view of a single `ContentInfoTable` row
+
+    The properties are those of a get_content_info() report: `gitshasum`,
+    `type`, and `bytesize` (if known).
+    """
+    __slots__ = ('_table', '_idx')
+
+    def __init__(self, table: ContentInfoTable, idx: int) -> None:
+        self._table = table
+        self._idx = idx
+
+    def __getitem__(self, key: str) -> Any:
+        table = self._table
+        if key == 'type':
+            return table._labels[table._types[self._idx] & 0x7f]
+        elif key == 'gitshasum':
+            return table._get_sha(self._idx)
+        elif key == 'bytesize':
+            size = table._sizes[self._idx]
+            if size >= 0:
+                return size
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'gitshasum'
+        yield 'type'
+        if self._table._sizes[self._idx] >= 0:
+            yield 'bytesize'
+
+    def __len__(self) -> int:
+        return 3 if self._table._sizes[self._idx] >= 0 else 2
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+
+class ContentInfoTable(Mapping):
+    """Compact, column-oriented table of content info reports
+
+    This is a memory-efficient alternative to the `dict` returned by
+    get_content_info(), with a compatible read API: it maps absolute `Path`
+    instances to (read-only) dict-compatible `ContentInfoRecord` views.
+
+    Internally, paths are stored as POSIX paths relative to the repository
+    root, and `Path` instances are only created when keys are iterated over.
+    Any other property is stored in a packed, per-column format (type label
+    index, binary SHA, size). The `*_rel()` methods can be used to access
+    records by their relative path directly.
+    """
+    def __init__(self, root: Path, items: Optional[Iterable[ContentInfoItem]] = None) -> None:
+        self.root = root
+        self._root_prefix = str(root) + os.sep
+        self._relpaths: list[str] = []
+        self._index: dict[str, int] = {}
+        # type label index per row, the high bit marks untracked content
+        self._types = bytearray()
+        self._labels: list[str] = []
+        self._label_idx: dict[str, int] = {}
+        # binary SHAs of all rows, concatenated
+        self._shas = bytearray()
+        self._sha_len: Optional[int] = None
+        # -1 means no known size
+        self._sizes = array('q')
+        if items is not None:
+            self.extend(items)
+
+    def extend(self, items: Iterable[ContentInfoItem]) -> None:
+        """Add items to the table
+
+        Items with a relative path that is already known replace the
+        existing record (like a repeated assignment to a `dict` would).
+        """
+        relpaths = self._relpaths
+        index = self._index
+        for relpath, type_, sha, size in items:
+            # Git reports untracked directories with a trailing slash
+            relpath = relpath.rstrip('/')
+            type_code = self._label_idx.get(type_)
+            if type_code is None:
+                type_code = self._add_label(type_)
+            if sha is None:
+                type_code |= 0x80
+                bsha = b''
+            else:
+                bsha = bytes.fromhex(sha)
+            if self._sha_len is None and bsha:
+                self._sha_len = len(bsha)
+                # pad any untracked rows seen so far
+                self._shas = bytearray(self._sha_len * len(relpaths))
+            if self._sha_len is not None:
+                bsha = bsha or bytes(self._sha_len)
+            idx = index.get(relpath)
+            if idx is None:
+                index[relpath] = len(relpaths)
+                relpaths.append(relpath)
+                self._types.append(type_code)
+                self._shas += bsha
+                self._sizes.append(-1 if size is None else size)
+            else:
+                self._types[idx] = type_code
+                if self._sha_len:
+                    self._shas[idx * self._sha_len:(idx + 1) * self._sha_len] = bsha
+                self._sizes[idx] = -1 if size is None else size
+
+    def _add_label(self, label: str) -> int:
+        if len(self._labels) >= 0x7f:
+            raise ValueError('Too many distinct type labels')
+        code = len(self._labels)
+        self._labels.append(sys.intern(label))
+        self._label_idx[label] = code
+        return code
+
+    def _get_sha(self, idx: int) -> Optional[str]:
+        if self._types[idx] & 0x80 or not self._sha_len:
+            return None
+        return self._shas[idx * self._sha_len:(idx + 1) * self._sha_len].hex()
+
+    def _get_relpath(self, path: Any) -> Optional[str]:
+        path = str(path)
+        if not path.startswith(self._root_prefix):
+            return None
+        relpath = path[len(self._root_prefix):]
+        return relpath.replace(os.sep, '/') if on_windows else relpath
+
+    def _to_path(self, relpath: str) -> Path:
+        return self.root.joinpath(PurePosixPath(relpath))
+
+    def __getitem__(self, path: Any) -> ContentInfoRecord:
+        idx = self._index.get(self._get_relpath(path))  # type: ignore[arg-type]
+        if idx is None:
+            raise KeyError(path)
+        return ContentInfoRecord(self, idx)
+
+    def __contains__(self, path: Any) -> bool:
+        return self._get_relpath(path) in self._index
+
+    def __iter__(self) -> Iterator[Path]:
+        return (self._to_path(p) for p in self._relpaths)
+
+    def __len__(self) -> int:
+        return len(self._relpaths)
+
+    def __repr__(self) -> str:
+        return '{}({!r}, {} items)'.format(
+            self.__class__.__name__, self.root, len(self))
+
+    def get_rel(self, relpath: str, default: Any = None) -> Any:
+        """Return the record for a relative POSIX path, or `default`"""
+        idx = self._index.get(relpath)
+        return default if idx is None else ContentInfoRecord(self, idx)
+
+    def contains_rel(self, relpath: str) -> bool:
+        """Whether there is a record for a relative POSIX path"""
+        return relpath in self._index
+
+    def items_rel(self) -> Iterator[tuple[str, ContentInfoRecord]]:
+        """Iterate over (relative POSIX path, record) items"""
+        return ((p, ContentInfoRecord(self, i))
+                for i, p in enumerate(self._relpaths))
+
+    def to_dict(self) -> dict[Path, dict[str, Any]]:
+        """Return the report in the format of get_content_info()"""
+        return {self._to_path(p): dict(r) for p, r in self.items_rel()}
+
+
+class ContentInfoCache:
+    """Persistent cache for the Git-reported part of content info reports
+
+    The cache is stored in ``.git/datalad/cache/content-info``. It holds two
+    kinds of reports:
+
+    - the report on the Git index (``git ls-files --stage``). It is stored
+      together with a fingerprint of the index file (inode, size, mtime and
+      ctime) and the content of ``HEAD``, and a digest of the index entries
+      without their stat data. If the fingerprint does not match, but the
+      digest does (e.g. Git only refreshed the stat data or its untracked
+      cache), the report remains valid. Any other change of the index,
+      which is the sole source of this report, invalidates it.
+    - reports on trees (``git ls-tree``), stored under the SHA of the tree
+      or commit they describe. Those are immutable, hence never invalidated,
+      but only the ``max_trees`` most recently used ones are kept.
+
+    Reports on untracked content are never cached, as they depend on the
+    state of the worktree.
+
+    Any error on reading or writing the cache is logged and otherwise
+    ignored -- a failing cache is equivalent to an empty one.
+    """
+    # bumped whenever the format of a cache file changes
+    _format_version = 2
+
+    def __init__(self, dot_git: Path, max_trees: int = 8) -> None:
+        self._dot_git = dot_git
+        self.path = dot_git / 'datalad' / 'cache' / 'content-info'
+        self.max_trees = max_trees
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(self.__class__.__name__, self.path)
+
+    def get_index_fingerprint(self) -> Optional[tuple]:
+        """Return a fingerprint of the current state of the Git index
+
+        Returns None if no fingerprint could be determined.
+        """
+        try:
+            head = (self._dot_git / 'HEAD').read_text()
+        except OSError:
+            return None
+        try:
+            st = (self._dot_git / 'index').stat()
+        except FileNotFoundError:
+            # no index (yet), this is a valid state too
+            return (head,)
+        except OSError:
+            return None
+        return (head, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+    def get_index(self, fingerprint: Optional[tuple]) -> Optional[list[ContentInfoItem]]:
+        """Return the cached index report, if it matches `fingerprint`"""
+        if fingerprint is None:
+            return None
+        cached = self._load(self.path / 'index')
+        if cached is None:
+            return None
+        cached_fingerprint, digest, records = cached
+        if cached_fingerprint == fingerprint:
+            return records
+        if digest is None or cached_fingerprint[0] != fingerprint[0] \
+                or digest != self._get_index_digest(fingerprint, records):
+            return None
+        # the index file was rewritten, but its entries are unchanged
+        self._dump(self.path / 'index', (fingerprint, digest, records))
+        return records
+
+    def set_index(self, fingerprint: Optional[tuple], records: list[ContentInfoItem]) -> None:
+        """Store the index report for a given index `fingerprint`"""
+        if fingerprint is None:
+            return
+        self._dump(
+            self.path / 'index',
+            (fingerprint, self._get_index_digest(fingerprint, records),
+             records))
+
+    def _get_index_digest(self, fingerprint: tuple, records: list[ContentInfoItem]) -> Optional[bytes]:
+        """Return a digest of the index entries, see get_index_digest()
+
+        Returns None, if the index file does not match `fingerprint`
+        (anymore), or no digest could be determined.
+        """
+        if len(fingerprint) < 2:
+            return None
+        # the length of binary object IDs in the index
+        hash_len = len(records[0][2]) // 2 if records and records[0][2] \
+            else 20
+        try:
+            with (self._dot_git / 'index').open('rb') as f:
+                st = os.fstat(f.fileno())
+                if (st.st_ino, st.st_size, st.st_mtime_ns,
+                        st.st_ctime_ns) != fingerprint[1:]:
+                    return None
+                data = f.read()
+        except OSError:
+            return None
+        return get_index_digest(data, hash_len)
+
+    def get_tree(self, sha: str) -> Optional[list[ContentInfoItem]]:
+        """Return the cached report for a tree(-ish) with the given SHA"""
+        fpath = self.path / 'tree-{}'.format(sha)
+        cached = self._load(fpath)
+        if cached is None:
+            return None
+        try:
+            # mark as recently used, pruning is based on it
+            os.utime(fpath)
+        except OSError:
+            pass
+        return cached
+
+    def set_tree(self, sha: str, records: list[ContentInfoItem]) -> None:
+        """Store the report for a tree(-ish) with the given SHA"""
+        if self._dump(self.path / 'tree-{}'.format(sha), records):
+            self._prune_trees()
+
+    def clear(self) -> None:
+        """Remove all cached reports"""
+        if not self.path.exists():
+            return
+        for f in self.path.iterdir():
+            try:
+                f.unlink()
+            except OSError as e:
+                lgr.debug('Could not remove content info cache file %s: %s',
+                          f, e)
+
+    def _prune_trees(self) -> None:
+        try:
+            trees = sorted(
+                self.path.glob('tree-*'),
+                key=lambda p: p.stat().st_mtime_ns,
+                reverse=True)
+            for f in trees[self.max_trees:]:
+                f.unlink()
+        except OSError as e:
+            lgr.debug('Could not prune content info cache %s: %s', self, e)
+
+    def _load(self, fpath: Path) -> Any:
+        try:
+            with fpath.open('rb') as f:
+                version, payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            lgr.debug('Ignoring unreadable content info cache file %s: %s',
+                      fpath, e)
+            return None
+        if version != self._format_version:
+            return None
+        return payload
+
+    def _dump(self, fpath: Path, payload: Any) -> bool:
+        try:
+            ensure_dir(str(self.path))
+            # write to a temporary file and move it in place, in order to
+            # never expose a partially written cache file to a concurrent
+            # reader
+            fd, tmp = tempfile.mkstemp(dir=str(self.path), prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((self._format_version, payload), f,
+                                pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, fpath)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            lgr.debug('Could not write content info cache file %s: %s',
+                      fpath, e)
+            return False
+        return True
+
+
+def get_index_digest(data: bytes, hash_len: int = 20) -> Optional[bytes]:
+    """Return a digest of the entries of a Git index file
+
+    Only the mode, object ID, flags, and path of each entry are considered,
+    but not their stat data, or any index extension (like the untracked
+    cache). Git updates those in the course of read-only operations like
+    `git status`, without a change of what `git ls-files --stage` reports.
+
+    Parameters
+    ----------
+    data : bytes
+      Content of an index file (format version 2, 3, or 4).
+    hash_len : int
+      Length of a binary object ID (20 for SHA1, 32 for SHA256).
+
+    Returns
+    -------
+    bytes or None
+      None, if the index format is not supported, or the entries are stored
+      in a shared index file (split index).
+    """
+    if data[:4] != b'DIRC':
+        return None
+    try:
+        version, n_entries = struct.unpack_from('>II', data, 4)
+        if version not in (2, 3, 4):
+            return None
+        digest = sha1()
+        view = memoryview(data)
+        pos = 12
+        for _ in range(n_entries):
+            # skip ctime, mtime, dev, and ino, but not the mode
+            digest.update(view[pos + 24:pos + 28])
+            flags_pos = pos + 40 + hash_len
+            (flags,) = struct.unpack_from('>H', data, flags_pos)
+            name_pos = flags_pos + 2
+            if version > 2 and flags & 0x4000:
+                # extended flags
+                name_pos += 2
+            if version == 4:
+                # skip the (variable-length) number of bytes to remove
+                # from the path of the previous entry
+                while data[name_pos] & 0x80:
+                    name_pos += 1
+                end = data.index(b'\0', name_pos + 1) + 1
+            else:
+                end = data.index(b'\0', name_pos)
+                # entries are NUL-padded to a multiple of eight bytes
+                end = pos + ((end - pos) // 8 + 1) * 8
+            # skip uid, gid, and size too
+            digest.update(view[pos + 40:end])
+            pos = end
+        # extensions follow, up to the trailing checksum
+        while pos + 8 <= len(data) - hash_len:
+            sig = data[pos:pos + 4]
+            if sig == b'link':
+                return None
+            (size,) = struct.unpack_from('>I', data, pos + 4)
+            pos += 8 + size
+    except (struct.error, ValueError, IndexError):
+        return None
+    return digest.digest()
+
+
+def unique_sorted_(items: Iterable[tuple[str, V]]) -> Iterator[tuple[str, V]]:
+    """Collapse consecutive items with identical keys in a sorted stream
+
+    Parameters
+    ----------
+    items : iterable
+      (key, value) tuples, sorted by key.
+
+    Yields
+    ------
+    tuple
+      (key, value), where for any key only the last reported value is
+      yielded.
+    """
+    prev = None
+    for item in items:
+        if prev is not None and prev[0] != item[0]:
+            yield prev
+        prev = item
+    if prev is not None:
+        yield prev
+
+
+def merge_join_sorted_(left: Iterable[tuple[str, V]], right: Iterable[tuple[str, V]]) -> Iterator[tuple[str, Optional[V], Optional[V]]]:
+    """Full outer join of two streams of (key, value) items, sorted by key
+
+    Keys must be unique within each stream.
+
+    Yields
+    ------
+    tuple
+      (key, left value, right value) in key order. A value is None when
+      the key is not present in the respective stream.
+    """
+    lit = iter(left)
+    rit = iter(right)
+    litem = next(lit, None)
+    ritem = next(rit, None)
+    while litem is not None or ritem is not None:
+        if ritem is None or (litem is not None and litem[0] < ritem[0]):
+            assert litem is not None
+            yield litem[0], litem[1], None
+            litem = next(lit, None)
+        elif litem is None or ritem[0] < litem[0]:
+            yield ritem[0], None, ritem[1]
+            ritem = next(rit, None)
+        else:
+            yield litem[0], litem[1], ritem[1]
+            litem = next(lit, None)
+            ritem = next(rit, None)
@@ -0,0 +1,1109 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""In-process reader and writer for Git configuration
+
+This reader implements the syntax of Git's configuration files, and the
+logic of Git for determining the files that make up the configuration of a
+repository, including (conditional) includes. It makes it possible to read
+configuration without a `git config` call. Likewise, a sequence of
+modifications can be applied to a configuration file with a single write.
+Any construct that is not supported raises `UnsupportedGitConfig`, and
+callers are expected to fall back on `git config` in this case.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Optional,
+    Union,
+)
+
+from datalad.runner import (
+    CommandError,
+    GitRunner,
+    StdOutErrCapture,
+)
+
+lgr = logging.getLogger('datalad.support.gitconfig')
+
+# like Git
+_MAX_INCLUDE_DEPTH = 10
+# whitespace as defined by Git's isspace()
+_SPACE = ' \t\n\r'
+
+_unreadable_file_regex = re.compile(r"unable to read config file '(.+)'")
+
+GitConfigValue = Union[Optional[str], tuple[Optional[str], ...]]
+
+
+class UnsupportedGitConfig(Exception):
+    """Configuration that can only be read by `git config`"""
+
+
+def _iskeychar(c: str) -> bool:
+    return c == '-' or (c.isascii() and c.isalnum())
+
+
+class _GitConfigParser:
+    """Port of the configuration file parser of Git (config.c)"""
+
+    def __init__(self, text: str) -> None:
+        # a UTF-8 byte order mark is skipped, like by Git
+        self._text = text[1:] if text.startswith('\ufeff') else text
+        self._pos = 0
+        self._eof = False
+        self.linenr = 1
+
+    def _next_char(self) -> str:
+        text = self._text
+        pos = self._pos
+        if pos >= len(text):
+            self._eof = True
+            return '\n'
+        c = text[pos]
+        self._pos = pos + 1
+        if c == '\r' and text.startswith('\n', pos + 1):
+            c = '\n'
+            self._pos += 1
+        if c == '\n':
+            self.linenr += 1
+        return c
+
+    def _error(self) -> ValueError:
+        return ValueError('bad config line {}'.format(self.linenr))
+
+    def parse_(self) -> Iterator[tuple[str, Optional[str]]]:
+        comment = False
+        section = None
+        while True:
+            c = self._next_char()
+            if c == '\n':
+                if self._eof:
+                    return
+                comment = False
+                continue
+            if comment or c in _SPACE:
+                continue
+            if c in '#;':
+                comment = True
+                continue
+            if c == '[':
+                section = self._get_section()
+                continue
+            if section is None or not (c.isascii() and c.isalpha()):
+                raise self._error()
+            yield self._get_item(section, c)
+
+    def segments_(self) -> Iterator[tuple[str, str, int, int]]:
+        """Locate the declarations of sections and items
+
+        Yields
+        ------
+        tuple
+          Kind ('section' or 'item'), name (like the section prefix or key
+          yielded by parse_()), and the start and end offset of the lines
+          making up the declaration.
+
+        Raises
+        ------
+        UnsupportedGitConfig
+          If a line declares more than one section or item.
+        """
+        comment = busy = False
+        section = header = None
+        line_start = 0
+        while True:
+            c = self._next_char()
+            if c == '\n':
+                if header is not None:
+                    yield header + (self._pos,)
+                    header = None
+                if self._eof:
+                    return
+                comment = busy = False
+                line_start = self._pos
+                continue
+            if comment or c in _SPACE:
+                continue
+            if c in '#;':
+                comment = True
+                continue
+            if busy:
+                raise UnsupportedGitConfig(
+                    'multiple declarations in line {}'.format(self.linenr))
+            busy = True
+            if c == '[':
+                section = self._get_section()
+                header = ('section', section, line_start)
+                continue
+            if section is None or not (c.isascii() and c.isalpha()):
+                raise self._error()
+            key = self._get_item(section, c)[0]
+            # the item includes the end of its (last) line
+            yield 'item', key, line_start, self._pos
+            busy = False
+            line_start = self._pos
+
+    def _get_section(self) -> str:
+        name = []
+        while True:
+            c = self._next_char()
+            if self._eof:
+                raise self._error()
+            if c == ']':
+                break
+            if c in _SPACE:
+                return self._get_subsection(''.join(name), c)
+            if not _iskeychar(c) and c != '.':
+                raise self._error()
+            name.append(c.lower())
+        if not name:
+            raise self._error()
+        return ''.join(name) + '.'
+
+    def _get_subsection(self, name: str, c: str) -> str:
+        # format: [section "subsection"]
+        while True:
+            if c == '\n':
+                raise self._error()
+            c = self._next_char()
+            if c not in _SPACE:
+                break
+        if c != '"':
+            raise self._error()
+        subsection = []
+        while True:
+            c = self._next_char()
+            if c == '\n':
+                raise self._error()
+            if c == '"':
+                break
+            if c == '\\':
+                c = self._next_char()
+                if c == '\n':
+                    raise self._error()
+            subsection.append(c)
+        if self._next_char() != ']' or not name:
+            raise self._error()
+        return '{}.{}.'.format(name, ''.join(subsection))
+
+    def _get_item(self, section: str, c: str) -> tuple[str, Optional[str]]:
+        name = [c.lower()]
+        while True:
+            c = self._next_char()
+            if self._eof or not _iskeychar(c):
+                break
+            name.append(c.lower())
+        while c in ' \t':
+            c = self._next_char()
+        value = None
+        if c != '\n':
+            if c != '=':
+                raise self._error()
+            value = self._get_value()
+        return section + ''.join(name), value
+
+    def _get_value(self) -> str:
+        value = []
+        quote = comment = False
+        space = 0
+        while True:
+            c = self._next_char()
+            if c == '\n':
+                if quote:
+                    raise self._error()
+                return ''.join(value)
+            if comment:
+                continue
+            if c in _SPACE and not quote:
+                if value:
+                    space += 1
+                continue
+            if not quote and c in '#;':
+                comment = True
+                continue
+            if space:
+                value.append(' ' * space)
+                space = 0
+            if c == '\\':
+                c = self._next_char()
+                if c == '\n':
+                    # line continuation
+                    continue
+                c = {'t': '\t', 'b': '\b', 'n': '\n',
+                     '\\': '\\', '"': '"'}.get(c)
+                if c is None:
+                    raise self._error()
+                value.append(c)
+                continue
+            if c == '"':
+                quote = not quote
+                continue
+            value.append(c)
+
+
+def parse_gitconfig(text: str) -> Iterator[tuple[str, Optional[str]]]:
+    """Parse the content of a Git configuration file
+
+    Includes are not processed.
+
+    Parameters
+    ----------
+    text : str
+
+    Yields
+    ------
+    tuple
+      Key (with lower-case section and variable name, but verbatim
+      subsection) and value of each configuration item, in the order of
+      declaration. The value is None for a variable without '=', which Git
+      considers a boolean true.
+
+    Raises
+    ------
+    ValueError
+      On invalid syntax.
+    """
+    return _GitConfigParser(text).parse_()
+
+
+def canonicalize_gitconfig_key(key: str) -> str:
+    """Normalize a configuration key given on the command line, like Git
+
+    Section and variable name are converted to lower-case, a subsection is
+    kept verbatim.
+
+    Raises
+    ------
+    ValueError
+      For an invalid key.
+    """
+    last_dot = key.rfind('.')
+    if last_dot < 1 or last_dot == len(key) - 1:
+        raise ValueError('invalid configuration key: {!r}'.format(key))
+    first_dot = key.index('.')
+    section, name = key[:first_dot], key[last_dot + 1:]
+    if not all(_iskeychar(c) for c in section + name) \
+            or not (name[0].isascii() and name[0].isalpha()) \
+            or '\n' in key:
+        raise ValueError('invalid configuration key: {!r}'.format(key))
+    return '{}{}{}'.format(
+        section.lower(), key[first_dot:last_dot + 1], name.lower())
+
+
+def _parse_gitconfig_parameters(env: str) -> Iterator[tuple[str, Optional[str]]]:
+    """Parse the value of GIT_CONFIG_PARAMETERS, like Git
+
+    Items are single-quoted, either as a 'key=value' pair or as separately
+    quoted 'key'='value'.
+    """
+    def _dequote_step(pos: int) -> tuple[str, int]:
+        # `pos` must point to an opening quote
+        if not env.startswith("'", pos):
+            raise ValueError('bogus format in GIT_CONFIG_PARAMETERS')
+        out = []
+        pos += 1
+        while True:
+            if pos >= len(env):
+                raise ValueError('bogus format in GIT_CONFIG_PARAMETERS')
+            c = env[pos]
+            pos += 1
+            if c != "'":
+                out.append(c)
+                continue
+            # we stepped out of the quotes, only an escaped quote or
+            # exclamation mark can resume them
+            if env.startswith('\\', pos) and pos + 2 < len(env) \
+                    and env[pos + 1] in "'!" and env[pos + 2] == "'":
+                out.append(env[pos + 1])
+                pos += 3
+                continue
+            return ''.join(out), pos
+
+    pos = 0
+    while pos < len(env):
+        key, pos = _dequote_step(pos)
+        if pos >= len(env) or env[pos] in _SPACE:
+            # old-style 'key=value'
+            key, sep, value = key.partition('=')
+            yield key, value if sep else None
+        elif env[pos] == '=':
+            # new-style 'key'='value'
+            pos += 1
+            if env.startswith("'", pos):
+                value, pos = _dequote_step(pos)
+                if pos < len(env) and env[pos] not in _SPACE:
+                    raise ValueError('bogus format in GIT_CONFIG_PARAMETERS')
+            elif pos >= len(env) or env[pos] in _SPACE:
+                value = None
+            else:
+                raise ValueError('bogus format in GIT_CONFIG_PARAMETERS')
+            yield key, value
+        else:
+            raise ValueError('bogus format in GIT_CONFIG_PARAMETERS')
+        while pos < len(env) and env[pos] in _SPACE:
+            pos += 1
+
+
+def wildmatch_to_regex(pattern: str, icase: bool = False) -> re.Pattern:
+    """Translate a Git wildmatch pattern (with WM_PATHNAME) to a regex
+
+    '*' and '?' do not match a '/', '**/' matches any number of leading
+    directories, and a trailing '/**' everything inside a directory.
+
+    Raises
+    ------
+    UnsupportedGitConfig
+      For a pattern with character class names (e.g. '[[:alpha:]]'), or a
+      malformed pattern.
+    """
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            j = i + 1
+            while j < n and pattern[j] == '*':
+                j += 1
+            if j - i > 1 and (i == 0 or pattern[i - 1] == '/') \
+                    and (j == n or pattern[j] == '/'):
+                if j == n:
+                    out.append('.*')
+                else:
+                    # any number of directories, including none
+                    out.append('(?:.*/)?')
+                    j += 1
+            else:
+                out.append('[^/]*')
+            i = j
+        elif c == '?':
+            out.append('[^/]')
+            i += 1
+        elif c == '[':
+            j = i + 1
+            negate = j < n and pattern[j] in '!^'
+            if negate:
+                j += 1
+            chars = []
+            first = True
+            while True:
+                if j >= n:
+                    raise UnsupportedGitConfig(
+                        'unterminated character class in {!r}'.format(
+                            pattern))
+                ch = pattern[j]
+                if ch == ']' and not first:
+                    break
+                first = False
+                if ch == '[' and pattern.startswith('[:', j):
+                    raise UnsupportedGitConfig(
+                        'character class name in {!r}'.format(pattern))
+                if ch == '\\' and j + 1 < n:
+                    j += 1
+                    ch = pattern[j]
+                if j + 2 < n and pattern[j + 1] == '-' \
+                        and pattern[j + 2] != ']':
+                    chars.append('{}-{}'.format(
+                        re.escape(ch), re.escape(pattern[j + 2])))
+                    j += 3
+                else:
+                    chars.append(re.escape(ch))
+                    j += 1
+            out.append('[^/{}]'.format(''.join(chars)) if negate
+                       else '(?!/)[{}]'.format(''.join(chars)))
+            i = j + 1
+        elif c == '\\':
+            if i + 1 >= n:
+                raise UnsupportedGitConfig(
+                    'trailing backslash in {!r}'.format(pattern))
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile('(?s:{})\\Z'.format(''.join(out)),
+                      flags=re.IGNORECASE if icase else 0)
+
+
+def _gitbool(value: Optional[str]) -> bool:
+    if value is None:
+        return True
+    v = value.lower()
+    if v in ('true', 'yes', 'on'):
+        return True
+    if v in ('', 'false', 'no', 'off'):
+        return False
+    try:
+        return int(v) != 0
+    except ValueError:
+        raise UnsupportedGitConfig(
+            'invalid boolean value {!r}'.format(value)) from None
+
+
+@lru_cache()
+def _get_default_system_gitconfig() -> Optional[Path]:
+    """Ask Git for the location of its system configuration file
+
+    This depends on how Git was built, hence a single `git config` call
+    is needed (once per process). Returns None if the location could not
+    be determined.
+    """
+    try:
+        out = GitRunner().run(
+            ['git', 'config', '--system', '--show-origin', '-z', '-l'],
+            protocol=StdOutErrCapture)
+    except CommandError as e:
+        # reading a non-existing file fails, but reveals the location
+        match = _unreadable_file_regex.search(e.stderr or '')
+        return Path(match.group(1)) if match else None
+    origin = out['stdout'].split('\0', 1)[0]
+    return Path(origin[5:]) if origin.startswith('file:') else None
+
+
+class GitConfigReader(object):
+    """Read Git configuration like `git config --list` does
+
+    Parameters
+    ----------
+    git_dir : Path, optional
+      Git directory of the repository to read the configuration of. Without
+      it, only the system, global and command line configuration can be
+      read, and all conditional includes based on a repository do not
+      apply.
+    """
+    scopes = ('system', 'global', 'local', 'worktree', 'command')
+
+    def __init__(self, git_dir: Optional[Path] = None) -> None:
+        self._git_dir = git_dir
+        self._cfg: dict[str, GitConfigValue] = {}
+        self._files: set[Path] = set()
+        self._includes = True
+        self._depth = 0
+
+    def read(self, scopes: Optional[tuple[str, ...]] = None,
+             includes: bool = True) -> tuple[dict[str, GitConfigValue], set[Path]]:
+        """Read the configuration of the given scopes
+
+        Parameters
+        ----------
+        scopes : tuple, optional
+          Any of 'system', 'global', 'local', 'worktree', 'command'. By
+          default all, which is equivalent to `git config --list`.
+        includes : bool, optional
+          Whether to process include directives.
+
+        Returns
+        -------
+        dict, set
+          Like parse_gitconfig_dump(): configuration items (values of
+          multiply defined keys as a tuple), and the files they were read
+          from.
+
+        Raises
+        ------
+        UnsupportedGitConfig
+        """
+        self._cfg = {}
+        self._files = set()
+        self._includes = includes
+        env = os.environ
+        for var in ('GIT_CONFIG', 'GIT_DIR', 'GIT_COMMON_DIR'):
+            if var in env:
+                # the configuration files are determined differently
+                raise UnsupportedGitConfig('{} is set'.format(var))
+        for scope in self.scopes if scopes is None else scopes:
+            getattr(self, '_read_{}'.format(scope))()
+        return self._cfg, self._files
+
+    def read_file(self, path: Path, includes: bool = False) -> tuple[dict[str, GitConfigValue], set[Path]]:
+        """Read the configuration in a single file
+
+        Like `git config --file`, includes are not processed by default.
+        See read() for the return value.
+        """
+        self._cfg = {}
+        self._files = set()
+        self._includes = includes
+        self._read_file(path)
+        return self._cfg, self._files
+
+    def _read_system(self) -> None:
+        env = os.environ
+        if _gitbool(env.get('GIT_CONFIG_NOSYSTEM', 'false')):
+            return
+        if 'GIT_CONFIG_SYSTEM' in env:
+            path = Path(env['GIT_CONFIG_SYSTEM'])
+        else:
+            path = _get_default_system_gitconfig()
+            if path is None:
+                raise UnsupportedGitConfig(
+                    'unknown location of the system configuration')
+        self._read_file(path)
+
+    def _read_global(self) -> None:
+        env = os.environ
+        if 'GIT_CONFIG_GLOBAL' in env:
+            self._read_file(Path(env['GIT_CONFIG_GLOBAL']))
+            return
+        home = env.get('HOME')
+        xdg = env.get('XDG_CONFIG_HOME')
+        if xdg:
+            self._read_file(Path(xdg, 'git', 'config'))
+        elif home:
+            self._read_file(Path(home, '.config', 'git', 'config'))
+        if home:
+            self._read_file(Path(home, '.gitconfig'))
+
+    def _read_local(self) -> None:
+        common_dir = self._get_common_dir()
+        if common_dir is not None:
+            self._read_file(common_dir / 'config')
+
+    def _read_worktree(self) -> None:
+        common_dir = self._get_common_dir()
+        if common_dir is None:
+            return
+        # repository extensions are only honored in the common config
+        cfg = GitConfigReader(self._git_dir).read_file(
+            common_dir / 'config')[0]
+        value = cfg.get('extensions.worktreeconfig', 'false')
+        if _gitbool(value[-1] if isinstance(value, tuple) else value):
+            self._read_file(self._git_dir / 'config.worktree')
+
+    def _read_command(self) -> None:
+        env = os.environ
+        items = []
+        try:
+            count = int(env.get('GIT_CONFIG_COUNT', '0'))
+            for i in range(count):
+                items.append((env['GIT_CONFIG_KEY_{}'.format(i)],
+                              env['GIT_CONFIG_VALUE_{}'.format(i)]))
+            if 'GIT_CONFIG_PARAMETERS' in env:
+                items.extend(_parse_gitconfig_parameters(
+                    env['GIT_CONFIG_PARAMETERS']))
+            items = [(canonicalize_gitconfig_key(k), v) for k, v in items]
+        except (KeyError, ValueError) as e:
+            # git-config fails with a proper error message
+            raise UnsupportedGitConfig(str(e)) from e
+        for k, v in items:
+            self._add_item(k, v, None)
+
+    def _get_common_dir(self) -> Optional[Path]:
+        git_dir = self._git_dir
+        if git_dir is None:
+            return None
+        if not (git_dir / 'HEAD').exists():
+            # Git would discover a different repository, if any
+            raise UnsupportedGitConfig(
+                'no repository at {}'.format(git_dir))
+        if hasattr(os, 'getuid') and git_dir.stat().st_uid != os.getuid():
+            # subject to Git's safe.directory protection
+            raise UnsupportedGitConfig(
+                'repository at {} is owned by another user'.format(git_dir))
+        commondir = git_dir / 'commondir'
+        if commondir.exists():
+            # Git normalizes the path lexically, without resolving symlinks
+            return Path(os.path.normpath(
+                git_dir / commondir.read_text().strip()))
+        return git_dir
+
+    def _read_file(self, path: Path) -> None:
+        try:
+            text = path.read_bytes().decode('utf-8')
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        except (OSError, UnicodeDecodeError) as e:
+            raise UnsupportedGitConfig(
+                'cannot read {}: {}'.format(path, e)) from e
+        try:
+            for k, v in parse_gitconfig(text):
+                self._add_item(k, v, path)
+        except ValueError as e:
+            raise UnsupportedGitConfig('{} in {}'.format(e, path)) from e
+
+    def _add_item(self, key: str, value: Optional[str], origin: Optional[Path]) -> None:
+        present = self._cfg.get(key, ())
+        if key not in self._cfg:
+            self._cfg[key] = value
+        elif isinstance(present, tuple):
+            self._cfg[key] = present + (value,)
+        else:
+            self._cfg[key] = (present, value)
+        if origin is not None:
+            self._files.add(origin)
+        if not self._includes:
+            return
+        if key == 'include.path':
+            self._include(value, origin)
+        elif key.startswith('includeif.') and key.endswith('.path') \
+                and key.count('.') > 1 \
+                and self._include_condition_is_true(key[10:-5], origin):
+            self._include(value, origin)
+
+    def _include(self, path: Optional[str], origin: Optional[Path]) -> None:
+        if path is None:
+            raise UnsupportedGitConfig('include path without a value')
+        path = self._expand_user(path)
+        if not os.path.isabs(path):
+            if origin is None:
+                raise UnsupportedGitConfig(
+                    'relative config includes must come from files')
+            include = origin.parent / path
+        else:
+            include = Path(path)
+        if not include.exists():
+            return
+        if self._depth >= _MAX_INCLUDE_DEPTH:
+            raise UnsupportedGitConfig('exceeded maximum include depth')
+        self._depth += 1
+        try:
+            self._read_file(include)
+        finally:
+            self._depth -= 1
+
+    @staticmethod
+    def _expand_user(path: str) -> str:
+        if path.startswith('%(prefix)/') or (
+                path.startswith('~') and not path.startswith('~/')):
+            raise UnsupportedGitConfig(
+                'unsupported path interpolation in {!r}'.format(path))
+        if path.startswith('~/'):
+            home = os.environ.get('HOME')
+            if not home:
+                raise UnsupportedGitConfig('HOME is not set')
+            path = home + path[1:]
+        return path
+
+    def _include_condition_is_true(self, cond: str, origin: Optional[Path]) -> bool:
+        if cond.startswith('gitdir:'):
+            return self._include_by_gitdir(cond[7:], origin, False)
+        elif cond.startswith('gitdir/i:'):
+            return self._include_by_gitdir(cond[9:], origin, True)
+        elif cond.startswith('onbranch:'):
+            return self._include_by_branch(cond[9:])
+        elif cond.startswith('hasconfig:'):
+            raise UnsupportedGitConfig(
+                'unsupported include condition {!r}'.format(cond))
+        # unknown conditions are ignored by Git
+        return False
+
+    def _include_by_gitdir(self, pattern: str, origin: Optional[Path], icase: bool) -> bool:
+        if self._git_dir is None:
+            return False
+        prefix = 0
+        if pattern.startswith('~/'):
+            pattern = self._expand_user(pattern)
+        if pattern.startswith('./'):
+            if origin is None:
+                raise UnsupportedGitConfig(
+                    'relative config include conditionals must come '
+                    'from files')
+            origin_dir = os.path.dirname(os.path.realpath(origin))
+            pattern = origin_dir + pattern[1:]
+            prefix = len(origin_dir) + 1
+        elif not os.path.isabs(pattern):
+            pattern = '**/' + pattern
+        if pattern.endswith('/'):
+            pattern += '**'
+        regex = wildmatch_to_regex(pattern[prefix:], icase)
+        git_dir = str(self._git_dir)
+        for text in (os.path.realpath(git_dir), os.path.abspath(git_dir)):
+            if prefix:
+                # literal matching of the prefix
+                if len(text) < prefix:
+                    return False
+                if (text[:prefix].lower() != pattern[:prefix].lower()
+                        if icase else text[:prefix] != pattern[:prefix]):
+                    return False
+            if regex.match(text[prefix:]):
+                return True
+        return False
+
+    def _include_by_branch(self, pattern: str) -> bool:
+        if self._git_dir is None:
+            return False
+        try:
+            head = (self._git_dir / 'HEAD').read_text().strip()
+        except OSError:
+            return False
+        if not head.startswith('ref: refs/heads/'):
+            # detached HEAD
+            return False
+        if pattern.endswith('/'):
+            pattern += '**'
+        return bool(wildmatch_to_regex(pattern).match(head[16:]))
+
+    def get_scope_file(self, scope: str) -> Path:
+        """Return the file that `git config --<scope>` modifies
+
+        Parameters
+        ----------
+        scope : {'global', 'local'}
+
+        Raises
+        ------
+        UnsupportedGitConfig
+        """
+        env = os.environ
+        for var in ('GIT_CONFIG', 'GIT_DIR', 'GIT_COMMON_DIR'):
+            if var in env:
+                raise UnsupportedGitConfig('{} is set'.format(var))
+        if scope == 'local':
+            common_dir = self._get_common_dir()
+            if common_dir is None:
+                raise UnsupportedGitConfig('no repository')
+            return common_dir / 'config'
+        elif scope != 'global':
+            raise UnsupportedGitConfig('unsupported scope {!r}'.format(scope))
+        if 'GIT_CONFIG_GLOBAL' in env:
+            return Path(env['GIT_CONFIG_GLOBAL'])
+        home = env.get('HOME')
+        if not home:
+            raise UnsupportedGitConfig('HOME is not set')
+        user = Path(home, '.gitconfig')
+        xdg = Path(env['XDG_CONFIG_HOME'], 'git', 'config') \
+            if env.get('XDG_CONFIG_HOME') \
+            else Path(home, '.config', 'git', 'config')
+        # like Git, only write to the XDG location if it is the one in use
+        if not os.access(user, os.R_OK) and os.access(xdg, os.R_OK):
+            return xdg
+        return user
+
+
+def _format_gitconfig_item(name: str, value: str) -> str:
+    # like write_pair() of Git
+    quote = '"' if value.startswith(' ') or value.endswith(' ') \
+        or ';' in value or '#' in value else ''
+    value = value.replace('\\', '\\\\').replace('"', '\\"') \
+        .replace('\n', '\\n').replace('\t', '\\t')
+    return '\t{} = {}{}{}\n'.format(name, quote, value, quote)
+
+
+def _format_gitconfig_section(name: str) -> str:
+    section, dot, subsection = name.partition('.')
+    if not dot:
+        return '[{}]\n'.format(section)
+    return '[{} "{}"]\n'.format(
+        section, subsection.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def _canonicalize_gitconfig_section(name: str) -> str:
+    section, dot, subsection = name.partition('.')
+    if not section or not all(_iskeychar(c) for c in section) \
+            or '\n' in subsection:
+        raise UnsupportedGitConfig(
+            'invalid section name: {!r}'.format(name))
+    return '{}.{}'.format(section.lower(), subsection + dot)
+
+
+def _section_name_matches(header: str, name: str) -> bool:
+    """Whether a section header declares the section `name`
+
+    Like Git does it for `--rename-section` and `--remove-section`, the
+    name must match the section (and subsection) name verbatim, including
+    its case.
+    """
+    buf = header.lstrip(_SPACE)
+    if not buf.startswith('['):
+        return False
+    i, j, dot = 1, 0, False
+    while i < len(buf) and buf[i] != ']':
+        if not dot and buf[i] in _SPACE:
+            # begin of a subsection
+            dot = True
+            if name[j:j + 1] != '.':
+                return False
+            j += 1
+            i += 1
+            while i < len(buf) and buf[i] in _SPACE:
+                i += 1
+            if buf[i:i + 1] != '"':
+                return False
+            i += 1
+            continue
+        if buf[i] == '\\' and dot:
+            i += 1
+        elif buf[i] == '"' and dot:
+            # end of a subsection
+            i += 1
+            while i < len(buf) and buf[i] in _SPACE:
+                i += 1
+            break
+        if buf[i:i + 1] != name[j:j + 1]:
+            return False
+        i += 1
+        j += 1
+    return buf[i:i + 1] == ']' and j == len(name)
+
+
+class _GitConfigEditor:
+    """Modify the text of a configuration file like `git config` does
+
+    Each method corresponds to a `git config` call. Anything that would
+    make `git config` fail raises `UnsupportedGitConfig`, such that the
+    caller can leave it to Git to report the error.
+
+    Like in Git, section and variable names of keys are matched
+    case-insensitively, subsection names case-sensitively. Section names
+    given for renaming or removing a section must match verbatim.
+    """
+
+    def __init__(self, text: str) -> None:
+        if text.startswith('\ufeff') or '\r' in text:
+            raise UnsupportedGitConfig('unsupported line endings or BOM')
+        # list of [kind, name, text], kind is one of 'section', 'item' or
+        # None for anything in between (comments, empty lines)
+        self._segments: list[list] = []
+        pos = 0
+        try:
+            for kind, name, start, end in \
+                    _GitConfigParser(text).segments_():
+                if start > pos:
+                    self._segments.append([None, None, text[pos:start]])
+                self._segments.append([kind, name, text[start:end]])
+                pos = end
+        except ValueError as e:
+            raise UnsupportedGitConfig(str(e)) from e
+        if pos < len(text):
+            self._segments.append([None, None, text[pos:]])
+
+    @property
+    def text(self) -> str:
+        return ''.join(s[2] for s in self._segments)
+
+    def apply(self, args: list[str]) -> None:
+        """Apply the arguments of a `git config --file` call"""
+        if len(args) == 3 and args[0] == '--add':
+            self.add(*args[1:])
+        elif len(args) == 3 and args[0] == '--replace-all':
+            self.set(*args[1:], replace_all=True)
+        elif len(args) == 2 and args[0] == '--unset-all':
+            self.unset(args[1])
+        elif len(args) == 3 and args[0] == '--rename-section':
+            self.rename_section(*args[1:])
+        elif len(args) == 2 and args[0] == '--remove-section':
+            self.remove_section(args[1])
+        elif len(args) == 2 and not args[0].startswith('-'):
+            self.set(*args)
+        else:
+            raise UnsupportedGitConfig(
+                'unsupported modification: {!r}'.format(args))
+
+    def _find_items(self, key: str) -> list[int]:
+        return [i for i, s in enumerate(self._segments)
+                if s[0] == 'item' and s[1] == key]
+
+    def _ensure_newline(self, idx: int) -> None:
+        # a last line in the file might not have one
+        segment = self._segments[idx]
+        if segment[2] and not segment[2].endswith('\n'):
+            segment[2] += '\n'
+
+    def add(self, key: str, value: str) -> None:
+        try:
+            canonical = canonicalize_gitconfig_key(key)
+        except ValueError as e:
+            raise UnsupportedGitConfig(str(e)) from e
+        dot = key.rindex('.')
+        section = canonical[:dot + 1]
+        item = ['item', canonical, _format_gitconfig_item(key[dot + 1:], value)]
+        # like Git, append to the last declaration of the section
+        for idx in range(len(self._segments) - 1, -1, -1):
+            kind, name, _ = self._segments[idx]
+            if (kind == 'section' and name == section) or (
+                    kind == 'item'
+                    and name.rpartition('.')[0] + '.' == section):
+                self._ensure_newline(idx)
+                self._segments.insert(idx + 1, item)
+                return
+        if self._segments:
+            self._ensure_newline(len(self._segments) - 1)
+        self._segments.append(
+            ['section', section, _format_gitconfig_section(key[:dot])])
+        self._segments.append(item)
+
+    def set(self, key: str, value: str, replace_all: bool = False) -> None:
+        try:
+            items = self._find_items(canonicalize_gitconfig_key(key))
+        except ValueError as e:
+            raise UnsupportedGitConfig(str(e)) from e
+        if not items:
+            self.add(key, value)
+            return
+        if len(items) > 1 and not replace_all:
+            raise UnsupportedGitConfig(
+                '{} has multiple values'.format(key))
+        # like Git, the last declaration is replaced
+        self._segments[items[-1]][2] = _format_gitconfig_item(
+            key[key.rindex('.') + 1:], value)
+        for idx in reversed(items[:-1]):
+            del self._segments[idx]
+
+    def unset(self, key: str) -> None:
+        try:
+            items = self._find_items(canonicalize_gitconfig_key(key))
+        except ValueError as e:
+            raise UnsupportedGitConfig(str(e)) from e
+        if not items:
+            raise UnsupportedGitConfig('no such key: {}'.format(key))
+        canonical = self._segments[items[0]][1]
+        section = canonical[:canonical.rindex('.') + 1]
+        remove = set()
+        k = 0
+        while k < len(items):
+            # like Git, also remove a section without any items left
+            last, begin, end = self._get_empty_section(items, k, section)
+            remove.update(range(begin, end))
+            k = last + 1
+        self._segments = [seg for i, seg in enumerate(self._segments)
+                          if i not in remove]
+
+    def _is_comment(self, idx: int) -> bool:
+        kind, _, text = self._segments[idx]
+        if kind == 'section':
+            text = text[text.rindex(']') + 1:]
+        elif kind is not None:
+            return False
+        return '#' in text or ';' in text
+
+    def _get_empty_section(self, items: list[int], k: int, section: str) -> tuple[int, int, int]:
+        """Determine the segments to remove when removing items[k]
+
+        Like Git, an entire section is removed, if items[k] is its first
+        item, no other items remain in it, and there are no comments in or
+        directly around it.
+
+        Returns
+        -------
+        tuple
+          Position in `items` of the last removed item, and the begin and
+          end of the range of segments to remove.
+        """
+        segments = self._segments
+        idx = items[k]
+        no_section = (k, idx, idx + 1)
+        begin = idx
+        section_seen = False
+        while begin > 0:
+            kind, name, _ = segments[begin - 1]
+            if self._is_comment(begin - 1):
+                return no_section
+            if kind == 'item':
+                if not section_seen:
+                    # not the first item of the section
+                    return no_section
+                break
+            if kind == 'section':
+                if name != section:
+                    break
+                section_seen = True
+            begin -= 1
+        end = idx + 1
+        while end < len(segments):
+            kind, name, _ = segments[end]
+            if self._is_comment(end):
+                return no_section
+            if kind == 'section' and name != section:
+                break
+            if kind == 'item':
+                if k + 1 < len(items) and items[k + 1] == end:
+                    # to be removed too
+                    k += 1
+                else:
+                    return no_section
+            end += 1
+        return k, begin, end
+
+    def rename_section(self, old: str, new: str) -> None:
+        new_section = _canonicalize_gitconfig_section(new)
+        header = _format_gitconfig_section(new)
+        found = rename = False
+        for segment in self._segments:
+            if segment[0] == 'section':
+                rename = _section_name_matches(segment[2], old)
+                if rename:
+                    segment[1:] = [new_section, header]
+                    found = True
+            elif segment[0] == 'item' and rename:
+                segment[1] = new_section + segment[1].rpartition('.')[2]
+        if not found:
+            raise UnsupportedGitConfig('no such section: {}'.format(old))
+
+    def remove_section(self, name: str) -> None:
+        segments = []
+        remove = found = False
+        for segment in self._segments:
+            if segment[0] == 'section':
+                remove = _section_name_matches(segment[2], name)
+                found = found or remove
+            if not remove:
+                segments.append(segment)
+        if not found:
+            raise UnsupportedGitConfig('no such section: {}'.format(name))
+        self._segments = segments
+
+
+def edit_gitconfig_file(path: Path, edits: list[list[str]]) -> None:
+    """Apply a sequence of modifications to a configuration file at once
+
+    The file is locked like Git does it, and is replaced only once, after
+    all modifications are applied.
+
+    Parameters
+    ----------
+    path : Path
+      Configuration file, need not exist yet.
+    edits : list
+      Each item is the list of arguments of a `git config --file <path>`
+      call that modifies the file (e.g. `['--add', 'sec.key', 'value']`).
+
+    Raises
+    ------
+    UnsupportedGitConfig
+      If any modification is not supported or would fail (e.g. removing a
+      key that does not exist). Nothing is written in this case.
+    """
+    path = Path(os.path.realpath(path))
+    lock = path.with_name(path.name + '.lock')
+    try:
+        fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except OSError as e:
+        raise UnsupportedGitConfig(
+            'cannot lock {}: {}'.format(path, e)) from e
+    try:
+        try:
+            text = path.read_bytes().decode('utf-8')
+            mode = path.stat().st_mode
+        except FileNotFoundError:
+            text = ''
+            mode = None
+        except (OSError, UnicodeDecodeError) as e:
+            raise UnsupportedGitConfig(
+                'cannot read {}: {}'.format(path, e)) from e
+        editor = _GitConfigEditor(text)
+        for args in edits:
+            editor.apply(args)
+        with os.fdopen(fd, 'wb') as f:
+            fd = None
+            if mode is not None:
+                os.fchmod(f.fileno(), mode & 0o7777)
+            f.write(editor.text.encode('utf-8'))
+        os.replace(lock, path)
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        lock.unlink()
+        raise
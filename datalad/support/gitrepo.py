@@ -12,6 +12,7 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
 import os
 import os.path as op
@@ -26,8 +27,10 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
+from contextlib import closing
 from functools import wraps
 from itertools import chain
+from operator import itemgetter
 from os import (
     PathLike,
     linesep,
@@ -119,6 +122,15 @@ from .exceptions import (
     NoSuchPathError,
 )
 # imports from same module:
+from .content_info import (
+    ContentInfoCache,
+    ContentInfoItem,
+    ContentInfoTable,
+    is_full_hexsha,
+    item_to_props,
+    merge_join_sorted_,
+    unique_sorted_,
+)
 from .external_versions import external_versions
 from .network import (
     RI,
@@ -141,6 +153,33 @@ _pardirsep = pardir + sep
 
 lgr = logging.getLogger('datalad.gitrepo')
 
+# map of Git file modes to content type labels
+_mode_type_map = {
+    '100644': 'file',
+    '100755': 'file',
+    '120000': 'symlink',
+    '160000': 'dataset',
+}
+
+
+def _get_untracked_type(path: Path) -> str:
+    """Determine the type label of untracked content"""
+    return 'symlink' if path.is_symlink() \
+        else 'directory' if path.is_dir() else 'file'
+
+
+def _is_on_adjusted_branch(path: Path) -> bool:
+    """Whether the repository at `path` has an adjusted branch checked out
+
+    Only the HEAD file is inspected, no Git or git-annex call is made.
+    """
+    try:
+        head = (_get_dot_git(path, ok_missing=True) / 'HEAD').read_text()
+    except (OSError, InvalidGitRepositoryError):
+        return False
+    return head.startswith('ref: refs/heads/adjusted/')
+
+
 Option = Union[str, bool, None, List[Union[str, bool, None]], Tuple[Union[str, bool, None], ...]]
 
 
@@ -2848,6 +2887,81 @@ class GitRepo(CoreGitRepo):
         # TODO limit by file type to replace code in subdatasets command
         info: dict[Path, dict[str, str | int | None]] = dict()
 
+        if paths is not None and not paths:
+            return info
+
+        pathobj = self.pathobj
+        info.update(
+            # again Git reports always in POSIX
+            (pathobj.joinpath(ut.PurePosixPath(item[0])), item_to_props(item))
+            for item in self._get_content_info_items(paths, ref, untracked)
+        )
+        lgr.debug('Done %s.get_content_info(...)', self)
+        return info
+
+    def get_content_info_table(self, paths: Optional[Sequence[str | PathLike[str]]] = None, ref: Optional[str] = None, untracked: str = 'all') -> ContentInfoTable:
+        """Like get_content_info(), but return a compact `ContentInfoTable`
+
+        The returned table offers the read API of the `dict` returned by
+        get_content_info(), but requires a fraction of its memory. This
+        makes a difference for repositories with many files.
+
+        Returns
+        -------
+        ContentInfoTable
+        """
+        lgr.debug('%s.get_content_info_table(...)', self)
+        table = ContentInfoTable(self.pathobj)
+        if paths is not None and not paths:
+            return table
+        table.extend(self._get_content_info_items(paths, ref, untracked))
+        lgr.debug('Done %s.get_content_info_table(...)', self)
+        return table
+
+    def _get_content_info_items(self, paths: Optional[Sequence[str | PathLike[str]]], ref: Optional[str], untracked: str) -> Iterable[ContentInfoItem]:
+        """Internal helper of get_content_info() to obtain parsed items"""
+        posix_paths, untracked_opts, cmd, props_re = \
+            self._prepare_content_info_query(paths, ref, untracked)
+
+        # the persistent cache only holds complete reports
+        cache = self._get_content_info_cache() if posix_paths is None else None
+        if cache is not None:
+            items: Optional[Iterable[ContentInfoItem]]
+            if not ref:
+                items = self._get_cached_index_items(cache, props_re)
+                if untracked_opts:
+                    # untracked content is reported first, like ls-files
+                    # would do
+                    items = chain(
+                        list(self._parse_content_info_items_(
+                            ref,
+                            self.call_git(
+                                ['ls-files', '-z'] + untracked_opts,
+                                read_only=True).split('\0'),
+                            props_re)),
+                        items)
+            else:
+                items = self._get_cached_tree_items(cache, ref, props_re)
+            if items is not None:
+                return items
+            # could not determine a cache key, take the normal route
+
+        lgr.debug('Query repo: %s', cmd)
+        stdout = self._call_content_info_cmd(cmd, ref, posix_paths)
+        lgr.debug('Done query repo: %s', cmd)
+        return self._parse_content_info_items_(ref, stdout.split('\0'), props_re)
+
+    def _prepare_content_info_query(self, paths: Optional[Sequence[str | PathLike[str]]], ref: Optional[str], untracked: str) -> tuple[Optional[list[str]], list[str], list[str], Pattern[str]]:
+        """Internal helper of get_content_info() to set up the Git query
+
+        Returns
+        -------
+        tuple
+          POSIX paths to constrain the query to (or None), `ls-files`
+          options to report untracked content, the full ls-files/ls-tree
+          command, and a regular expression to parse its output.
+        """
+        posix_paths: Optional[list[str]]
         if paths:  # is not None separate after
             # path matching will happen against what Git reports
             # and Git always reports POSIX paths
@@ -2855,8 +2969,6 @@ class GitRepo(CoreGitRepo):
             # convert unconditionally
             # note: will be list-ified below
             posix_paths = [ut.PurePath(p).as_posix() for p in paths]
-        elif paths is not None:
-            return info
         else:
             posix_paths = None
 
@@ -2882,85 +2994,239 @@ class GitRepo(CoreGitRepo):
             # --exclude-standard will make sure to honor and standard way
             # git can be instructed to ignore content, and will prevent
             # crap from contaminating untracked file reports
-            cmd = ['ls-files', '--stage', '-z']
             # untracked report mode, using labels from `git diff` option style
             if untracked == 'all':
-                cmd += ['--exclude-standard', '-o']
+                untracked_opts = ['--exclude-standard', '-o']
             elif untracked == 'normal':
-                cmd += ['--exclude-standard', '-o', '--directory', '--no-empty-directory']
+                untracked_opts = ['--exclude-standard', '-o', '--directory', '--no-empty-directory']
             elif untracked == 'no':
-                pass
+                untracked_opts = []
             else:
                 raise ValueError(
                     'unknown value for `untracked`: {}'.format(untracked))
+            cmd = ['ls-files', '--stage', '-z'] + untracked_opts
             props_re = re.compile(
                 r'(?P<type>[0-9]+) (?P<sha>.*) (.*)\t(?P<fname>.*)$')
         else:
+            untracked_opts = []
             cmd = ['ls-tree', ref, '-z', '-r', '--full-tree', '-l']
             props_re = re.compile(
                 r'(?P<type>[0-9]+) ([a-z]*) (?P<sha>[^ ]*) [\s]*(?P<size>[0-9-]+)\t(?P<fname>.*)$')
 
-        lgr.debug('Query repo: %s', cmd)
+        return posix_paths, untracked_opts, cmd, props_re
+
+    def _call_content_info_cmd(self, cmd: list[str], ref: Optional[str], files: Optional[list[str]]) -> str:
+        """Internal helper of get_content_info() to run ls-files/ls-tree"""
         try:
-            stdout = self.call_git(
+            return self.call_git(
                 cmd,
-                files=posix_paths,
+                files=files,
                 expect_fail=True,
                 read_only=True)
         except CommandError as exc:
             if "fatal: Not a valid object name" in exc.stderr:
                 raise InvalidGitReferenceError(ref)
             raise
-        lgr.debug('Done query repo: %s', cmd)
 
-        self._get_content_info_line_helper(
-            ref,
-            info,
-            stdout.split('\0'),
-            props_re)
+    def _get_content_info_cache(self) -> Optional[ContentInfoCache]:
+        """Return the persistent content info cache, if enabled"""
+        if 'GIT_INDEX_FILE' in os.environ \
+                or not self.config.obtain('datalad.repo.content-info-cache'):
+            return None
+        cache = getattr(self, '_content_info_cache', None)
+        if cache is None:
+            cache = self._content_info_cache = ContentInfoCache(self.dot_git)
+        return cache
+
+    def _get_worktree_status_options(self) -> Optional[list[str]]:
+        """Return Git options for worktree queries via `git status`
 
-        lgr.debug('Done %s.get_content_info(...)', self)
-        return info
+        Returns None, if neither the untracked cache nor a file system
+        monitor are enabled.
+        """
+        # obtain() reloads the configuration, if needed
+        untracked_cache = self.config.obtain('datalad.status.untracked-cache')
+        fsmonitor = self.config.get('datalad.status.fsmonitor')
+        if not fsmonitor and not untracked_cache:
+            return None
+        opts = ['-c', 'core.untrackedCache=true']
+        if fsmonitor:
+            if fsmonitor.lower() in ('true', 'yes', 'on', '1') \
+                    and external_versions['cmd:git'] < '2.36':
+                # older Git would try to execute a hook named 'true'
+                lgr.warning(
+                    'Builtin file system monitor requires Git 2.36 or '
+                    'later, ignoring datalad.status.fsmonitor=%s', fsmonitor)
+            else:
+                opts += ['-c', 'core.fsmonitor={}'.format(fsmonitor)]
+        return opts
 
-    def _get_content_info_line_helper(self, ref: Optional[str], info: dict[Path, dict[str, str | int | None]], lines: list[str], props_re: Pattern[str]) -> None:
-        """Internal helper of get_content_info() to parse Git output"""
-        mode_type_map = {
-            '100644': 'file',
-            '100755': 'file',
-            '120000': 'symlink',
-            '160000': 'dataset',
-        }
+    def _get_worktree_status(self, opts: list[str], paths: Optional[list[Path]], untracked: str) -> tuple[ContentInfoTable, set[str]]:
+        """Internal helper of diffstatus() to query the worktree state
+
+        Untracked and modified content is determined by a single
+        `git status` call (with the given Git `opts`), tracked content is
+        reported by get_content_info_table().
+
+        Returns
+        -------
+        tuple
+          Content info table of the worktree, and the set of modified or
+          deleted paths (POSIX, relative to the repository root).
+        """
+        posix_paths, _, _, props_re = \
+            self._prepare_content_info_query(paths, None, untracked)
+        untracked_files = []
+        modified = set()
+        for item in self.call_git_items_(
+                opts + [
+                    'status', '--porcelain', '-z', '--no-renames',
+                    # like `ls-files -m`, only consider the recorded
+                    # commit of a submodule
+                    '--ignore-submodules=dirty',
+                    '--untracked-files={}'.format(untracked)],
+                files=posix_paths,
+                sep='\0',
+                read_only=True):
+            if not item:
+                continue
+            xy, fname = item[:2], item[3:]
+            if xy == '??':
+                untracked_files.append(fname)
+            elif xy[1] not in ' !':
+                # any worktree modification, incl. deletion
+                modified.add(fname)
+        # untracked content first, like `ls-files` would report it
+        table = ContentInfoTable(
+            self.pathobj,
+            self._parse_content_info_items_(None, untracked_files, props_re))
+        table.extend(self._get_content_info_items(paths, None, 'no'))
+        return table, modified
+
+    def _get_cached_index_items(self, cache: ContentInfoCache, props_re: Pattern[str]) -> list[ContentInfoItem]:
+        """Get index items from cache, or from Git and update the cache"""
+        # take the fingerprint before querying Git, a concurrent
+        # modification of the index would then invalidate the result
+        fingerprint = cache.get_index_fingerprint()
+        items = cache.get_index(fingerprint)
+        if items is None:
+            lgr.debug('No valid cached index report for %s', self)
+            items = list(self._parse_content_info_items_(
+                None,
+                self._call_content_info_cmd(
+                    ['ls-files', '--stage', '-z'], None, None).split('\0'),
+                props_re))
+            cache.set_index(fingerprint, items)
+        return items
+
+    def _get_cached_tree_items(self, cache: ContentInfoCache, ref: str, props_re: Pattern[str]) -> Optional[list[ContentInfoItem]]:
+        """Get tree items from cache, or from Git and update the cache
+
+        Returns None if `ref` cannot be resolved to an object ID.
+        """
+        if is_full_hexsha(ref):
+            sha = ref
+        else:
+            try:
+                sha = self.call_git_oneline(
+                    ['rev-parse', '--quiet', '--verify', '{}^{{tree}}'.format(ref)],
+                    read_only=True)
+            except CommandError:
+                return None
+        items = cache.get_tree(sha)
+        if items is None:
+            items = list(self._parse_content_info_items_(
+                ref,
+                self._call_content_info_cmd(
+                    ['ls-tree', sha, '-z', '-r', '--full-tree', '-l'],
+                    ref, None).split('\0'),
+                props_re))
+            cache.set_tree(sha, items)
+        return items
+
+    def _parse_content_info_items_(self, ref: Optional[str], lines: Iterable[str], props_re: Pattern[str]) -> Iterator[ContentInfoItem]:
+        """Internal helper to parse Git output, one item at a time
+
+        Yields
+        ------
+        tuple
+          The item path, as reported by Git (POSIX, relative to the
+          repository root), its type, gitshasum, and bytesize (or None).
+        """
+        pathobj = self.pathobj
         for line in lines:
             if not line:
                 continue
-            inf: dict[str, str | int | None] = {}
             props = props_re.match(line)
             if not props:
                 # not known to Git, but Git always reports POSIX
-                path = ut.PurePosixPath(line)
-                inf['gitshasum'] = None
+                # be nice and assign types for untracked content
+                yield (
+                    line,
+                    _get_untracked_type(pathobj.joinpath(ut.PurePosixPath(line))),
+                    None,
+                    None,
+                )
             else:
                 # again Git reports always in POSIX
-                path = ut.PurePosixPath(props.group('fname'))
-
-            # revisit the file props after this path has not been rejected
-            if props:
-                inf['gitshasum'] = props.group('sha')
-                inf['type'] = mode_type_map.get(
+                type_ = _mode_type_map.get(
                     props.group('type'), props.group('type'))
+                yield (
+                    props.group('fname'),
+                    type_,
+                    props.group('sha'),
+                    int(props.group('size')) if ref and type_ == 'file' else None,
+                )
 
-                if ref and inf['type'] == 'file':
-                    inf['bytesize'] = int(props.group('size'))
+    def _parse_content_info_lines_(self, ref: Optional[str], lines: Iterable[str], props_re: Pattern[str]) -> Iterator[tuple[str, dict[str, str | int | None]]]:
+        """Like _parse_content_info_items_(), but yield property dicts
 
-            # join item path with repo path to get a universally useful
-            # path representation with auto-conversion and tons of other
-            # stuff
-            joinedpath = self.pathobj.joinpath(path)
-            if 'type' not in inf:
-                # be nice and assign types for untracked content
-                inf['type'] = 'symlink' if joinedpath.is_symlink() \
-                    else 'directory' if joinedpath.is_dir() else 'file'
-            info[joinedpath] = inf
+        Yields
+        ------
+        tuple
+          The item path, as reported by Git (POSIX, relative to the
+          repository root), and its content info properties.
+        """
+        for item in self._parse_content_info_items_(ref, lines, props_re):
+            yield item[0], item_to_props(item)
+
+    def get_content_info_(self, paths: Optional[Sequence[str | PathLike[str]]] = None, ref: Optional[str] = None, untracked: str = 'all') -> Iterator[tuple[Path, dict[str, str | int | None]]]:
+        """Like get_content_info(), but yields one item at a time
+
+        Git's output is consumed and parsed incrementally, hence memory
+        demands do not grow with the number of reported items. Unlike
+        get_content_info(), no persistent cache is used.
+
+        Yields
+        ------
+        tuple
+          Absolute path of an item, and its properties (see
+          get_content_info()).
+        """
+        if paths is not None and not paths:
+            return
+        posix_paths, _, cmd, props_re = self._prepare_content_info_query(
+            paths, ref, untracked)
+        pathobj = self.pathobj
+        for fname, inf in self._parse_content_info_lines_(
+                ref,
+                self._call_content_info_items_(cmd, ref, posix_paths),
+                props_re):
+            yield pathobj.joinpath(ut.PurePosixPath(fname)), inf
+
+    def _call_content_info_items_(self, cmd: list[str], ref: Optional[str], files: Optional[list[str]]) -> Iterator[str]:
+        """Like _call_content_info_cmd(), but yield output items"""
+        try:
+            yield from self.call_git_items_(
+                cmd,
+                files=files,
+                expect_fail=True,
+                read_only=True,
+                sep='\0')
+        except CommandError as exc:
+            if "fatal: Not a valid object name" in (exc.stderr or ''):
+                raise InvalidGitReferenceError(ref)
+            raise
 
     def status(self, paths: Optional[Sequence[str | PathLike[str]]] = None, untracked: str= 'all', eval_submodule_state: Literal["commit", "full", "no"] = 'full') -> dict[Path, dict[str, str]]:
         """Simplified `git status` equivalent.
@@ -3090,17 +3356,55 @@ class GitRepo(CoreGitRepo):
         else:
             ppaths = None
 
+        if fr == 'HEAD' and to is None \
+                and self.config.obtain('datalad.status.porcelain'):
+            # the common case of a worktree status, a single `git status`
+            # call tells us about any modification
+            if ppaths is not None and not ppaths:
+                return 'clean' if eval_submodule_state == 'global' else {}
+            key = _get_cache_key(
+                'status', ppaths, eval_submodule_state, untracked)
+            if key not in _cache:
+                if eval_submodule_state == 'global':
+                    # any report is on a modification
+                    with closing(self._status_gen_(
+                            ppaths, untracked, 'full',
+                            report_clean=False)) as items:
+                        _cache[key] = 'modified' \
+                            if any(True for _ in items) else 'clean'
+                else:
+                    _cache[key] = list(self._status_gen_(
+                        ppaths, untracked, eval_submodule_state,
+                        report_clean=True, untracked_first=True))
+            if eval_submodule_state == 'global':
+                return _cache[key]
+            # hand out copies, a caller may modify the report
+            return {f: dict(props) for f, props in _cache[key]}
+
         # TODO report more info from get_content_info() calls in return
         # value, those are cheap and possibly useful to a consumer
         # we need (at most) three calls to git
+        # compact content info tables are used, they keep memory demands
+        # low for repositories with many files
+        to_state: ContentInfoTable
+        from_state: ContentInfoTable
         if to is None:
             # everything we know about the worktree, including os.stat
             # for each file
             key = _get_cache_key('ci', ppaths, None, untracked)
+            status_opts = self._get_worktree_status_options()
             if key in _cache:
                 to_state = _cache[key]
+            elif status_opts is not None:
+                # let a single `git status` call determine untracked and
+                # modified content, it can make use of Git's untracked
+                # cache and a file system monitor, unlike `ls-files`
+                to_state, modified = self._get_worktree_status(
+                    status_opts, ppaths, untracked)
+                _cache[key] = to_state
+                _cache[_get_cache_key('mod', ppaths, None)] = modified
             else:
-                to_state = self.get_content_info(
+                to_state = self.get_content_info_table(
                     paths=ppaths, ref=None, untracked=untracked)
                 _cache[key] = to_state
             # we want Git to tell us what it considers modified and avoid
@@ -3111,8 +3415,9 @@ class GitRepo(CoreGitRepo):
             else:
                 # from Git 2.31.0 onwards ls-files has --deduplicate
                 # by for backward compatibility keep doing deduplication here
+                # paths are kept as reported by Git (relative, POSIX)
                 modified = set(
-                    self.pathobj.joinpath(ut.PurePosixPath(p))
+                    p
                     for p in self.call_git_items_(
                         # we must also look for deleted files, for the logic
                         # below to work. Only from Git 2.31.0 would they be
@@ -3129,7 +3434,7 @@ class GitRepo(CoreGitRepo):
             if key in _cache:
                 to_state = _cache[key]
             else:
-                to_state = self.get_content_info(paths=ppaths, ref=to)
+                to_state = self.get_content_info_table(paths=ppaths, ref=to)
                 _cache[key] = to_state
             # we do not need worktree modification detection in this case
             modified = None
@@ -3139,23 +3444,25 @@ class GitRepo(CoreGitRepo):
             from_state = _cache[key]
         else:
             if fr:
-                from_state = self.get_content_info(paths=ppaths, ref=fr)
+                from_state = self.get_content_info_table(paths=ppaths, ref=fr)
             else:
                 # no ref means from nothing
-                from_state = {}
+                from_state = ContentInfoTable(self.pathobj)
             _cache[key] = from_state
 
+        pathobj = self.pathobj
         status = dict()
-        for f, to_state_r in to_state.items():
+        for fname, to_state_r in to_state.items_rel():
+            f = pathobj.joinpath(ut.PurePosixPath(fname))
             props = self._diffstatus_get_state_props(
                 f,
-                from_state.get(f, None),
+                from_state.get_rel(fname),
                 to_state_r,
                 # are we comparing against a recorded commit or the worktree
                 to is not None,
                 # if we have worktree modification info, report if
                 # path is reported as modified in it
-                modified and f in modified,
+                modified and fname in modified,
                 eval_submodule_state)
             # potential early exit in "global" eval mode
             if eval_submodule_state == 'global' and \
@@ -3164,12 +3471,12 @@ class GitRepo(CoreGitRepo):
                 return 'modified'
             status[f] = props
 
-        for f, from_state_r in from_state.items():
-            if f not in to_state:
+        for fname, from_state_r in from_state.items_rel():
+            if not to_state.contains_rel(fname):
                 # we new this, but now it is gone and Git is not complaining
                 # about it being missing -> properly deleted and deletion
                 # stages
-                status[f] = dict(
+                status[pathobj.joinpath(ut.PurePosixPath(fname))] = dict(
                     state='deleted',
                     type=from_state_r['type'],
                     # report the shasum to distinguish from a plainly vanished
@@ -3193,55 +3500,17 @@ class GitRepo(CoreGitRepo):
                 return status
 
         # loop over all subdatasets and look for additional modifications
-        for f, st in status.items():
-            f = str(f)
-            if 'state' in st or not st['type'] == 'dataset':
-                # no business here
-                continue
-            if not GitRepo.is_valid_repo(f):
-                # submodule is not present, no chance for a conflict
-                st['state'] = 'clean'
-                continue
-            # we have to recurse into the dataset and get its status
-            subrepo = repo_from_path(f)
-            # get the HEAD commit, or the one of the corresponding branch
-            # only that one counts re super-sub relationship
-            # save() syncs the corresponding branch each time
-            subrepo_commit = subrepo.get_hexsha(subrepo.get_corresponding_branch())
-            st['gitshasum'] = subrepo_commit
-            # subdataset records must be labeled clean up to this point
-            # test if current commit in subdataset deviates from what is
-            # recorded in the dataset.
-            # On adjusted branches, the recorded commit could be either the
-            # corresponding branch commit (recorded by datalad save) or the
-            # adjusted HEAD commit (recorded by git-annex sync after install).
-            # Accept either as "clean" state.
-            prev_sha = st['prev_gitshasum']
-            if prev_sha != subrepo_commit:
-                # Check if recorded commit matches HEAD on adjusted branch
-                subrepo_head_sha = subrepo.get_hexsha()
-                if prev_sha == subrepo_head_sha:
-                    st['state'] = 'clean'
-                else:
-                    st['state'] = 'modified'
-            else:
-                st['state'] = 'clean'
-            if eval_submodule_state == 'global' and st['state'] == 'modified':
-                return 'modified'
-            if eval_submodule_state == 'commit':
-                continue
-            # the recorded commit did not change, so we need to make
-            # a more expensive traversal
-            st['state'] = subrepo.diffstatus(
-                # we can use 'HEAD' because we know that the commit
-                # did not change. using 'HEAD' will facilitate
-                # caching the result
-                fr='HEAD',
-                to=None,
-                paths=None,
-                untracked=untracked,
-                eval_submodule_state='global',
-                _cache=_cache) if st['state'] == 'clean' else 'modified'
+        subds = [f for f, st in status.items()
+                 if 'state' not in st and st['type'] == 'dataset']
+        # a single `git status` call reports on modifications of all of
+        # them, only descend into those where that is not conclusive
+        submodule_flags = self._get_submodule_status_flags(
+            [f.relative_to(pathobj) for f in subds]) if subds else {}
+        for f in subds:
+            st = status[f]
+            self._diffstatus_eval_submodule(
+                f, st, untracked, eval_submodule_state, _cache,
+                submodule_flags.get(f.relative_to(pathobj).as_posix(), None))
             if eval_submodule_state == 'global' and st['state'] == 'modified':
                 return 'modified'
 
@@ -3250,6 +3519,480 @@ class GitRepo(CoreGitRepo):
         else:
             return status
 
+    def _diffstatus_eval_submodule(self, f: Path, st: dict[str, str], untracked: str, eval_submodule_state: str,
+                                   _cache: Optional[dict], flags: Optional[str],
+                                   stream: bool = False) -> None:
+        """Helper to determine the state of a subdataset record
+
+        The `state` property of the record `st` is set to 'clean' or
+        'modified'.
+
+        Parameters
+        ----------
+        f : Path
+        st : dict
+          diffstatus() record of the subdataset.
+        untracked : str
+        eval_submodule_state : {'commit', 'full', 'global'}
+        _cache : dict or None
+        flags : str or None
+          Submodule state flags ('S<c><m><u>') reported for the subdataset
+          by `git status --porcelain=v2 --ignore-submodules=none`. None
+          means that `git status` did not report the subdataset, i.e.
+          it is unmodified. Only if the recorded commit of the subdataset
+          is reported as changed, the subdataset itself is inspected.
+        stream : bool
+          If set, any subdataset is inspected with diffstatus_(), instead of
+          diffstatus().
+        """
+        if st['gitshasum'] == st['prev_gitshasum'] \
+                and not (flags and flags[1] == 'C') \
+                and not _is_on_adjusted_branch(f):
+            # `git status` has inspected the subdataset already, and its
+            # HEAD matches the recorded commit. On an adjusted branch,
+            # the commit of the corresponding branch must be reported,
+            # which needs the subdataset to be inspected individually
+            st['state'] = 'modified' \
+                if flags and (flags[2] == 'M' or
+                              (flags[3] == 'U' and untracked != 'no')) \
+                else 'clean'
+            return
+        if not GitRepo.is_valid_repo(str(f)):
+            # submodule is not present, no chance for a conflict
+            st['state'] = 'clean'
+            return
+        # we have to recurse into the dataset and get its status
+        subrepo = repo_from_path(str(f))
+        # get the HEAD commit, or the one of the corresponding branch
+        # only that one counts re super-sub relationship
+        # save() syncs the corresponding branch each time
+        subrepo_commit = subrepo.get_hexsha(subrepo.get_corresponding_branch())
+        st['gitshasum'] = subrepo_commit
+        # subdataset records must be labeled clean up to this point
+        # test if current commit in subdataset deviates from what is
+        # recorded in the dataset.
+        # On adjusted branches, the recorded commit could be either the
+        # corresponding branch commit (recorded by datalad save) or the
+        # adjusted HEAD commit (recorded by git-annex sync after install).
+        # Accept either as "clean" state.
+        prev_sha = st['prev_gitshasum']
+        if prev_sha != subrepo_commit:
+            # Check if recorded commit matches HEAD on adjusted branch
+            subrepo_head_sha = subrepo.get_hexsha()
+            if prev_sha == subrepo_head_sha:
+                st['state'] = 'clean'
+            else:
+                st['state'] = 'modified'
+        else:
+            st['state'] = 'clean'
+        if eval_submodule_state == 'commit' or st['state'] == 'modified':
+            return
+        # the recorded commit did not change, so we need to make
+        # a more expensive traversal
+        if stream:
+            # any non-clean record is a modification, stop at the first.
+            # close the generator right away, to not leave the underlying
+            # Git processes behind
+            with closing(subrepo.diffstatus_(
+                    fr='HEAD',
+                    to=None,
+                    paths=None,
+                    untracked=untracked,
+                    eval_submodule_state='full')) as items:
+                st['state'] = 'modified' if any(
+                    props.get('state', None) != 'clean'
+                    for _, props in items
+                ) else 'clean'
+            return
+        st['state'] = subrepo.diffstatus(
+            # we can use 'HEAD' because we know that the commit
+            # did not change. using 'HEAD' will facilitate
+            # caching the result
+            fr='HEAD',
+            to=None,
+            paths=None,
+            untracked=untracked,
+            eval_submodule_state='global',
+            _cache=_cache)
+
+    def diffstatus_(self, fr: Optional[str], to: Optional[str], paths: Optional[Sequence[str | PathLike[str]]] = None, untracked: str = 'all',
+                    eval_submodule_state: Literal["commit", "full", "no"] = 'full') -> Iterator[tuple[Path, dict[str, str]]]:
+        """Like diffstatus(), but yields one (path, properties) item at a time
+
+        Instead of collecting reports on all content before comparing them,
+        the outputs of the underlying Git queries (worktree or `to` state,
+        `fr` state, and modifications in the worktree) are consumed
+        incrementally and merge-joined on their (sorted) paths. Memory
+        demands are therefore independent of the number of files in a
+        repository.
+
+        Items are reported in the sort order of Git (byte order of paths),
+        rather than in the order of diffstatus(). The 'global' submodule
+        evaluation mode is not supported.
+
+        Raises
+        ------
+        InvalidGitReferenceError
+          Immediately on call, if `fr` or `to` are not valid references.
+        """
+        if eval_submodule_state not in ('commit', 'full', 'no'):
+            raise ValueError(
+                'unsupported submodule evaluation mode: {}'.format(
+                    eval_submodule_state))
+        # validate references upfront, rather than on exhausting the
+        # underlying Git output streams at some point down the line
+        for ref in (fr, to):
+            if ref and not self.call_git_success(
+                    ['rev-parse', '--quiet', '--verify',
+                     '{}^{{tree}}'.format(ref)],
+                    read_only=True):
+                raise InvalidGitReferenceError(ref)
+        if paths is not None:
+            # at this point we must normalize paths to the form that
+            # Git would report them, to easy matching later on
+            paths = [
+                p.relative_to(self.pathobj) if p.is_absolute() else p
+                for p in map(ut.Path, paths)
+            ]
+            if not paths:
+                return iter([])
+        return self._diffstatus_gen_(
+            fr, to, paths, untracked, eval_submodule_state)
+
+    def _diffstatus_gen_(self, fr: Optional[str], to: Optional[str], paths: Optional[list[Path]], untracked: str,
+                         eval_submodule_state: str) -> Iterator[tuple[Path, dict[str, str]]]:
+        """Internal generator of diffstatus_()"""
+        to_items: Iterator[tuple[str, dict]]
+        modified: Iterator[str]
+        posix_paths, untracked_opts, cmd, props_re = \
+            self._prepare_content_info_query(paths, to, untracked)
+        if to is None:
+            # ls-files reports untracked content first, and in a separate
+            # sort order. Query separately and merge the sorted streams
+            to_items = heapq.merge(
+                self._parse_content_info_lines_(
+                    None,
+                    self._call_content_info_items_(
+                        ['ls-files', '-z'] + untracked_opts,
+                        None, posix_paths) if untracked_opts else [],
+                    props_re),
+                self._parse_content_info_lines_(
+                    None,
+                    self._call_content_info_items_(
+                        ['ls-files', '--stage', '-z'],
+                        None, posix_paths),
+                    props_re),
+                key=itemgetter(0),
+            )
+            # we want Git to tell us what it considers modified and avoid
+            # reimplementing logic ourselves
+            modified = self._call_content_info_items_(
+                # we must also look for deleted files, for the logic
+                # below to work
+                ['ls-files', '-z', '-m', '-d'],
+                None, posix_paths)
+        else:
+            to_items = self._parse_content_info_lines_(
+                to,
+                self._call_content_info_items_(cmd, to, posix_paths),
+                props_re)
+            # we do not need worktree modification detection in this case
+            modified = iter([])
+        if fr:
+            fr_posix_paths, _, fr_cmd, fr_props_re = \
+                self._prepare_content_info_query(paths, fr, untracked)
+            from_items: Iterable[tuple[str, dict]] = \
+                self._parse_content_info_lines_(
+                    fr,
+                    self._call_content_info_items_(fr_cmd, fr, fr_posix_paths),
+                    fr_props_re)
+        else:
+            # no ref means from nothing
+            from_items = []
+
+        pathobj = self.pathobj
+        next_modified = next(modified, None)
+        # modifications of submodules, queried once on demand
+        submodule_flags = None
+        for fname, to_state, from_state in merge_join_sorted_(
+                # unmerged paths are reported once per stage, the last
+                # report wins, like in diffstatus()
+                unique_sorted_(to_items),
+                unique_sorted_(from_items)):
+            f = pathobj.joinpath(ut.PurePosixPath(fname))
+            if to_state is None:
+                assert from_state is not None
+                # we new this, but now it is gone and Git is not complaining
+                # about it being missing -> properly deleted and deletion
+                # stages
+                yield f, dict(
+                    state='deleted',
+                    type=from_state['type'],
+                    # report the shasum to distinguish from a plainly vanished
+                    # file
+                    gitshasum=from_state['gitshasum'],
+                )
+                continue
+            while next_modified is not None and next_modified < fname:
+                next_modified = next(modified, None)
+            props = self._diffstatus_get_state_props(
+                f,
+                from_state,
+                to_state,
+                # are we comparing against a recorded commit or the worktree
+                to is not None,
+                # if we have worktree modification info, report if
+                # path is reported as modified in it
+                next_modified == fname,
+                eval_submodule_state)
+            if to is None and eval_submodule_state != 'no' \
+                    and 'state' not in props and props['type'] == 'dataset':
+                if submodule_flags is None:
+                    submodule_flags = self._get_submodule_status_flags(paths)
+                self._diffstatus_eval_submodule(
+                    f, props, untracked, eval_submodule_state, None,
+                    submodule_flags.get(fname, None), stream=True)
+            yield f, props
+
+    def status_(self, paths: Optional[Sequence[str | PathLike[str]]] = None, untracked: str = 'all',
+                eval_submodule_state: Literal["commit", "full", "no"] = 'full',
+                report_clean: bool = True) -> Iterator[tuple[Path, dict[str, str]]]:
+        """Like status(), but based on a single `git status` call
+
+        The state of the worktree with respect to HEAD is determined from
+        the output of `git status --porcelain=v2`, which is parsed one item
+        at a time. Information on unmodified content is obtained from
+        `git ls-tree` of HEAD, but only if `report_clean` is set.
+
+        Items on tracked content are reported in the sort order of Git,
+        followed by any untracked content.
+
+        Parameters
+        ----------
+        paths : list or None
+          See status().
+        untracked : {'no', 'normal', 'all'}
+          See status().
+        eval_submodule_state : {'full', 'commit', 'no'}
+          See status().
+        report_clean : bool
+          If False, no items with a 'clean' state are reported.
+
+        Yields
+        ------
+        tuple
+          Absolute path of an item, and its properties (see status()).
+        """
+        if eval_submodule_state not in ('commit', 'full', 'no'):
+            raise ValueError(
+                'unsupported submodule evaluation mode: {}'.format(
+                    eval_submodule_state))
+        if paths is not None:
+            # at this point we must normalize paths to the form that
+            # Git would report them, to easy matching later on
+            paths = [
+                p.relative_to(self.pathobj) if p.is_absolute() else p
+                for p in map(ut.Path, paths)
+            ]
+            if not paths:
+                return iter([])
+        return self._status_gen_(
+            paths, untracked, eval_submodule_state, report_clean)
+
+    def _status_gen_(self, paths: Optional[list[Path]], untracked: str, eval_submodule_state: str,
+                     report_clean: bool, untracked_first: bool = False) -> Iterator[tuple[Path, dict[str, str]]]:
+        """Internal generator of status_()
+
+        With `untracked_first`, items are reported in the order of
+        diffstatus(): untracked content, tracked content, and staged
+        deletions last. Reports on tracked content are then held in memory.
+        """
+        # also takes care of pending operations in the worktree
+        posix_paths, _, _, _ = \
+            self._prepare_content_info_query(paths, None, untracked)
+        records = self._parse_status_records_(
+            self.call_git_items_(
+                (self._get_worktree_status_options() or []) + [
+                    'status', '--porcelain=v2', '-z', '--no-renames',
+                    # we need to know about any submodule modification,
+                    # regardless of any configuration
+                    '--ignore-submodules=none',
+                    '--untracked-files={}'.format(untracked)],
+                files=posix_paths,
+                sep='\0',
+                read_only=True))
+        # `git status` reports tracked content first, then untracked content
+        untracked_records = []
+
+        def _get_tracked_records() -> Iterator[tuple[str, tuple]]:
+            for rec in records:
+                if rec[3] is None:
+                    untracked_records.append(rec)
+                    return
+                yield rec[0], rec
+
+        clean_items: Iterable[tuple[str, dict]] = []
+        if report_clean and self.get_hexsha() is not None:
+            # anything not reported by `git status` is identical in HEAD,
+            # the index, and the worktree
+            _, _, tree_cmd, tree_props_re = \
+                self._prepare_content_info_query(None, 'HEAD', untracked)
+            clean_items = self._parse_content_info_lines_(
+                'HEAD',
+                self._call_content_info_items_(tree_cmd, 'HEAD', posix_paths),
+                tree_props_re)
+
+        pathobj = self.pathobj
+        # staged deletions of files still present in the worktree, they
+        # will also be reported as untracked
+        deleted = {}
+        tracked = [] if untracked_first else None
+        for fname, rec, clean_state in merge_join_sorted_(
+                _get_tracked_records(), clean_items):
+            f = pathobj.joinpath(ut.PurePosixPath(fname))
+            if rec is None:
+                from_state = to_state = clean_state
+                modified = False
+                flags = None
+            else:
+                _, from_state, to_state, modified, flags = rec
+                if not to_state:
+                    if untracked_first or (
+                            untracked != 'no'
+                            and (f.exists() or f.is_symlink())):
+                        deleted[fname] = from_state
+                        continue
+                    yield f, dict(
+                        state='deleted',
+                        type=from_state['type'],
+                        gitshasum=from_state['gitshasum'],
+                    )
+                    continue
+            props = self._diffstatus_get_state_props(
+                f,
+                from_state,
+                to_state,
+                False,
+                modified,
+                eval_submodule_state)
+            if eval_submodule_state != 'no' \
+                    and 'state' not in props and props['type'] == 'dataset':
+                # `git status` has reported on modifications inside of
+                # submodules already
+                self._diffstatus_eval_submodule(
+                    f, props, untracked, eval_submodule_state, None, flags,
+                    stream=True)
+            if tracked is not None:
+                tracked.append((f, props))
+            elif report_clean or props.get('state', None) != 'clean':
+                yield f, props
+
+        for fname, _, to_state, _, _ in chain(untracked_records, records):
+            f = pathobj.joinpath(ut.PurePosixPath(fname))
+            yield f, self._diffstatus_get_state_props(
+                f,
+                deleted.pop(fname, None),
+                {'gitshasum': None, 'type': _get_untracked_type(f)},
+                False,
+                False,
+                eval_submodule_state)
+        if tracked is not None:
+            for f, props in tracked:
+                if report_clean or props.get('state', None) != 'clean':
+                    yield f, props
+        # staged deletions of content that is not reported as untracked
+        for fname, from_state in deleted.items():
+            yield pathobj.joinpath(ut.PurePosixPath(fname)), dict(
+                state='deleted',
+                type=from_state['type'],
+                gitshasum=from_state['gitshasum'],
+            )
+
+    def _get_submodule_status_flags(self, paths: Optional[list[Path]]) -> dict[str, str]:
+        """Report modified submodules with a single `git status` call
+
+        Git inspects all submodules for a changed commit, and for
+        modifications of tracked content or untracked content in them.
+
+        Parameters
+        ----------
+        paths : list or None
+          Paths (relative to the repository root) to limit the query to.
+
+        Returns
+        -------
+        dict
+          Submodule state flags ('S<c><m><u>') by path (POSIX, relative to
+          the repository root) of any modified submodule. Unmodified
+          submodules are not reported.
+        """
+        return {
+            fname: flags
+            for fname, _, _, _, flags in self._parse_status_records_(
+                self.call_git_items_(
+                    (self._get_worktree_status_options() or []) + [
+                        'status', '--porcelain=v2', '-z', '--no-renames',
+                        '--ignore-submodules=none',
+                        # untracked content in submodules is reported
+                        # regardless
+                        '--untracked-files=no'],
+                    files=[p.as_posix() for p in paths]
+                    if paths is not None else None,
+                    sep='\0',
+                    read_only=True))
+            if flags
+        }
+
+    @staticmethod
+    def _parse_status_records_(items: Iterable[str]) -> Iterator[tuple[str, Optional[dict], Optional[dict], Optional[bool], Optional[str]]]:
+        """Internal helper to parse `git status --porcelain=v2 -z` output
+
+        Yields
+        ------
+        tuple
+          Path (POSIX, relative to the repository root), properties of the
+          HEAD and the index record (None, if there is no record), a
+          flag whether there is a modification in the worktree, and the
+          submodule state flags ('S<c><m><u>', None if not a submodule).
+          For untracked content, only the path is reported, and all other
+          values are None.
+        """
+        def _get_props(mode: str, sha: str) -> Optional[dict]:
+            if mode == '000000':
+                return None
+            return {'gitshasum': sha,
+                    'type': _mode_type_map.get(mode, mode)}
+
+        for item in items:
+            if not item:
+                continue
+            kind = item[0]
+            if kind == '1':
+                # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+                _, xy, sub, mH, mI, _, hH, hI, fname = item.split(' ', 8)
+                if sub[0] == 'S':
+                    # like `ls-files -m`, only a changed commit counts
+                    # as a modification of a submodule
+                    modified = sub[1] == 'C' or xy[1] == 'D'
+                else:
+                    modified = xy[1] != '.'
+                yield fname, _get_props(mH, hH), _get_props(mI, hI), \
+                    modified, sub if sub[0] == 'S' else None
+            elif kind == 'u':
+                # u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+                _, _, _, m1, m2, m3, _, h1, h2, h3, fname = \
+                    item.split(' ', 10)
+                # stage 2 ("ours") is HEAD, the index is represented by
+                # the last stage, like in get_content_info()
+                yield fname, _get_props(m2, h2), \
+                    _get_props(m3, h3) or _get_props(m2, h2) \
+                    or _get_props(m1, h1), True, None
+            elif kind == '?':
+                # untracked directories are reported with a trailing slash
+                yield item[2:].rstrip('/'), None, None, None, None
+            # no renames are reported, and ignored content is not
+            # requested
+
     def _diffstatus_get_state_props(self, f: Path,
                                     from_state: Optional[dict[str, str]],
                                     to_state: dict[str, str],
@@ -24,6 +24,7 @@ from queue import (
     Queue,
 )
 from threading import Thread
+from weakref import finalize
 
 from datalad.support.exceptions import CapturedException
 
@@ -575,6 +576,107 @@ class ProducerConsumerProgressLog(ProducerConsumer):
                      noninteractive_level=5)
 
 
+class Prefetcher:
+    """Evaluate function calls ahead of time, obtain their results in any order
+
+    Calls are registered with `submit()`, under a unique (hashable) key, and
+    evaluated concurrently in a pool of worker threads. `get()` returns the
+    result of a call, waiting for its evaluation if necessary. Any exception
+    raised by a call is re-raised by `get()`. This allows for evaluating
+    independent queries in parallel, while consuming their results in a
+    deterministic order.
+
+    In contrast to `ProducerConsumer`, calls are evaluated as soon as they are
+    submitted, and not only while results are consumed.
+
+    With `jobs` < 2, no calls are evaluated ahead of time, but on `get()`
+    in the calling thread, unless `background` is set.
+
+    It is meant to be used as a context manager, which shuts down all
+    workers on exit.
+
+    Examples
+    --------
+    >>> from datalad.support.parallel import Prefetcher
+    >>> with Prefetcher(jobs=2) as prefetcher:
+    ...     for i in range(3):
+    ...         prefetcher.submit(i, pow, i, 2)
+    ...     [prefetcher.get(i, pow, i, 2) for i in (2, 1, 0)]
+    [4, 1, 0]
+    """
+
+    def __init__(self, jobs=None, background=False):
+        """
+        Parameters
+        ----------
+        jobs: int or None or "auto"
+          Number of calls to evaluate concurrently. If None or "auto",
+          'datalad.runtime.max-jobs' configuration variable is consulted.
+        background: bool, optional
+          If set, calls are evaluated in at least one worker thread, i.e.
+          concurrently with the calling thread, also with `jobs` < 2.
+        """
+        jobs = ProducerConsumer.get_effective_jobs(jobs)
+        if background:
+            jobs = max(1, jobs or 0)
+        self.jobs = jobs if jobs and (jobs > 1 or background) else 0
+        # keys of all calls ever submitted
+        self._submitted = set()
+        # futures of submitted calls, whose results were not yet obtained
+        self._futures = {}
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Cancel all pending calls, and shut down all workers"""
+        if self._executor is not None:
+            self._finalizer.detach()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Register a call of `func(*args, **kwargs)` for evaluation
+
+        Nothing is done, if a call with the same key was submitted before.
+
+        Returns
+        -------
+        Future or None
+          The future of the call, e.g. for other calls to wait for it, or
+          None if it is not evaluated ahead of time.
+        """
+        if not self.jobs or key in self._submitted:
+            return None
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self.jobs, thread_name_prefix='Prefetcher')
+            # do not leave pending calls behind, if close() is never called
+            self._finalizer = finalize(
+                self, self._executor.shutdown, wait=False,
+                cancel_futures=True)
+        self._submitted.add(key)
+        future = self._futures[key] = self._executor.submit(
+            func, *args, **kwargs)
+        return future
+
+    def get(self, key, func, *args, **kwargs):
+        """Return the result of a call
+
+        If no call is pending under `key`, `func(*args, **kwargs)` is
+        evaluated right away.
+        """
+        future = self._futures.pop(key, None)
+        if future is None:
+            return func(*args, **kwargs)
+        return future.result()
+
+
 class _FinalShutdown(Exception):
     """Used internally for the final forceful shutdown if any exception did happen"""
     pass
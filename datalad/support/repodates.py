@@ -21,8 +21,15 @@ from datalad.support.gitrepo import GitRepo
 lgr = logging.getLogger('datalad.repodates')
 
 
+def _blob_content(obj):
+    """Decode the content of a `CatFileObject`, None if it is not a blob"""
+    if obj is None or obj.type != "blob":
+        return None
+    return str(obj.data, "utf-8", errors="replace")
+
+
 def _cat_blob(repo, obj, bad_ok=False):
-    """Call `git cat-file blob OBJ`.
+    """Read the content of blob OBJ, like `git cat-file blob OBJ`.
 
     Parameters
     ----------
@@ -36,20 +43,12 @@ def _cat_blob(repo, obj, bad_ok=False):
     -------
     Blob's content (str) or None if `obj` is not and `bad_ok` is true.
     """
-    if bad_ok:
-        kwds = {"expect_fail": True, "expect_stderr": True}
-    else:
-        kwds = {}
-
-    try:
-        out_cat = repo.call_git(["cat-file", "blob", obj], read_only=True,
-                                **kwds)
-    except CommandError as exc:
-        if bad_ok and "bad file" in exc.stderr:
-            out_cat = None
-        else:
-            raise
-    return out_cat
+    content = _blob_content(repo.cat_file.read(obj))
+    if content is None and not bad_ok:
+        raise CommandError(
+            cmd=["git", "cat-file", "blob", obj],
+            msg="{} is not a known blob".format(obj))
+    return content
 
 
 def branch_blobs(repo, branch):
@@ -79,13 +78,14 @@ def branch_blobs(repo, branch):
     log_progress(lgr.info, "repodates_branch_blobs",
                  "Checking %d objects", num_objects,
                  label="Checking objects", total=num_objects, unit=" objects")
-    # This is inefficient.  It makes a git call for each object, some of which
-    # aren't even blobs.  We could instead use 'git cat-file --batch'.
-    for obj, fname in blob_trees:
+    # All objects are read through a single 'git cat-file --batch' process.
+    # Trees are read too, but skipped.
+    objs = repo.cat_file.read_many(obj for obj, _ in blob_trees)
+    for (obj, fname), cat_obj in zip(blob_trees, objs):
         log_progress(lgr.info, "repodates_branch_blobs",
                      "Checking %s", obj,
                      increment=True, update=1)
-        content = _cat_blob(repo, obj, bad_ok=True)
+        content = _blob_content(cat_obj)
         if content:
             yield obj, content, fname
     log_progress(lgr.info, "repodates_branch_blobs",
@@ -108,27 +108,36 @@ def branch_blobs_in_tree(repo, branch):
     entry per blob is yielded).
     """
     seen_blobs = set()
-    lines = list(repo.call_git_items_(["ls-tree", "-z", "-r", branch],
-                                      sep="\0", read_only=True))
-    if lines:
-        num_lines = len(lines)
+    blobs = []
+    for line in repo.call_git_items_(["ls-tree", "-z", "-r", branch],
+                                     sep="\0", read_only=True):
+        if not line:
+            continue
+        _, obj_type, obj, fname = line.split()
+        if obj_type == "blob" and obj not in seen_blobs:
+            blobs.append((obj, fname))
+        seen_blobs.add(obj)
+    if blobs:
+        num_blobs = len(blobs)
         log_progress(lgr.info,
                      "repodates_blobs_in_tree",
-                     "Checking %d objects in git-annex tree", num_lines,
-                     label="Checking objects", total=num_lines,
+                     "Checking %d blobs in git-annex tree", num_blobs,
+                     label="Checking objects", total=num_blobs,
                      unit=" objects")
-        for line in lines:
-            if not line:
-                continue
-            _, obj_type, obj, fname = line.split()
+        # read all blobs through a single 'git cat-file --batch' process
+        objs = repo.cat_file.read_many(obj for obj, _ in blobs)
+        for (obj, fname), cat_obj in zip(blobs, objs):
             log_progress(lgr.info, "repodates_blobs_in_tree",
                          "Checking %s", obj,
                          increment=True, update=1)
-            if obj_type == "blob" and obj not in seen_blobs:
-                yield obj, _cat_blob(repo, obj), fname
-            seen_blobs.add(obj)
+            content = _blob_content(cat_obj)
+            if content is None:
+                raise CommandError(
+                    cmd=["git", "cat-file", "blob", obj],
+                    msg="{} is not a known blob".format(obj))
+            yield obj, content, fname
         log_progress(lgr.info, "repodates_blobs_in_tree",
-                     "Finished checking %d blobs", num_lines)
+                     "Finished checking %d blobs", num_blobs)
 
 
 # In uuid.log, timestamps look like "timestamp=1523283745.683191724s" and occur
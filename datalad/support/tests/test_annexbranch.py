@@ -0,0 +1,121 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test reading the git-annex branch without git-annex"""
+
+import os
+
+from datalad.support.annexbranch import (
+    AnnexBranchReader,
+    key_log_path,
+)
+from datalad.support.gitrepo import GitRepo
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    with_tempfile,
+)
+
+KEY = 'MD5E-s3--acbd18db4cc2f85cedef654fccc4a4d8.txt'
+
+
+def _commit_annex_branch(repo, files):
+    # commit the given files as the only content of the git-annex branch,
+    # using a separate index
+    env = dict(os.environ, GIT_INDEX_FILE=str(repo.dot_git / 'annex-index'))
+    for path, content in files.items():
+        tmpfile = repo.dot_git / 'annex-blob'
+        tmpfile.write_text(content)
+        sha = repo.call_git_oneline(['hash-object', '-w', str(tmpfile)])
+        repo.call_git(
+            ['update-index', '--add', '--cacheinfo',
+             '100644,{},{}'.format(sha, path)],
+            env=env)
+    tree = repo.call_git(['write-tree'], env=env).strip()
+    commit = repo.call_git(['commit-tree', '-m', 'update', tree]).strip()
+    repo.call_git(['update-ref', 'refs/heads/git-annex', commit])
+
+
+def test_key_log_path():
+    assert_equal(key_log_path(KEY).split('/')[-1], KEY + '.log')
+    assert_equal(len(key_log_path(KEY).split('/')), 3)
+    assert_equal(len(key_log_path(KEY, hash_levels=1).split('/')), 2)
+    # chunk fields are ignored for the hash directories
+    assert_equal(
+        key_log_path('MD5E-s3-S1-C1--acbd18db4cc2f85cedef654fccc4a4d8.txt')
+        .split('/')[:2],
+        key_log_path(KEY).split('/')[:2])
+    # file name escaping
+    assert_equal(
+        key_log_path('URL--http://a%b&c').split('/')[-1],
+        'URL--http&c%%a&sb&ac.log')
+
+
+@with_tempfile(mkdir=True)
+def test_annex_branch_reader(path=None):
+    repo = GitRepo(path, create=True)
+    reader = AnnexBranchReader(repo)
+    # nothing there, no error
+    assert_equal(reader.get_uuids(), {})
+    assert_equal(reader.get_remote_configs(), {})
+    assert_equal(reader.get_trust_levels(), {})
+    assert_equal(list(reader.get_key_locations([KEY])), [[]])
+    assert_equal(list(reader.get_keys()), [])
+
+    _commit_annex_branch(repo, {
+        'uuid.log':
+            'uuid-a here timestamp=1.0s\n'
+            'uuid-b a remote timestamp=1.0s\n'
+            'uuid-a renamed here timestamp=2.0s\n',
+        'remote.log':
+            'uuid-c type=directory name=dir encryption=none '
+            'timestamp=1.0s\n',
+        'trust.log':
+            'uuid-b X timestamp=3.0s\n'
+            'uuid-c 1 timestamp=1.0s\n',
+        key_log_path(KEY):
+            '1.0s 1 uuid-a\n'
+            '1.0s 1 uuid-b\n'
+            '2.0s 0 uuid-b\n'
+            '1.0s 1 uuid-c\n',
+    })
+    assert_equal(reader.get_uuids(),
+                 {'uuid-a': 'renamed here', 'uuid-b': 'a remote'})
+    assert_equal(
+        reader.get_remote_configs(),
+        {'uuid-c': {'type': 'directory', 'name': 'dir',
+                    'encryption': 'none', 'timestamp': '1.0s'}})
+    assert_equal(reader.get_trust_levels(),
+                 {'uuid-b': 'dead', 'uuid-c': 'trusted'})
+    assert_equal(
+        list(reader.get_key_locations([KEY, 'MD5E-s1--unknown', KEY])),
+        [['uuid-a', 'uuid-c'], [], ['uuid-a', 'uuid-c']])
+    assert_equal(list(reader.get_keys()), [KEY])
+    # results are not shared with the cache
+    reader.get_remote_configs()['uuid-c']['name'] = 'changed'
+    assert_equal(reader.get_remote_configs()['uuid-c']['name'], 'dir')
+
+    # uncommitted changes in the journal are considered
+    journal = repo.dot_git / 'annex' / 'journal'
+    journal.mkdir(parents=True)
+    (journal / 'trust.log').write_text('uuid-c 0 timestamp=2.0s\n')
+    (journal / key_log_path(KEY).replace('/', '_')).write_text(
+        '3.0s 0 uuid-a\n')
+    assert_equal(reader.get_trust_levels(),
+                 {'uuid-b': 'dead', 'uuid-c': 'untrusted'})
+    assert_equal(list(reader.get_key_locations([KEY])), [['uuid-c']])
+    # keys only known in the journal are reported too
+    other_key = 'URL--http://example.com/a_b'
+    (journal / key_log_path(other_key).replace('_', '__').replace('/', '_')
+     ).write_text('3.0s 1 uuid-a\n')
+    assert_equal(list(reader.get_keys()), [KEY, other_key])
+    assert_equal(list(reader.get_key_locations([other_key])), [['uuid-a']])
+    # but not for other branches
+    repo.call_git(['branch', 'other', 'git-annex'])
+    assert_equal(
+        AnnexBranchReader(repo, ref='other').get_trust_levels(),
+        {'uuid-b': 'dead', 'uuid-c': 'trusted'})
@@ -53,11 +53,14 @@ from datalad.distribution.dataset import Dataset
 from datalad.runner.gitrunner import GitWitlessRunner
 from datalad.support import path as op
 # imports from same module:
+from datalad.cmd import BatchedCommandPool
 from datalad.support.annexrepo import (
     AnnexJsonProtocol,
     AnnexRepo,
+    BatchedAnnexes,
     GeneratorAnnexJsonNoStderrProtocol,
     GeneratorAnnexJsonProtocol,
+    batched_annexes_pool,
 )
 from datalad.support.exceptions import (
     AnnexBatchCommandError,
@@ -87,7 +90,9 @@ from datalad.tests.utils_pytest import (
     assert_equal,
     assert_false,
     assert_in,
+    assert_is,
     assert_is_instance,
+    assert_is_not,
     assert_not_equal,
     assert_not_in,
     assert_not_is_instance,
@@ -111,6 +116,7 @@ from datalad.tests.utils_pytest import (
     on_github,
     on_nfs,
     on_travis,
+    patch_config,
     serve_path_via_http,
     set_annex_version,
     skip_if,
@@ -303,6 +309,79 @@ def test_AnnexRepo_get_remote_na(src=None, path=None):
     eq_(cme.value.remote, "NotExistingRemote")
 
 
+@with_tempfile
+@with_tempfile
+def test_AnnexRepo_content_index(src=None, path=None):
+    origin = AnnexRepo(src, create=True)
+    (origin.pathobj / 'f1').write_text("content1")
+    (origin.pathobj / 'f2').write_text("content2")
+    origin.save()
+    ar = AnnexRepo.clone(src, path)
+    files = [ar.pathobj / 'f1', ar.pathobj / 'f2']
+
+    def has_content():
+        return [r['has_content'] for r in ar.get_content_annexinfo(
+            files, eval_availability=True).values()]
+
+    with patch_config({'datalad.annex.content-index': True}), \
+            patch.object(ar, '_scan_content',
+                         wraps=ar._scan_content) as scan:
+        eq_(has_content(), [False, False])
+        # the index is updated by get and drop results, without a rescan
+        ar.get('f1')
+        eq_(has_content(), [True, False])
+        info = ar.get_file_annexinfo('f1', eval_availability=True)
+        ok_(Path(info['objloc']).exists())
+        ar.get('f2')
+        ar.drop('f1', options=['--force'])
+        eq_(has_content(), [False, True])
+        eq_(scan.call_count, 1)
+        # any other modification of the annex discards the index
+        (ar.pathobj / 'f3').write_text("content3")
+        ar.add('f3')
+        eq_(has_content(), [False, True])
+        eq_(scan.call_count, 2)
+        # as does git-annex run via call_git()
+        ar.call_git(['annex', 'get', 'f1'])
+        eq_(has_content(), [True, True])
+        eq_(scan.call_count, 3)
+        # results match those without the index
+        fromindex = ar.get_content_annexinfo(files, eval_availability=True)
+    eq_(ar.get_content_annexinfo(files, eval_availability=True), fromindex)
+
+
+@with_tempfile
+@with_tempfile
+def test_AnnexRepo_key_availability(src=None, path=None):
+    origin = AnnexRepo(src, create=True)
+    (origin.pathobj / 'f1').write_text("content1")
+    (origin.pathobj / 'f2').write_text("content2")
+    origin.save()
+    ar = AnnexRepo.clone(src, path)
+    ar.get('f1')
+    key1 = ar.get_file_key('f1')
+    key2 = ar.get_file_key('f2')
+    # make git-annex record everything on the git-annex branch
+    ar.call_annex(['merge'])
+
+    for native in (False, True):
+        table = ar.get_key_availability(native=native)
+        eq_(set(table.keys), {key1, key2})
+        eq_(set(table.locations(key1)), {ar.uuid, origin.uuid})
+        eq_(table.locations(key2), [origin.uuid])
+        eq_(list(table.only_at([origin.uuid])), [key2])
+        eq_(list(table.with_fewer_copies(2)), [key2])
+        table = ar.get_key_availability(
+            keys=[key2, 'MD5E-s1--unknown'], native=native)
+        eq_(table.copies(), [1, 0])
+    # dead annexes are not reported
+    ar.call_annex(['dead', origin.uuid])
+    for native in (False, True):
+        table = ar.get_key_availability(native=native)
+        eq_(table.locations(key1), [ar.uuid])
+        eq_(list(table.nowhere()), [key2])
+
+
 @with_sameas_remote
 def test_annex_repo_sameas_special(repo=None):
     remotes = repo.get_special_remotes()
@@ -1129,6 +1208,53 @@ def test_AnnexRepo_addurl_to_file_batched(sitepath=None, siteurl=None, dst=None)
     # TODO: verify that file is added with that backend and that we got a new batched process
 
 
+def test_batched_annexes_shared_pool():
+    # processes are only started on demand, hence none is run here
+    pool = BatchedCommandPool(max_size=10, max_per_owner=10, max_idle=60)
+    with patch('datalad.support.annexrepo.batched_annexes_pool', pool):
+        batched = BatchedAnnexes(path='/some/repo')
+        find = batched.get('find', json=True, path='/some/repo')
+        addurl = batched.get('addurl', path='/some/repo')
+        # another instance for the same repository reuses the processes
+        other = BatchedAnnexes(path='/some/repo')
+        assert_is(other.get('find', json=True, path='/some/repo'), find)
+        assert_is_not(
+            BatchedAnnexes(path='/other/repo').get(
+                'find', json=True, path='/other/repo'),
+            find)
+        eq_(pool.stats, {'hits': 1, 'misses': 3})
+
+        # all processes end with the instance
+        batched.release()
+        eq_(len(pool), 1)
+        assert_is_not(other.get('find', json=True, path='/some/repo'), find)
+        assert_is_not(other.get('addurl', path='/some/repo'), addurl)
+        other.clear()
+        eq_(len(pool), 1)
+        # idle processes of other repositories are closed on release, too
+        pool.max_idle = 0
+        other.release()
+        eq_(len(pool), 0)
+
+
+@with_tempfile
+def test_AnnexRepo_flyweight_invalid_batched(path=None):
+    repo = AnnexRepo(path, create=True)
+    repo._batched.get('find', json=True, path=repo.path)
+
+    def pooled():
+        return [k for k in batched_annexes_pool._commands
+                if k[0] == str(repo.path)]
+
+    eq_(len(pooled()), 1)
+    ok_(not repo._flyweight_invalid())
+    eq_(len(pooled()), 1)
+    # a new instance for the path must not reuse the processes
+    rmtree(str(repo.dot_git))
+    ok_(repo._flyweight_invalid())
+    eq_(pooled(), [])
+
+
 @with_tree(tree={"foo": "foo content"})
 @serve_path_via_http()
 @with_tree(tree={"bar": "bar content"})
@@ -1799,7 +1925,8 @@ def test_AnnexRepo_flyweight(path1=None, path2=None):
     del repo1
     del repo2
 
-    # for testing that destroying the object calls close() on BatchedAnnex:
+    # for testing that destroying the object calls release() on
+    # BatchedAnnexes:
     class Dummy:
         def __init__(self, *args, **kwargs):
             self.close_called = False
@@ -1811,14 +1938,14 @@ def test_AnnexRepo_flyweight(path1=None, path2=None):
 
     # Killing last reference will lead to garbage collection which will call
     # AnnexRepo's finalizer:
-    with patch.object(repo3._batched, 'close', fake_batch.close):
+    with patch.object(repo3._batched, 'release', fake_batch.close):
         with swallow_logs(new_level=1) as cml:
             del repo3
             gc.collect()  # TODO: see first comment above
             cml.assert_logged(msg="Finalizer called on: AnnexRepo(%s)" % path1,
                               level="Level 1",
                               regex=False)
-            # finalizer called close() on BatchedAnnex:
+            # finalizer called release() on BatchedAnnexes:
             assert_true(fake_batch.close_called)
 
     # Flyweight is gone:
@@ -2934,6 +3061,43 @@ def test_annex_json_protocol_total_progress_finishes_on_all_errored():
     assert "update" not in pbar_calls[0].kwargs
 
 
+@pytest.mark.parametrize("fast", [True, False])
+def test_annex_json_protocol_chunked(fast):
+    from datalad.support import annexrepo as ar_mod
+
+    records = [
+        {"command": "get", "file": "f{}".format(i), "key": "MD5E-s1--x",
+         "success": True, "size": 2 ** 70}
+        for i in range(100)
+    ]
+    data = b"".join(json.dumps(r).encode() + b"\n" for r in records)
+    with patch.object(ar_mod, "orjson", ar_mod.orjson if fast else None):
+        # arbitrary chunk boundaries, including right at line ends
+        for chunk_size in (1, 7, 100, len(data)):
+            proto = _make_annex_json_protocol(total_nbytes=None)
+            for i in range(0, len(data), chunk_size):
+                proto.pipe_data_received(1, data[i:i + chunk_size])
+            eq_(proto.json_out, records)
+            eq_(proto._unprocessed, None)
+
+
+def test_annex_json_protocol_progress_not_reported():
+    from datalad.support import annexrepo as ar_mod
+
+    proto = _make_annex_json_protocol(total_nbytes=20_000)
+    proto._report_progress = False
+    action = {"command": "get", "key": "MD5E-s10000--abc.dat",
+              "file": "big.dat"}
+    with patch.object(ar_mod, "log_progress") as mock_lp:
+        proto._proc_json_record({
+            "action": action, "byte-progress": 1_000, "total-size": 10_000,
+        })
+        proto._proc_json_record(dict(action, success=False))
+    mock_lp.assert_not_called()
+    # only the final record is returned
+    eq_(proto.json_out, [dict(action, success=False)])
+
+
 def test_generator_annex_json_protocol():
 
     runner = Runner()
@@ -0,0 +1,53 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test the table of key locations"""
+
+from datalad.support.availability import KeyAvailability
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_in,
+    assert_not_in,
+)
+
+
+def test_key_availability():
+    table = KeyAvailability.from_whereis_records([
+        {'key': 'k1', 'whereis': [{'uuid': 'here'}, {'uuid': 'origin'}]},
+        {'key': 'k2', 'whereis': [{'uuid': 'here'}],
+         'untrusted': [{'uuid': 'tmp'}]},
+        {'key': 'k3', 'whereis': [{'uuid': 'origin'}]},
+        {'key': 'k4', 'whereis': []},
+        # not an annexed file
+        {'file': 'some', 'success': False},
+    ])
+    assert_equal(table.keys, ['k1', 'k2', 'k3', 'k4'])
+    assert_equal(len(table), 4)
+    assert_in('k1', table)
+    assert_not_in('some', table)
+    assert_equal(table.locations('k2'), ['here', 'tmp'])
+    assert_equal(table.copies(), [2, 2, 1, 0])
+    assert_equal(table.copies(exclude=['tmp', 'unknown']), [2, 1, 1, 0])
+    assert_equal(list(table.with_fewer_copies(2)), ['k3', 'k4'])
+    assert_equal(list(table.with_fewer_copies(2, exclude=['tmp'])),
+                 ['k2', 'k3', 'k4'])
+    assert_equal(list(table.only_at(['here'])), [])
+    assert_equal(list(table.only_at(['here', 'tmp'])), ['k2'])
+    assert_equal(list(table.only_at(['origin'])), ['k3'])
+    assert_equal(list(table.nowhere()), ['k4'])
+    # locations are added up
+    table.add('k4', ['here'])
+    table.add('k3', ['here'])
+    assert_equal(table.copies(), [2, 2, 2, 1])
+    assert_equal(list(table.nowhere()), [])
+
+    # many annexes are no problem
+    table = KeyAvailability()
+    table.add('k', ['u{}'.format(i) for i in range(200)])
+    assert_equal(table.copies(exclude=['u0', 'u199']), [198])
+    assert_equal(table.locations('k')[-1], 'u199')
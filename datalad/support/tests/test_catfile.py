@@ -0,0 +1,112 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test reading Git objects via persistent `git cat-file` processes"""
+
+from datalad.support.catfile import CatFileService
+from datalad.support.gitrepo import GitRepo
+from datalad.support.repodates import (
+    branch_blobs,
+    branch_blobs_in_tree,
+)
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_false,
+    assert_in,
+    assert_is,
+    assert_is_none,
+    assert_raises,
+    with_tree,
+)
+
+
+@with_tree(tree={"foo": "foo content",
+                 "bar": "bar content\n" * 10000})
+def test_catfile(path=None):
+    repo = GitRepo(path, create=True)
+    repo.save(message="add files")
+    service = repo.cat_file
+    # one service per repository
+    assert_is(repo.cat_file, service)
+
+    foo = service.read("HEAD:foo")
+    assert_equal(foo.type, "blob")
+    assert_equal(foo.size, 11)
+    assert_equal(bytes(foo.data), b"foo content")
+    assert_equal(foo.sha, repo.call_git_oneline(
+        ["rev-parse", "HEAD:foo"], read_only=True))
+    assert_is_none(service.read("HEAD:missing"))
+
+    tree = service.check("HEAD^{tree}")
+    assert_equal(tree.type, "tree")
+    assert_is_none(tree.data)
+
+    # many requests are pipelined, and answered in order
+    objs = ["HEAD:bar", "HEAD:missing", "HEAD:foo"] * 100
+    objs_read = list(service.read_many(objs))
+    assert_equal(len(objs_read), len(objs))
+    for obj, obj_read in zip(objs, objs_read):
+        if obj == "HEAD:missing":
+            assert_is_none(obj_read)
+        else:
+            assert_equal(obj_read.size,
+                         11 if obj == "HEAD:foo" else 12 * 10000)
+    assert_equal(
+        [o.type for o in service.check_many(["HEAD", "HEAD^{tree}"])],
+        ["commit", "tree"])
+    # processes were reused
+    assert_equal(len(service._processes), 2)
+
+    # an abandoned request leaves a process with unread responses behind,
+    # it is closed, and restarted for the next request
+    gen = service.read_many(objs)
+    next(gen)
+    gen.close()
+    assert_equal(len(service._processes), 2)
+    assert_false(any(p.process_running()
+                     for p in service._processes if not p.check))
+    assert_equal(bytes(service.read("HEAD:foo").data), b"foo content")
+
+    # object names with a newline cannot be requested
+    with assert_raises(ValueError):
+        service.read("HEAD:foo\nHEAD:bar")
+    service.close()
+    assert_equal(service._processes, [])
+    # processes are started again on demand
+    assert_equal(service.check("HEAD:foo").size, 11)
+    service.close()
+
+    # blobs are read through the service
+    blobs = {fname: content for _, content, fname
+             in branch_blobs_in_tree(repo, "HEAD")}
+    assert_equal(blobs["foo"], "foo content")
+    assert_equal(set(blobs), {"foo", "bar"})
+    assert_equal(
+        {fname for _, _, fname in branch_blobs(repo, "HEAD")},
+        {"foo", "bar"})
+    # a service can also be used without a repository instance
+    assert_equal(CatFileService(repo.pathobj).read("HEAD:foo").size, 11)
+
+    # processes end with the repository instance
+    assert_equal(service.check("HEAD:foo").size, 11)
+    repo._finalizer()
+    assert_equal(service._processes, [])
+
+
+@with_tree(tree={"foo": "foo content"})
+def test_catfile_stderr(path=None):
+    repo = GitRepo(path, create=True)
+    repo.save(message="add file")
+    repo.call_git(["branch", "dup"])
+    repo.call_git(["tag", "dup"])
+    service = CatFileService(repo.pathobj)
+    # warnings of git cat-file are collected, not passed on
+    assert_equal(service.check("dup").type, "commit")
+    process = service._processes[0]
+    assert_in("ambiguous", process.close(return_stderr=True))
+    service.close()
@@ -8,21 +8,28 @@
 """Test file info getters"""
 
 
+import os
 import os.path as op
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import datalad.utils as ut
 from datalad.distribution.dataset import Dataset
 from datalad.support.exceptions import NoSuchPathError
+from datalad.support.external_versions import external_versions
+from datalad.support import gitrepo
 from datalad.support.gitrepo import GitRepo
 from datalad.tests.utils_pytest import (
     assert_dict_equal,
     assert_equal,
     assert_false,
     assert_in,
+    assert_not_equal,
     assert_not_in,
     assert_raises,
     assert_repo_status,
+    assert_true,
     get_annexstatus,
     get_convoluted_situation,
     known_failure_githubci_win,
@@ -284,6 +291,45 @@ def test_annexinfo_init(path=None):
     assert_not_in("gitshasum", cinfo_init_none[foo])
 
 
+@with_tree(tree={'annexed': 'annexed content',
+                 'ingit': 'git content',
+                 'dir': {'sub': 'sub content'}})
+def test_get_content_annexinfo_batch(path=None):
+    ds = Dataset(path).create(force=True)
+    ds.save('ingit', to_git=True)
+    ds.save()
+    files = [ds.pathobj / 'annexed', ds.pathobj / 'ingit',
+             ds.pathobj / 'dir' / 'sub']
+    info = ds.repo.get_content_annexinfo(paths=files, eval_availability=True)
+    assert_in('key', info[ds.pathobj / 'annexed'])
+    assert_not_in('key', info[ds.pathobj / 'ingit'])
+    assert_equal(
+        ds.repo.get_content_annexinfo(
+            paths=files, eval_availability=True, batch=True),
+        info)
+    # the batched process is kept for subsequent queries
+    assert_true(any(c.startswith('find:') for c in ds.repo._batched))
+    assert_equal(
+        ds.repo.get_content_annexinfo(paths=files[:1], batch=True),
+        ds.repo.get_content_annexinfo(paths=files[:1]))
+    # directories are not supported in batch mode, but still reported on
+    assert_equal(
+        ds.repo.get_content_annexinfo(paths=[ds.pathobj / 'dir'],
+                                      batch=True),
+        ds.repo.get_content_annexinfo(paths=[ds.pathobj / 'dir']))
+
+    # by default, batch mode is only used if configured, and for no more
+    # than the configured number of paths
+    ds.repo._batched.clear()
+    expected = ds.repo.get_content_annexinfo(paths=files[:2])
+    assert_false(ds.repo._batched)
+    ds.config.set('datalad.annex.batch-annexinfo', '2', scope='local')
+    ds.repo.get_content_annexinfo(paths=files)
+    assert_false(ds.repo._batched)
+    assert_equal(ds.repo.get_content_annexinfo(paths=files[:2]), expected)
+    assert_true(ds.repo._batched)
+
+
 @with_tempfile
 def test_info_path_inside_submodule(path=None):
     ds = Dataset(path).create()
@@ -390,3 +436,389 @@ def test_get_file_annexinfo(path=None):
         ds.pathobj / 'dir1' / 'dropped', eval_availability=True)
     assert_equal(props['has_content'], False)
     assert_not_in('objloc', props)
+
+
+@with_tree(tree={'file_clean': 'clean',
+                 'file_modified': 'orig',
+                 'subdir': {'file_deep': 'deep'}})
+def test_get_content_info_cache(path=None):
+    repo = GitRepo(path, create=True)
+    repo.save()
+    (repo.pathobj / 'file_modified').write_text('modified')
+    (repo.pathobj / 'file_untracked').write_text('untracked')
+    (repo.pathobj / 'dir_untracked').mkdir()
+    (repo.pathobj / 'dir_untracked' / 'file').write_text('untracked')
+    queries = [
+        dict(),
+        dict(untracked='normal'),
+        dict(untracked='no'),
+        dict(ref='HEAD'),
+        dict(ref=repo.get_hexsha()),
+    ]
+    uncached = [repo.get_content_info(**q) for q in queries]
+
+    repo.config.set('datalad.repo.content-info-cache', 'true',
+                    scope='local')
+    cachedir = repo.dot_git / 'datalad' / 'cache' / 'content-info'
+    # cold and warm cache give identical results, in identical order
+    for i in range(2):
+        for q, ref in zip(queries, uncached):
+            res = repo.get_content_info(**q)
+            assert_equal(res, ref)
+            assert_equal(list(res), list(ref))
+    assert_true((cachedir / 'index').exists())
+    # 'HEAD' is cached under its tree, the commit under its own SHA
+    assert_equal(len(list(cachedir.glob('tree-*'))), 2)
+    # records handed out are independent of the cache
+    res = repo.get_content_info(untracked='no')
+    res[repo.pathobj / 'file_clean']['type'] = 'mangled'
+    assert_equal(repo.get_content_info(untracked='no'), uncached[2])
+    # a path constrained query does not use the cache
+    assert_equal(
+        list(repo.get_content_info(paths=['file_clean'])),
+        [repo.pathobj / 'file_clean'])
+
+    # any change to the index invalidates the report
+    repo.add(['file_modified', 'file_untracked'])
+    res = repo.get_content_info(untracked='no')
+    assert_in(repo.pathobj / 'file_untracked', res)
+    assert_not_equal(
+        res[repo.pathobj / 'file_modified']['gitshasum'],
+        uncached[2][repo.pathobj / 'file_modified']['gitshasum'])
+    repo.call_git(['rm', '--cached', '-q', 'file_clean'])
+    assert_not_in(repo.pathobj / 'file_clean',
+                  repo.get_content_info(untracked='no'))
+    # invalid references are still reported as such
+    assert_raises(ValueError, repo.get_content_info, ref='nothere')
+
+
+@with_tree(tree={'file_clean': 'clean',
+                 'file_modified': 'orig'})
+def test_get_content_info_cache_status_refresh(path=None):
+    repo = GitRepo(path, create=True)
+    repo.save()
+    (repo.pathobj / 'file_modified').write_text('modified')
+    expected = repo.diffstatus(fr='HEAD', to=None)
+    for var in ('datalad.repo.content-info-cache',
+                'datalad.status.untracked-cache'):
+        repo.config.set(var, 'true', scope='local')
+    cache = repo._get_content_info_cache()
+    assert_equal(repo.diffstatus(fr='HEAD', to=None), expected)
+    fingerprint = cache.get_index_fingerprint()
+    # new stat data of an unmodified file make `git status` rewrite the
+    # index, but the cached index report remains valid
+    time.sleep(1.1)
+    os.utime(repo.pathobj / 'file_clean')
+    with patch.object(GitRepo, '_get_worktree_status',
+                      autospec=True,
+                      side_effect=GitRepo._get_worktree_status) as wt_status, \
+            patch.object(GitRepo, '_call_content_info_cmd',
+                         autospec=True,
+                         side_effect=GitRepo._call_content_info_cmd) as ci_cmd:
+        assert_equal(repo.diffstatus(fr='HEAD', to=None), expected)
+    wt_status.assert_called_once()
+    assert_not_equal(cache.get_index_fingerprint(), fingerprint)
+    assert_false(any('--stage' in c.args[1] for c in ci_cmd.call_args_list))
+    # a changed index still invalidates the report
+    repo.add(['file_modified'])
+    assert_equal(
+        repo.diffstatus(fr='HEAD', to=None)[
+            repo.pathobj / 'file_modified']['state'],
+        'modified')
+
+
+@with_tempfile
+def test_diffstatus_stream(path=None):
+    ds = Dataset(path).create(annex=False)
+    sub = ds.create('sub', annex=False)
+    for name in ('clean', 'modified', 'deleted', 'staged'):
+        (ds.pathobj / name).write_text(name)
+    (ds.pathobj / 'dir').mkdir()
+    (ds.pathobj / 'dir' / 'unstaged').write_text('unstaged')
+    ds.save()
+    (ds.pathobj / 'modified').write_text('changed')
+    (ds.pathobj / 'deleted').unlink()
+    (ds.pathobj / 'staged').write_text('changed')
+    ds.repo.add(['staged'])
+    ds.repo.call_git(['rm', '--cached', '-q', op.join('dir', 'unstaged')])
+    (ds.pathobj / 'untracked').mkdir()
+    (ds.pathobj / 'untracked' / 'file').write_text('untracked')
+    # sorts between 'dir' and 'dir/...'
+    (ds.pathobj / 'dir-untracked').write_text('untracked')
+    (sub.pathobj / 'new').write_text('new')
+
+    for kwargs in (dict(),
+                   dict(untracked='normal'),
+                   dict(untracked='no'),
+                   dict(eval_submodule_state='commit'),
+                   dict(eval_submodule_state='no'),
+                   dict(paths=['dir', 'sub', 'modified'])):
+        res = list(ds.repo.diffstatus_(fr='HEAD', to=None, **kwargs))
+        assert_equal(
+            dict(res),
+            ds.repo.diffstatus(fr='HEAD', to=None, **kwargs))
+    # reported in Git's sort order of file paths
+    res = [str(p) for p, _ in ds.repo.diffstatus_(fr='HEAD', to=None)]
+    assert_equal(res, sorted(res))
+    assert_equal(
+        dict(ds.repo.diffstatus_(fr='HEAD', to=None))[sub.pathobj]['state'],
+        'modified')
+    # comparison of commits
+    assert_equal(
+        dict(ds.repo.diffstatus_(fr='HEAD~1', to='HEAD')),
+        ds.repo.diffstatus(fr='HEAD~1', to='HEAD'))
+    assert_equal(
+        dict(ds.repo.diffstatus_(fr=None, to='HEAD')),
+        ds.repo.diffstatus(fr=None, to='HEAD'))
+    # no records for no paths
+    assert_equal(list(ds.repo.diffstatus_(fr='HEAD', to=None, paths=[])), [])
+    # invalid references are reported right away
+    assert_raises(ValueError, ds.repo.diffstatus_, fr='nothere', to=None)
+    # streamed content info is identical to the full report
+    assert_equal(list(ds.repo.get_content_info_()),
+                 list(ds.repo.get_content_info().items()))
+    assert_equal(list(ds.repo.get_content_info_(ref='HEAD')),
+                 list(ds.repo.get_content_info(ref='HEAD').items()))
+
+
+@with_tempfile
+def test_diffstatus_stream_subds_closed(path=None):
+    ds = Dataset(path).create(annex=False)
+    sub = ds.create('sub', annex=False)
+    for name in ('a', 'b', 'c'):
+        (sub.pathobj / name).write_text(name)
+
+    orig_diffstatus_ = GitRepo.diffstatus_
+    closed = []
+
+    def diffstatus_(self, *args, **kwargs):
+        try:
+            yield from orig_diffstatus_(self, *args, **kwargs)
+        finally:
+            closed.append(self.path)
+
+    # a changed commit is reported for the subdataset (e.g. on an adjusted
+    # branch), hence it is inspected itself
+    with patch.object(GitRepo, 'diffstatus_', diffstatus_), \
+            patch.object(GitRepo, '_get_submodule_status_flags',
+                         return_value={'sub': 'SC.U'}):
+        res = dict(ds.repo.diffstatus_(fr='HEAD', to=None))
+    assert_equal(res[sub.pathobj]['state'], 'modified')
+    # the inspection of the subdataset stopped at the first modification,
+    # and was shut down right away
+    assert_in(sub.path, closed)
+
+
+@with_tempfile
+def test_get_content_info_table(path=None):
+    ds = Dataset(path).create(annex=False)
+    ds.create('sub', annex=False)
+    (ds.pathobj / 'file').write_text('file')
+    (ds.pathobj / 'dir').mkdir()
+    (ds.pathobj / 'dir' / 'file').write_text('file')
+    ds.save()
+    (ds.pathobj / 'untracked').mkdir()
+    (ds.pathobj / 'untracked' / 'file').write_text('untracked')
+    (ds.pathobj / 'link').symlink_to('file')
+
+    for kwargs in (dict(),
+                   dict(untracked='normal'),
+                   dict(untracked='no'),
+                   dict(ref='HEAD'),
+                   dict(paths=['dir', 'sub'])):
+        info = ds.repo.get_content_info(**kwargs)
+        table = ds.repo.get_content_info_table(**kwargs)
+        assert_equal(len(table), len(info))
+        # same content, same order
+        assert_equal(list(table), list(info))
+        assert_equal(table.to_dict(), info)
+        assert_equal(dict(table), info)
+        for p, props in info.items():
+            assert_in(p, table)
+            assert_equal(table[p], props)
+    table = ds.repo.get_content_info_table(ref='HEAD')
+    rec = table[ds.pathobj / 'file']
+    assert_equal(rec['type'], 'file')
+    assert_equal(rec['bytesize'], 4)
+    assert_equal(rec.copy(), dict(rec))
+    assert_not_in('bytesize', table[ds.pathobj / 'sub'])
+    assert_equal(table.get_rel('dir/file'), table[ds.pathobj / 'dir' / 'file'])
+    assert_equal(table.get_rel('nothere'), None)
+    assert_not_in(ds.pathobj / 'nothere', table)
+    assert_not_in(Path('/elsewhere'), table)
+    assert_raises(KeyError, table.__getitem__, ds.pathobj / 'nothere')
+    # untracked content has no gitshasum
+    table = ds.repo.get_content_info_table()
+    assert_equal(table[ds.pathobj / 'link'],
+                 {'gitshasum': None, 'type': 'symlink'})
+    assert_equal(len(ds.repo.get_content_info_table(paths=[])), 0)
+
+
+@with_tempfile
+def test_diffstatus_untracked_cache(path=None):
+    ds = Dataset(path).create(annex=False)
+    sub = ds.create('sub', annex=False)
+    ds.create('sub_modified', annex=False)
+    for name in ('clean', 'modified', 'deleted', 'staged'):
+        (ds.pathobj / name).write_text(name)
+    ds.save()
+    (ds.pathobj / 'modified').write_text('changed')
+    (ds.pathobj / 'deleted').unlink()
+    (ds.pathobj / 'staged').write_text('changed')
+    ds.repo.add(['staged'])
+    (ds.pathobj / 'untracked').mkdir()
+    (ds.pathobj / 'untracked' / 'file').write_text('untracked')
+    (sub.pathobj / 'new').write_text('new')
+    (ds.pathobj / 'sub_modified' / 'new').write_text('new')
+    Dataset(ds.pathobj / 'sub_modified').save()
+    assert_equal(ds.repo.status(paths=['sub_modified'])[
+        ds.pathobj / 'sub_modified']['state'], 'modified')
+
+    for kwargs in (dict(),
+                   dict(untracked='normal'),
+                   dict(untracked='no'),
+                   dict(eval_submodule_state='commit'),
+                   dict(paths=['untracked', 'sub', 'modified'])):
+        expected = ds.repo.diffstatus(fr='HEAD', to=None, **kwargs)
+        for var, val in (('datalad.status.untracked-cache', 'true'),
+                         ('datalad.status.fsmonitor', 'true')):
+            ds.config.set(var, val, scope='local')
+            assert_true(ds.repo._get_worktree_status_options())
+            res = ds.repo.diffstatus(fr='HEAD', to=None, **kwargs)
+            ds.config.unset(var, scope='local')
+            assert_equal(res, expected)
+            assert_equal(list(res), list(expected))
+    # Git maintains the cache in the index
+    assert_in('UNTR',
+              (ds.repo.dot_git / 'index').read_bytes().decode('latin-1'))
+
+
+@with_tempfile
+def test_status_porcelain(path=None):
+    ds = Dataset(path).create(annex=False)
+    sub = ds.create('sub', annex=False)
+    ds.create('sub_modified', annex=False)
+    for name in ('clean', 'modified', 'deleted', 'staged', 'rm_cached',
+                 op.join('dir', 'rm_cached'), op.join('dir', 'clean')):
+        (ds.pathobj / name).parent.mkdir(exist_ok=True)
+        (ds.pathobj / name).write_text(name)
+    ds.save()
+    (ds.pathobj / 'modified').write_text('changed')
+    (ds.pathobj / 'deleted').unlink()
+    (ds.pathobj / 'staged').write_text('changed')
+    (ds.pathobj / 'added').write_text('added')
+    ds.repo.add(['staged', 'added'])
+    ds.repo.call_git(['rm', '--cached', '-q', 'rm_cached', 'dir/rm_cached'])
+    (ds.pathobj / 'untracked').mkdir()
+    (ds.pathobj / 'untracked' / 'file').write_text('untracked')
+    (sub.pathobj / 'new').write_text('new')
+    (ds.pathobj / 'sub_modified' / 'new').write_text('new')
+    Dataset(ds.pathobj / 'sub_modified').save()
+
+    head = ds.repo.get_hexsha()
+    for kwargs in (dict(),
+                   dict(untracked='normal'),
+                   dict(untracked='no'),
+                   dict(eval_submodule_state='commit'),
+                   dict(eval_submodule_state='no'),
+                   dict(paths=['dir', 'sub', 'modified'])):
+        # comparison with an explicit commit does not take the `git status`
+        # shortcut
+        expected = ds.repo.diffstatus(fr=head, to=None, **kwargs)
+        assert_equal(dict(ds.repo.status_(**kwargs)), expected)
+        # the shortcut is only taken when enabled
+        with patch.object(GitRepo, '_status_gen_') as status_gen:
+            assert_equal(ds.repo.diffstatus(fr='HEAD', to=None, **kwargs),
+                         expected)
+        status_gen.assert_not_called()
+        ds.config.set('datalad.status.porcelain', 'true', scope='local')
+        res = ds.repo.diffstatus(fr='HEAD', to=None, **kwargs)
+        ds.config.unset('datalad.status.porcelain', scope='local')
+        assert_equal(res, expected)
+        # untracked content first, staged deletions last, like before
+        assert_equal(list(res), list(expected))
+        if kwargs.get('eval_submodule_state') != 'no':
+            assert_equal(
+                dict(ds.repo.status_(report_clean=False, **kwargs)),
+                {k: v for k, v in expected.items()
+                 if v.get('state', None) != 'clean'})
+    ds.config.set('datalad.status.porcelain', 'true', scope='local')
+    assert_equal(
+        ds.repo.diffstatus(fr='HEAD', to=None,
+                           eval_submodule_state='global'),
+        'modified')
+    assert_equal(
+        ds.repo.diffstatus(fr='HEAD', to=None, paths=['dir/clean'],
+                           eval_submodule_state='global'),
+        'clean')
+    # reports are reused from a given cache
+    cache = {}
+    res = ds.repo.diffstatus(fr='HEAD', to=None, _cache=cache)
+    with patch.object(GitRepo, '_status_gen_') as status_gen:
+        assert_equal(ds.repo.diffstatus(fr='HEAD', to=None, _cache=cache),
+                     res)
+    status_gen.assert_not_called()
+    assert_equal(list(ds.repo.status_(paths=[])), [])
+    assert_raises(ValueError, ds.repo.status_, eval_submodule_state='global')
+
+
+@with_tempfile
+def test_diffstatus_submodules_batched(path=None):
+    ds = Dataset(path).create(annex=False)
+    subs = {name: ds.create(name, annex=False)
+            for name in ('clean', 'tracked', 'untracked', 'commit')}
+    ds.save()
+    (subs['tracked'].pathobj / 'file').write_text('file')
+    subs['tracked'].repo.add('file')
+    (subs['untracked'].pathobj / 'file').write_text('file')
+    subs['commit'].repo.commit(msg='new', options=['--allow-empty'])
+
+    head = ds.repo.get_hexsha()
+    for untracked, expected in (
+            ('all', {'clean': 'clean', 'tracked': 'modified',
+                     'untracked': 'modified', 'commit': 'modified'}),
+            ('no', {'clean': 'clean', 'tracked': 'modified',
+                    'untracked': 'clean', 'commit': 'modified'})):
+        for fr in ('HEAD', head):
+            with patch.object(gitrepo, 'repo_from_path',
+                              wraps=gitrepo.repo_from_path) as rfp:
+                status = ds.repo.diffstatus(
+                    fr=fr, to=None, untracked=untracked,
+                    paths=list(subs), eval_submodule_state='full')
+            assert_equal(
+                {p.name: props['state'] for p, props in status.items()},
+                expected)
+            # only the subdataset with a changed commit had to be inspected
+            assert_equal([c.args[0] for c in rfp.call_args_list],
+                         [str(subs['commit'].pathobj)])
+            streamed = dict(ds.repo.diffstatus_(
+                fr=fr, to=None, untracked=untracked, paths=list(subs)))
+            assert_equal(
+                {p.name: props['state'] for p, props in streamed.items()},
+                expected)
+
+
+@skip_if(cond=not external_versions['cmd:annex'],
+         msg='adjusted branches require git-annex')
+@with_tempfile
+def test_diffstatus_submodules_adjusted(path=None):
+    ds = Dataset(path).create()
+    sub = ds.create('sub')
+    (sub.pathobj / 'file').write_text('file')
+    sub.save()
+    sub.repo.adjust()
+    corresponding = sub.repo.get_hexsha(sub.repo.get_corresponding_branch())
+    assert_not_equal(sub.repo.get_hexsha(), corresponding)
+    # record the adjusted HEAD, like `git annex sync` would
+    ds.repo.call_git(['commit', '-q', '-m', 'adjusted', '--', 'sub'])
+
+    head = ds.repo.get_hexsha()
+    for porcelain in ('false', 'true'):
+        ds.config.set('datalad.status.porcelain', porcelain, scope='local')
+        for fr in ('HEAD', head):
+            for res in (ds.repo.diffstatus(fr=fr, to=None, paths=['sub']),
+                        dict(ds.repo.diffstatus_(fr=fr, to=None,
+                                                 paths=['sub']))):
+                # the commit of the corresponding branch is reported
+                assert_equal(res[sub.pathobj]['state'], 'clean')
+                assert_equal(res[sub.pathobj]['gitshasum'], corresponding)
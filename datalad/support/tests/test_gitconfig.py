@@ -0,0 +1,342 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test in-process reader and writer for Git configuration"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from datalad.config import (
+    ConfigManager,
+    parse_gitconfig_dump,
+)
+from datalad.runner import (
+    CommandError,
+    GitRunner,
+    StdOutErrCapture,
+)
+from datalad.support.gitconfig import (
+    GitConfigReader,
+    UnsupportedGitConfig,
+    canonicalize_gitconfig_key,
+    edit_gitconfig_file,
+    parse_gitconfig,
+    wildmatch_to_regex,
+)
+from datalad.support.gitrepo import GitRepo
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_false,
+    assert_raises,
+    assert_true,
+    skip_if_on_windows,
+)
+
+_config_text = """\
+# comment
+[Core]
+\tBare = false ; comment
+\tflag
+\tempty =
+[remote "Orig In"]
+\turl = "quoted # not comment"  trailing   spaces  \t
+\tfetch = a\\tb\\\\c\\"d
+\tmulti = one
+\tmulti = two
+\tcont = line1 \\
+line2
+[Sec.Sub]  key = sameline
+[esc "a\\"b\\\\c"]
+\tx = "  lead"   mid  "  tail  "
+[dos]\r
+\tk = v\r
+"""
+
+
+def test_parse_gitconfig():
+    assert_equal(
+        list(parse_gitconfig(_config_text)),
+        [('core.bare', 'false'),
+         ('core.flag', None),
+         ('core.empty', ''),
+         ('remote.Orig In.url', 'quoted # not comment  trailing   spaces'),
+         ('remote.Orig In.fetch', 'a\tb\\c"d'),
+         ('remote.Orig In.multi', 'one'),
+         ('remote.Orig In.multi', 'two'),
+         ('remote.Orig In.cont', 'line1 line2'),
+         ('sec.sub.key', 'sameline'),
+         ('esc.a"b\\c.x', '  lead   mid    tail  '),
+         ('dos.k', 'v')])
+    for invalid in ('key = value',
+                    '[sec]\n1key = value',
+                    '[sec\nkey = value',
+                    '[sec]\nkey = "open',
+                    '[sec]\nkey = bad\\escape',
+                    '[sec "sub"\n'):
+        with assert_raises(ValueError):
+            list(parse_gitconfig(invalid))
+
+
+def test_canonicalize_gitconfig_key():
+    assert_equal(canonicalize_gitconfig_key('Sec.Sub.Sec.Key'),
+                 'sec.Sub.Sec.key')
+    for invalid in ('key', '.key', 'sec.', 'sec.1key', 'se_c.key'):
+        assert_raises(ValueError, canonicalize_gitconfig_key, invalid)
+
+
+def test_wildmatch_to_regex():
+    for pattern, text, match in (
+            ('**/repo/.git', '/some/where/repo/.git', True),
+            ('**/repo/.git', 'repo/.git', True),
+            ('/some/*/.git', '/some/where/.git', True),
+            ('/some/*/.git', '/some/where/deep/.git', False),
+            ('/some/**', '/some/where/deep/.git', True),
+            ('/some/**/.git', '/some/.git', True),
+            ('/s?me/[a-w]here/.git', '/some/where/.git', True),
+            ('/some/[!w]here/.git', '/some/where/.git', False),
+            ('/some/wh\\*re', '/some/wh*re', True),
+            ('/some/wh\\*re', '/some/where', False),
+            ('main', 'main', True),
+            ('feature/*', 'feature/one', True),
+            ('feature/*', 'feature/one/two', False)):
+        assert_equal(bool(wildmatch_to_regex(pattern).match(text)), match,
+                     (pattern, text))
+    assert_true(wildmatch_to_regex('/SOME/*', icase=True).match('/some/x'))
+    assert_raises(UnsupportedGitConfig, wildmatch_to_regex, '[[:alpha:]]')
+
+
+@skip_if_on_windows
+def test_edit_gitconfig_file(tmp_path):
+    text = '[a]\n\tx = 1\n# c\n[b]\n\tx = 1\n\ty = 2\n\tx = 3\n' \
+           '[a]\n\tz = 1\n\n# trailing'
+    edits = [
+        ['--replace-all', 'b.x', '9'],
+        ['--add', 'a.n', ' sp;ace"\\x'],
+        ['--unset-all', 'a.z'],
+        ['--rename-section', 'a', 'New.Sub'],
+        ['--remove-section', 'b'],
+        ['Q.Sub.Key', 'v'],
+        ['new.k', 'x\ty\nz#'],
+        ['Q.Sub.Key', 'w'],
+        ['--add', 'new.k', ''],
+    ]
+    by_git = tmp_path / 'by_git'
+    by_git.write_text(text)
+    for args in edits:
+        GitRunner().run(['git', 'config', '--file', str(by_git)] + args)
+    edited = tmp_path / 'edited'
+    edited.write_text(text)
+    edit_gitconfig_file(edited, edits)
+    assert_equal(edited.read_text(), by_git.read_text())
+    assert_false((tmp_path / 'edited.lock').exists())
+    # a new file is created
+    edit_gitconfig_file(tmp_path / 'new', [['sec.key', 'value']])
+    assert_equal((tmp_path / 'new').read_text(), '[sec]\n\tkey = value\n')
+
+    # modifications that would fail in Git, and a file with multiple
+    # declarations in a line are left to Git
+    for args in (['b.x', '1'],
+                 ['--unset-all', 'a.none'],
+                 ['--remove-section', 'none'],
+                 ['--rename-section', 'none', 'other'],
+                 ['--get', 'a.x']):
+        (tmp_path / 'fail').write_text('[b]\n\tx = 1\n\tx = 2\n')
+        assert_raises(UnsupportedGitConfig, edit_gitconfig_file,
+                      tmp_path / 'fail', [['sec.key', 'value'], args])
+        # nothing was written
+        assert_equal((tmp_path / 'fail').read_text(),
+                     '[b]\n\tx = 1\n\tx = 2\n')
+    (tmp_path / 'fail').write_text('[b] x = 1\n')
+    assert_raises(UnsupportedGitConfig, edit_gitconfig_file,
+                  tmp_path / 'fail', [['b.x', '2']])
+    # an existing lock is respected
+    (tmp_path / 'fail.lock').touch()
+    (tmp_path / 'fail').write_text('[b]\n\tx = 1\n')
+    assert_raises(UnsupportedGitConfig, edit_gitconfig_file,
+                  tmp_path / 'fail', [['b.x', '2']])
+    assert_true((tmp_path / 'fail.lock').exists())
+
+
+def test_edit_gitconfig_file_case(tmp_path):
+    text = '[Sec "Sub"]\n\tKey = a\n\tOther = b\n[SEC]\n\tKey = c\n' \
+           '\tOther = d\n[sec.Dep]\n\tx = 1\n\ty = 2\n'
+    # section and variable names of keys are case-insensitive, subsections
+    # are not
+    for edits in ([['sec.Sub.KEY', 'new']],
+                  [['SEC.Sub.key', 'new'], ['--add', 'Sec.Sub.Key', 'more']],
+                  [['--unset-all', 'SeC.Sub.kEy']],
+                  [['sec.key', 'new'], ['--unset-all', 'Sec.Other']],
+                  [['sec.sub.key', 'new']],
+                  [['Sec.dep.X', '2']],
+                  [['--rename-section', 'Sec.Sub', 'new.Sub']],
+                  [['--remove-section', 'SEC']]):
+        by_git = tmp_path / 'by_git'
+        by_git.write_text(text)
+        for args in edits:
+            GitRunner().run(['git', 'config', '--file', str(by_git)] + args)
+        edited = tmp_path / 'edited'
+        edited.write_text(text)
+        edit_gitconfig_file(edited, edits)
+        assert_equal(edited.read_text(), by_git.read_text())
+    # Git matches the names of sections to rename or remove verbatim,
+    # and the key of a variable to unset must exist
+    for args in (['--rename-section', 'sec.Sub', 'new'],
+                 ['--remove-section', 'sec'],
+                 ['--unset-all', 'sec.SUB.key']):
+        (tmp_path / 'fail').write_text(text)
+        assert_raises(CommandError, GitRunner().run,
+                      ['git', 'config', '--file', str(tmp_path / 'fail')]
+                      + args)
+        assert_raises(UnsupportedGitConfig, edit_gitconfig_file,
+                      tmp_path / 'fail', [args])
+
+    # like Git, sections without variables are removed, unless there are
+    # comments around them
+    for text in ('[Sec]\n\tKey = a\n',
+                 '[a]\n\tx = 1\n\n[Sec]\n\tkey = a\n\tKEY = b\n'
+                 '\n[b]\n\ty = 1\n',
+                 '[a]\n\tx = 1\n[sec]\n\tkey = a\n[SEC]\n\tkey = b\n',
+                 '[sec]\n\tother = 1\n[sec]\n\tkey = a\n',
+                 '# about sec\n[sec]\n\tkey = a\n',
+                 '[sec] ; about sec\n\tkey = a\n',
+                 '[sec]\n\tkey = a\n# more\n[b]\n\ty = 1\n',
+                 '[sec]\n\tkey = a\n\tother = 1\n'):
+        by_git = tmp_path / 'by_git'
+        by_git.write_text(text)
+        GitRunner().run(
+            ['git', 'config', '--file', str(by_git), '--unset-all', 'sec.key'])
+        edited = tmp_path / 'edited'
+        edited.write_text(text)
+        edit_gitconfig_file(edited, [['--unset-all', 'sec.key']])
+        assert_equal(edited.read_text(), by_git.read_text())
+
+
+def _get_git_config(cwd, *args):
+    out = GitRunner(cwd=cwd).run(
+        ['git', 'config', '-z', '-l', '--show-origin'] + list(args),
+        protocol=StdOutErrCapture)
+    return parse_gitconfig_dump(out['stdout'], cwd=cwd)
+
+
+def _assert_reader_matches_git(repo):
+    reader = GitConfigReader(repo.dot_git)
+    assert_equal(reader.read(), _get_git_config(repo.path))
+    assert_equal(reader.read(scopes=('local',), includes=False),
+                 _get_git_config(repo.path, '--local'))
+
+
+@skip_if_on_windows
+def test_gitconfig_reader(tmp_path):
+    home = tmp_path / 'home'
+    home.mkdir()
+    (home / '.gitconfig').write_text(
+        '[user]\n\tname = Some One\n\temail = some@example.com\n'
+        '[include]\n\tpath = ~/included\n')
+    (home / 'included').write_text(
+        '[core]\n\tinclude = global\n'
+        '[include]\n\tpath = nested/included\n')
+    (home / 'nested').mkdir()
+    (home / 'nested' / 'included').write_text(
+        '[core]\n\tinclude = nested\n')
+    (home / 'branch').write_text('[core]\n\tinclude = branch\n')
+    repo = GitRepo(tmp_path / 'repo', create=True)
+    repo.call_git(['checkout', '-q', '-b', 'feature/one'])
+    with (repo.dot_git / 'config').open('a') as f:
+        f.write(
+            '[includeIf "gitdir:{repo}/"]\n\tpath = {home}/included\n'
+            '[includeIf "gitdir:nomatch/"]\n\tpath = {home}/included\n'
+            '[includeIf "gitdir/i:REPO/.git"]\n\tpath = {home}/included\n'
+            '[includeIf "gitdir:./"]\n\tpath = {home}/included\n'
+            '[includeIf "onbranch:feature/"]\n\tpath = {home}/branch\n'
+            '[includeIf "onbranch:main"]\n\tpath = {home}/included\n'
+            '[includeIf "unknown:condition"]\n\tpath = {home}/included\n'
+            '[Section "SubSection"]\n\tMulti = "one"\n\tmulti = two\n'
+            '[include]\n\tpath = missing\n'.format(
+                repo=repo.path, home=home))
+    env = {
+        'HOME': str(home),
+        'GIT_CONFIG_GLOBAL': str(home / '.gitconfig'),
+        'GIT_CONFIG_NOSYSTEM': '1',
+        'GIT_CONFIG_COUNT': '2',
+        'GIT_CONFIG_KEY_0': 'Cmd.Sub.Key',
+        'GIT_CONFIG_VALUE_0': 'count',
+        'GIT_CONFIG_KEY_1': 'include.path',
+        'GIT_CONFIG_VALUE_1': str(home / 'branch'),
+        'GIT_CONFIG_PARAMETERS':
+            "'cmd.old=value' 'cmd.new'='it'\\''s' 'cmd.flag'=",
+    }
+    with patch.dict(os.environ, env):
+        _assert_reader_matches_git(repo)
+        cfg, files = GitConfigReader(repo.dot_git).read()
+        # included globally, by gitdir and gitdir/i, and by branch in the
+        # local and command line scope
+        assert_equal(cfg['core.include'],
+                     ('global', 'nested', 'global', 'nested', 'global',
+                      'nested', 'branch', 'branch'))
+        assert_equal(cfg['cmd.new'], "it's")
+        assert_equal(files, {home / '.gitconfig', home / 'included',
+                             home / 'nested' / 'included', home / 'branch',
+                             repo.dot_git / 'config'})
+
+        # configuration that is specific to a worktree
+        worktree = tmp_path / 'worktree'
+        repo.call_git(['commit', '-q', '--allow-empty', '-m', 'initial'])
+        repo.call_git(['worktree', 'add', '-q', '-b', 'wt', str(worktree)])
+        repo.call_git(['config', 'extensions.worktreeConfig', 'true'])
+        wt_repo = GitRepo(worktree)
+        wt_repo.call_git(['config', '--worktree', 'wt.key', 'value'])
+        _assert_reader_matches_git(wt_repo)
+        assert_equal(GitConfigReader(wt_repo.dot_git).read()[0]['wt.key'],
+                     'value')
+        # no repository at all
+        assert_equal(
+            GitConfigReader().read(),
+            parse_gitconfig_dump(GitRunner(cwd=tmp_path).run(
+                ['git', '--git-dir=/dev/null', 'config', '-z', '-l',
+                 '--show-origin'],
+                protocol=StdOutErrCapture)['stdout'])
+        )
+
+
+@skip_if_on_windows
+def test_gitconfig_reader_fallback(tmp_path):
+    repo = GitRepo(tmp_path / 'repo', create=True)
+    repo.call_git(['config', 'sec.key', 'value'])
+    with patch.object(ConfigManager, '_reload_from_git',
+                      autospec=True,
+                      side_effect=ConfigManager._reload_from_git) as rfg:
+        # git-config is used by default
+        cfg = ConfigManager(repo)
+        assert_equal(cfg['sec.key'], 'value')
+        assert_equal(rfg.call_count, 1)
+        rfg.reset_mock()
+        # when enabled, the in-process reader is used when possible
+        with patch.dict(os.environ,
+                        {'DATALAD_RUNTIME_CONFIG__READER': 'true'}):
+            cfg = ConfigManager(repo)
+            assert_equal(cfg['sec.key'], 'value')
+            rfg.assert_not_called()
+            # and git-config is called for what it does not support
+            with (repo.dot_git / 'config').open('a') as f:
+                f.write('[includeIf "hasconfig:remote.*.url:https://**"]\n'
+                        '\tpath = other\n')
+            assert_raises(UnsupportedGitConfig,
+                          GitConfigReader(repo.dot_git).read)
+            cfg.reload()
+            assert_equal(cfg['sec.key'], 'value')
+            assert_equal(rfg.call_count, 1)
+        # or when the reader is disabled
+        (repo.dot_git / 'config').write_text('[sec]\n\tkey = other\n')
+        with patch.dict(os.environ,
+                        {'DATALAD_RUNTIME_CONFIG__READER': 'false'}):
+            cfg = ConfigManager(repo)
+        assert_equal(cfg['sec.key'], 'other')
+        assert_equal(rfg.call_count, 2)
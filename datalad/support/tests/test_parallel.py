@@ -7,8 +7,10 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 
+import gc
 import logging
 import sys
+import threading
 from functools import partial
 from time import (
     sleep,
@@ -24,6 +26,7 @@ from datalad.support import path as op
 from datalad.support.exceptions import IncompleteResultsError
 # absolute import only to be able to run test without `nose` so to see progress bar
 from datalad.support.parallel import (
+    Prefetcher,
     ProducerConsumer,
     ProducerConsumerProgressLog,
     no_parentds_in_futures,
@@ -32,9 +35,12 @@ from datalad.tests.utils_pytest import (
     assert_equal,
     assert_greater,
     assert_greater_equal,
+    assert_is_none,
+    assert_not_equal,
     assert_raises,
     assert_repo_status,
     rmtree,
+    assert_true,
     slow,
     with_tempfile,
 )
@@ -111,6 +117,45 @@ def test_producer_future_key(jobs):
     assert_equal(list(pc), [0, 1, 2])
 
 
+def test_prefetcher(jobs):
+    calls = []
+
+    def func(i):
+        calls.append(i)
+        if i == 3:
+            raise ValueError(i)
+        return i ** 2
+
+    with Prefetcher(jobs=jobs) as prefetcher:
+        futures = [prefetcher.submit(i, func, i) for i in range(4)]
+        # a future is only returned for calls evaluated ahead of time
+        assert_equal([f is None for f in futures],
+                     [prefetcher.jobs == 0] * 4)
+        # a call is submitted only once per key
+        assert_is_none(prefetcher.submit(0, func, 0))
+        assert_equal([prefetcher.get(i, func, i) for i in (2, 0, 1)],
+                     [4, 0, 1])
+        assert_raises(ValueError, prefetcher.get, 3, func, 3)
+        # not (or no longer) pending calls are evaluated right away
+        assert_equal(prefetcher.get(4, func, 4), 16)
+        assert_equal(prefetcher.get(2, func, 2), 4)
+    assert_equal(sorted(calls), [0, 1, 2, 2, 3, 4])
+
+
+def test_prefetcher_background():
+    # a single job is evaluated in a worker thread, rather than not at all
+    prefetcher = Prefetcher(jobs=1, background=True)
+    assert_equal(prefetcher.jobs, 1)
+    future = prefetcher.submit(0, threading.get_ident)
+    assert_not_equal(future.result(), threading.get_ident())
+    assert_equal(prefetcher.get(0, threading.get_ident), future.result())
+    # workers are shut down with the prefetcher, also without close()
+    executor = prefetcher._executor
+    del prefetcher
+    gc.collect()
+    assert_true(executor._shutdown)
+
+
 @slow  # 12sec on Yarik's laptop
 @with_tempfile(mkdir=True)
 def test_creatsubdatasets(topds_path=None, n=2):
@@ -17,14 +17,18 @@ import pytest
 from datalad.cmd import (
     BatchedCommand,
     BatchedCommandError,
+    BatchedCommandPool,
     readline_rstripped,
 )
 from datalad.runner.tests.utils import py2cmd
 from datalad.tests.utils_pytest import (
     assert_equal,
+    assert_in,
+    assert_is,
     assert_is_none,
     assert_is_not_none,
     assert_not_equal,
+    assert_not_in,
     assert_true,
 )
 
@@ -212,3 +216,120 @@ print(a*b)
     assert bc.return_code == 1
     assert bc.last_request is None
     bc.close(return_stderr=False)
+
+
+def test_batched_map():
+    # Expect that requests are sent ahead of the responses, but never more
+    # than `window` requests at a time. The subprocess reports how many
+    # requests were readable when it processed a request.
+    bc = BatchedCommand(
+        cmd=py2cmd(
+            """
+import os
+import select
+while True:
+    # read unbuffered, to leave following requests in the pipe
+    line = b""
+    while not line.endswith(b"\\n"):
+        char = os.read(0, 1)
+        if not char:
+            exit(0)
+        line += char
+    readable = bool(select.select([0], [], [], .5)[0])
+    print(line.decode().strip(), readable, flush=True)
+            """))
+
+    lines = [f"line-{i}" for i in range(6)]
+    responses = [r.split() for r in bc.map(iter(lines), window=3)]
+    assert_equal([r[0] for r in responses], lines)
+    # the first requests had followers in the pipe, the last one had not
+    assert_equal(responses[0][1], "True")
+    assert_equal(responses[-1][1], "False")
+    assert_equal(bc.last_request, lines[-1])
+
+    # a single request at a time, as in a plain call
+    responses = [r.split() for r in bc.map(lines[:2], window=1)]
+    assert_equal([r[1] for r in responses], ["False", "False"])
+
+    # calls with a list of requests are pipelined, too
+    assert_equal([r.split()[0] for r in bc(lines)], lines)
+
+    # if the consumer stops early, the process is closed to not mistake the
+    # pending responses for responses to later requests
+    responses = bc.map(lines)
+    assert_equal(next(responses).split()[0], lines[0])
+    responses.close()
+    assert_is_none(bc.runner)
+    assert_equal(bc("again").split()[0], "again")
+    bc.close(return_stderr=False)
+
+
+def test_batched_map_restart():
+    # Expect that pending requests are resent if the process exits
+    bc = BatchedCommand(
+        cmd=py2cmd(
+            "import os\n"
+            "import sys\n"
+            "print(os.getpid(), sys.stdin.readline().strip(), flush=True)\n"))
+
+    lines = [f"line-{i}" for i in range(4)]
+    responses = [r.split() for r in bc.map(lines)]
+    assert_equal(len(set(r[0] for r in responses)), 4)
+    assert_equal([r[1] for r in responses], lines)
+    bc.close(return_stderr=False)
+
+
+def test_batched_command_pool():
+    pool = BatchedCommandPool(max_size=3, max_per_owner=2, max_idle=60)
+
+    def factory():
+        return BatchedCommand(
+            cmd=py2cmd(
+                "import sys\n"
+                "for line in sys.stdin:\n"
+                "    print(line.strip(), flush=True)\n"))
+
+    a1 = pool.get("a", "one", factory)
+    assert_equal(a1("x"), "x")
+    # the running command is reused
+    assert_is(pool.get("a", "one", factory), a1)
+    assert_equal(pool.stats, {"misses": 1, "hits": 1})
+    assert_is_not_none(a1.runner)
+
+    # an owner exceeding its share has its own least recently used command
+    # evicted
+    pool.get("a", "two", factory)
+    a3 = pool.get("a", "three", factory)
+    assert_not_in(("a", "one"), pool)
+    assert_is_none(a1.runner)
+    assert_equal(pool.stats["evicted_owner"], 1)
+
+    # beyond the pool size, the least recently used command of any owner is
+    # evicted
+    pool.get("b", "one", factory)
+    pool.get("b", "two", factory)
+    assert_not_in(("a", "two"), pool)
+    assert_equal(pool.stats["evicted_lru"], 1)
+
+    # commands that are processing requests are not evicted
+    responses = a3.map(["x", "y"])
+    assert_equal(next(responses), "x")
+    pool.get("c", "one", factory)
+    assert_in(("a", "three"), pool)
+    assert_not_in(("b", "one"), pool)
+    assert_equal(list(responses), ["y"])
+
+    # idle commands are evicted
+    pool.max_idle = 0
+    pool.get("c", "one", factory)
+    assert_equal(len(pool), 1)
+    assert_equal(pool.stats["evicted_idle"], 2)
+    assert_is_none(a3.runner)
+    # also without a request
+    pool.evict()
+    assert_equal(len(pool), 0)
+    assert_equal(pool.stats["evicted_idle"], 3)
+
+    pool.get("c", "one", factory)
+    pool.close()
+    assert_equal(len(pool), 0)
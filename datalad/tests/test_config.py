@@ -834,3 +834,92 @@ def test_cross_cfgman_update(tmp_path):
     ds.config.set(myuniqcfg, myuniqcfg_value2, scope='global')
     # and again expect the global instance to catch up with it
     assert dl_cfg.get(myuniqcfg) == myuniqcfg_value2
+
+
+def test_config_snapshot_cache(tmp_path):
+    repo = GitRepo(tmp_path / 'repo', create=True)
+    key = 'sec.sub.key'
+    repo.config.set(key, '1', scope='local')
+    with patch.dict(os.environ,
+                    {'DATALAD_RUNTIME_CONFIG__SNAPSHOT__CACHE': 'yes'}), \
+            patch('datalad.config._get_config_snapshot_dir',
+                  return_value=tmp_path / 'cache'):
+        # first reading populates the cache
+        cfg = ConfigManager(repo)
+        assert_equal(cfg[key], '1')
+        assert_true(any((tmp_path / 'cache').iterdir()))
+        with patch.object(ConfigManager, '_read_store',
+                          autospec=True,
+                          side_effect=ConfigManager._read_store) as rfg:
+            # no reading for an unchanged configuration
+            cfg = ConfigManager(repo)
+            assert_equal(cfg[key], '1')
+            rfg.assert_not_called()
+            # external modification invalidates the snapshot
+            repo.call_git(['config', '--local', '--replace-all', key, '10'])
+            cfg = ConfigManager(repo)
+            assert_equal(cfg[key], '10')
+            assert_equal(rfg.call_count, 1)
+            # as does a changed environment
+            with patch.dict(os.environ, {'GIT_CONFIG_COUNT': '1',
+                                         'GIT_CONFIG_KEY_0': 'sec.sub.env',
+                                         'GIT_CONFIG_VALUE_0': '11'}):
+                cfg = ConfigManager(repo)
+                assert_equal(cfg['sec.sub.env'], '11')
+            assert_equal(rfg.call_count, 2)
+            cfg = ConfigManager(repo)
+            assert_not_in('sec.sub.env', cfg)
+            assert_equal(rfg.call_count, 2)
+
+
+@patch.dict(os.environ, {'DATALAD_RUNTIME_CONFIG__READER': 'true'})
+def test_config_transaction(tmp_path):
+    repo = GitRepo(tmp_path / 'repo', create=True)
+    cfg = ConfigManager(repo)
+    cfg.add('sec.multi', 'old', scope='local')
+    with patch.object(ConfigManager, 'reload', autospec=True,
+                      side_effect=ConfigManager.reload) as reload, \
+            patch.object(cfg._runner, 'run',
+                         side_effect=cfg._runner.run) as run:
+        with cfg.transaction():
+            cfg.unset('sec.multi', scope='local')
+            for v in ('one', 'two'):
+                cfg.add('sec.multi', v, scope='local')
+            cfg.set('sec.Sub.key', 'value', scope='local')
+            cfg.set('sec.id', 'some', scope='branch')
+            # nested transactions are part of the outer one
+            with cfg.transaction():
+                cfg.rename_section('sec.Sub', 'sec.new', scope='local')
+            # nothing is written until the end
+            assert_equal(cfg['sec.multi'], 'old')
+        # a single reload, and git-config was not called to modify
+        assert_equal(reload.call_count, 1)
+        assert_false(any('--local' in c.args[0] or '--file' in c.args[0]
+                         for c in run.call_args_list))
+    assert_equal(cfg['sec.multi'], ('one', 'two'))
+    assert_equal(cfg['sec.new.key'], 'value')
+    assert_not_in('sec.Sub.key', cfg)
+    assert_equal(cfg.get_from_source('branch', 'sec.id'), 'some')
+    # the written files are identical to what git-config would do
+    assert_equal(
+        (repo.dot_git / 'config').read_text().split('\n')[-6:],
+        ['[sec]', '\tmulti = one', '\tmulti = two',
+         '[sec "new"]', '\tkey = value', ''])
+
+    # git-config is called for what cannot be done in-process, and reports
+    # the error of an invalid modification
+    with assert_raises(CommandError):
+        with cfg.transaction():
+            cfg.set('sec.multi', 'value', scope='local')
+    assert_equal(cfg['sec.multi'], ('one', 'two'))
+    # nothing is written if the transaction fails
+    with assert_raises(RuntimeError):
+        with cfg.transaction():
+            cfg.set('sec.other', 'value', scope='local')
+            raise RuntimeError
+    cfg.reload(force=True)
+    assert_not_in('sec.other', cfg)
+    # override scope is not subject to transactions
+    with cfg.transaction():
+        cfg.set('sec.override', 'value', scope='override')
+        assert_equal(cfg['sec.override'], 'value')
@@ -20,6 +20,7 @@ from datalad.log import (
     ColorFormatter,
     LoggerHelper,
     TraceBack,
+    is_progress_reported,
     log_progress,
     with_progress,
     with_result_progress,
@@ -29,6 +30,7 @@ from datalad.support.constraints import EnsureBool
 from datalad.tests.utils_pytest import (
     SkipTest,
     assert_equal,
+    assert_false,
     assert_in,
     assert_no_open_files,
     assert_not_in,
@@ -202,6 +204,34 @@ def test_log_progress_noninteractive_filter():
         assert_not_in("NOT", cml.out)
 
 
+def test_is_progress_reported():
+    name = "dl-test-progress-reported"
+    child = logging.getLogger(name + ".child")
+    with patch("datalad.log.is_interactive", lambda: False):
+        lgr = LoggerHelper(name).get_initialized_logger()
+    # not reported to any other handler
+    lgr.propagate = False
+    lgr.setLevel(logging.INFO)
+    ok_(is_progress_reported(child))
+    # filtered in a non-interactive session
+    assert_false(is_progress_reported(child, noninteractive_level=5))
+    ok_(is_progress_reported(child, noninteractive_level=logging.INFO))
+    lgr.setLevel(logging.WARNING)
+    assert_false(is_progress_reported(child))
+    # any other handler might report it
+    lgr.setLevel(logging.INFO)
+    lgr.addHandler(logging.NullHandler())
+    ok_(is_progress_reported(child, noninteractive_level=5))
+
+    name += "-interactive"
+    with patch("datalad.log.is_interactive", lambda: True):
+        lgr = LoggerHelper(name).get_initialized_logger()
+    lgr.propagate = False
+    lgr.setLevel(logging.INFO)
+    # shown as progress bars
+    ok_(is_progress_reported(lgr, noninteractive_level=5))
+
+
 def test_with_result_progress_generator():
     # Tests ability for the decorator to decorate a regular function
     # or a generator function (then it returns a generator function)
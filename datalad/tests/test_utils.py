@@ -49,6 +49,7 @@ from datalad.utils import (
     auto_repr,
     better_wraps,
     chpwd,
+    copy_file_reflink,
     create_tree,
     disable_logger,
     dlabspath,
@@ -78,6 +79,7 @@ from datalad.utils import (
     never_fail,
     not_supported_on_windows,
     obtain_write_permission,
+    on_linux,
     on_windows,
     partition,
     path_is_subpath,
@@ -1418,6 +1420,34 @@ def test_obtain_write_permission(path=None):
     path.write_text("yet another thing")
 
 
+@with_tempfile(mkdir=True)
+def test_copy_file_reflink(path=None):
+    src = Path(path) / 'src'
+    dst = Path(path) / 'dst'
+    src.write_text("content")
+    src.chmod(0o640)
+    # a reflink, or a plain copy, depending on the file system
+    assert_in(copy_file_reflink(src, dst), (True, False))
+    eq_(dst.read_text(), "content")
+    if not on_windows:
+        eq_(stat.S_IMODE(dst.stat().st_mode), 0o640)
+    # the copy is independent of the source
+    dst.chmod(0o600)
+    dst.write_text("changed")
+    eq_(src.read_text(), "content")
+    # an existing file is replaced
+    copy_file_reflink(str(src), str(dst))
+    eq_(dst.read_text(), "content")
+    if on_linux:
+        # a file system without reflink support makes it fall back on a copy
+        dst.write_text("changed")
+        with patch('fcntl.ioctl', side_effect=OSError(95, 'not supported')):
+            eq_(copy_file_reflink(src, dst), False)
+        eq_(dst.read_text(), "content")
+    assert_raises(FileNotFoundError, copy_file_reflink,
+                  Path(path) / 'missing', dst)
+
+
 @skip_if_root
 @with_tempfile(mkdir=True)
 def test_ensure_write_permission(path=None):
@@ -1056,11 +1056,9 @@ def partition(items: Iterable[T], predicate: Callable[[T], Any]=bool) -> tuple[I
 def generate_chunks(container: list[T], size: int) -> Iterator[list[T]]:
     """Given a container, generate chunks from it with size up to `size`
     """
-    # There could be a "smarter" solution but I think this would suffice
     assert size > 0,  "Size should be non-0 positive"
-    while container:
-        yield container[:size]
-        container = container[size:]
+    for start in range(0, len(container), size):
+        yield container[start:start + size]
 
 
 def generate_file_chunks(files: list[str], cmd: str | list[str] | None = None) -> Iterator[list[str]]:
@@ -2818,6 +2816,47 @@ def check_symlink_capability(path: Path, target: Path) -> bool:
             target.unlink()
 
 
+# ioctl request to share the data blocks of a file (Linux: btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def copy_file_reflink(src: Path | str, dst: Path | str) -> bool:
+    """Copy a file, sharing its data blocks with the source if possible
+
+    On file systems that support it (e.g. btrfs or XFS on Linux), the copy
+    is a reflink, i.e. a copy-on-write clone of `src` that takes no
+    additional space, and is made in constant time. Any later modification of
+    either file does not affect the other one. Otherwise, the content is
+    copied. In any case, the permission bits are copied, too, like
+    `shutil.copy()` does.
+
+    Parameters
+    ----------
+    src: Path or str
+    dst: Path or str
+      Path of the copy, not a directory to place it in.
+
+    Returns
+    -------
+    bool
+      Whether a reflink was made.
+    """
+    reflinked = False
+    if on_linux:
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                reflinked = True
+            except OSError:
+                # not supported by the file system, or across file systems
+                pass
+    if not reflinked:
+        shutil.copyfile(src, dst)
+    shutil.copymode(src, dst)
+    return reflinked
+
+
 def obtain_write_permission(path: Path) -> Optional[int]:
     """Obtains write permission for `path` and returns previous mode if a
     change was actually made.